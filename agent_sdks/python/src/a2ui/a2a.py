@@ -17,6 +17,7 @@ from typing import Any, Optional, List
 
 from a2a.server.agent_execution import RequestContext
 from a2a.types import AgentExtension, Part, DataPart, TextPart
+from a2ui.core.schema.constants import OUTPUT_FORMAT_JSON, VALIDATION_FULL
 
 logger = logging.getLogger(__name__)
 
@@ -110,6 +111,8 @@ def parse_response_to_parts(
     content: str,
     validator: Optional[Any] = None,
     fallback_text: Optional[str] = None,
+    validation_level: str = VALIDATION_FULL,
+    output_format: str = OUTPUT_FORMAT_JSON,
 ) -> List[Part]:
   """Helper to parse LLM response content into A2A Parts, with optional validation.
 
@@ -117,6 +120,10 @@ def parse_response_to_parts(
       content: The LLM response content, potentially containing A2UI delimiters.
       validator: Optional validator to run against extracted JSON payloads.
       fallback_text: Optional text to return if no parts are successfully created.
+      validation_level: How thoroughly the validator checks the payloads (see
+        `a2ui.core.schema.constants`).
+      output_format: How the JSON in the A2UI blocks is written, as requested
+        from `generate_system_prompt`.
 
   Returns:
       A list of A2A Part objects (TextPart and/or DataPart).
@@ -125,7 +132,7 @@ def parse_response_to_parts(
 
   parts = []
   try:
-    response_parts = parse_response(content)
+    response_parts = parse_response(content, output_format=output_format)
 
     for part in response_parts:
       if part.text:
@@ -134,7 +141,7 @@ def parse_response_to_parts(
       if part.a2ui_json:
         json_data = part.a2ui_json
         if validator:
-          validator.validate(json_data)
+          validator.validate(json_data, level=validation_level)
 
         if isinstance(json_data, list):
           for message in json_data:
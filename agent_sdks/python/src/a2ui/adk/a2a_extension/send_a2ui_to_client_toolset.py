@@ -28,6 +28,9 @@ Key Components:
     that effectively sends a JSON payload to the client. This tool validates the JSON against
     the provided schema. It automatically wraps the provided schema in an array structure,
     instructing the LLM that it can send a list of UI items.
+    With `structured_arguments=True`, the messages are declared as a list argument
+    shaped by the catalog (see `a2ui.core.schema.function_schema`) instead of a
+    JSON string.
   * `A2uiEventConverter`: An event converter that automatically injects the A2UI catalog into part conversion.
 
 Usage Examples:
@@ -87,6 +90,7 @@ Usage Examples:
     ```
 """
 
+import copy
 import inspect
 import json
 import logging
@@ -112,6 +116,10 @@ from a2ui.a2a import (
 from a2ui.core.parser.parser import has_a2ui_parts
 from a2ui.core.parser.payload_fixer import parse_and_fix
 from a2ui.core.schema.catalog import A2uiCatalog
+from a2ui.core.schema.constants import SCHEMA_RENDERING_FULL, VALIDATION_FULL
+from a2ui.core.schema.function_schema import DEFS
+from a2ui.core.schema.rendering import measure_prompt
+from a2ui.core.schema.validator import ValidationProvenance
 from google.adk.a2a.converters import part_converter
 from google.adk.agents.readonly_context import ReadonlyContext
 from google.adk.models import LlmRequest
@@ -149,10 +157,36 @@ class SendA2uiToClientToolset(base_toolset.BaseToolset):
       a2ui_enabled: Union[bool, A2uiEnabledProvider],
       a2ui_catalog: Union[A2uiCatalog, A2uiCatalogProvider],
       a2ui_examples: Union[str, A2uiExamplesProvider],
+      validation_level: str = VALIDATION_FULL,
+      structured_arguments: bool = False,
+      schema_rendering: str = SCHEMA_RENDERING_FULL,
   ):
+    """Initializes the toolset.
+
+    Args:
+        a2ui_enabled: Whether A2UI is enabled, or a provider deciding it.
+        a2ui_catalog: The A2UI catalog, or a provider resolving it.
+        a2ui_examples: The A2UI examples, or a provider resolving them.
+        validation_level: How thoroughly the tool and the part converters
+          validate payloads (see `a2ui.core.schema.constants`).
+        structured_arguments: Whether the tool declares the A2UI messages as a
+          structured argument derived from the catalog, so the model fills in
+          the messages directly instead of writing them as a JSON string.
+        schema_rendering: How the catalog schema is written into the system
+          instructions (see `A2uiCatalog.render_as_llm_instructions`).
+    """
     super().__init__()
     self._a2ui_enabled = a2ui_enabled
-    self._ui_tools = [self._SendA2uiJsonToClientTool(a2ui_catalog, a2ui_examples)]
+    self._validation_level = validation_level
+    self._ui_tools = [
+        self._SendA2uiJsonToClientTool(
+            a2ui_catalog,
+            a2ui_examples,
+            validation_level=validation_level,
+            structured_arguments=structured_arguments,
+            schema_rendering=schema_rendering,
+        )
+    ]
 
   async def _resolve_a2ui_enabled(self, ctx: ReadonlyContext) -> bool:
     """The resolved self.a2ui_enabled field to construct instruction for this agent.
@@ -203,11 +237,13 @@ class SendA2uiToClientToolset(base_toolset.BaseToolset):
         A configured A2uiPartConverter.
     """
     catalog = await self._ui_tools[0]._resolve_a2ui_catalog(ctx)
-    return A2uiPartConverter(catalog)
+    return A2uiPartConverter(catalog, validation_level=self._validation_level)
 
   class _SendA2uiJsonToClientTool(BaseTool):
     TOOL_NAME = "send_a2ui_json_to_client"
     VALIDATED_A2UI_JSON_KEY = "validated_a2ui_json"
+    # How the returned JSON was validated, so that converters can skip it.
+    VALIDATION_PROVENANCE_KEY = "a2ui_validation"
     A2UI_JSON_ARG_NAME = "a2ui_json"
     TOOL_ERROR_KEY = "error"
 
@@ -215,9 +251,15 @@ class SendA2uiToClientToolset(base_toolset.BaseToolset):
         self,
         a2ui_catalog: Union[A2uiCatalog, A2uiCatalogProvider],
         a2ui_examples: Union[str, A2uiExamplesProvider],
+        validation_level: str = VALIDATION_FULL,
+        structured_arguments: bool = False,
+        schema_rendering: str = SCHEMA_RENDERING_FULL,
     ):
       self._a2ui_catalog = a2ui_catalog
       self._a2ui_examples = a2ui_examples
+      self._validation_level = validation_level
+      self._structured_arguments = structured_arguments
+      self._schema_rendering = schema_rendering
       super().__init__(
           name=self.TOOL_NAME,
           description=(
@@ -232,6 +274,8 @@ class SendA2uiToClientToolset(base_toolset.BaseToolset):
       )
 
     def _get_declaration(self) -> genai_types.FunctionDeclaration | None:
+      if self._structured_arguments and isinstance(self._a2ui_catalog, A2uiCatalog):
+        return self._get_structured_declaration(self._a2ui_catalog)
       return genai_types.FunctionDeclaration(
           name=self.name,
           description=self.description,
@@ -247,6 +291,31 @@ class SendA2uiToClientToolset(base_toolset.BaseToolset):
           ),
       )
 
+    def _get_structured_declaration(
+        self, a2ui_catalog: A2uiCatalog
+    ) -> genai_types.FunctionDeclaration:
+      """Declares the messages as a list argument shaped by the catalog."""
+      argument = dict(a2ui_catalog.function_schema)
+      # Definitions are only allowed at the root of the parameters.
+      defs = argument.pop(DEFS, None)
+      argument["description"] = "A2UI messages to send to the client."
+      parameters = {
+          "type": "OBJECT",
+          "properties": {self.A2UI_JSON_ARG_NAME: argument},
+          "required": [self.A2UI_JSON_ARG_NAME],
+      }
+      if defs:
+        parameters[DEFS] = defs
+      return genai_types.FunctionDeclaration(
+          name=self.name,
+          description=(
+              "Sends A2UI messages to the client to render rich UI for the"
+              " user. This tool can be called multiple times in the same call"
+              " to render multiple UI surfaces."
+          ),
+          parameters=genai_types.Schema.model_validate(parameters),
+      )
+
     async def _resolve_a2ui_examples(self, ctx: ReadonlyContext) -> str:
       """The resolved self.a2ui_examples field to construct instruction for this agent.
 
@@ -284,18 +353,27 @@ class SendA2uiToClientToolset(base_toolset.BaseToolset):
     async def process_llm_request(
         self, *, tool_context: ToolContext, llm_request: LlmRequest
     ) -> None:
-      await super().process_llm_request(
-          tool_context=tool_context, llm_request=llm_request
-      )
-
       a2ui_catalog = await self._resolve_a2ui_catalog(tool_context)
+      if self._structured_arguments and a2ui_catalog is not self._a2ui_catalog:
+        # The declaration depends on the catalog resolved for this request.
+        bound_tool = copy.copy(self)
+        bound_tool._a2ui_catalog = a2ui_catalog
+        llm_request.append_tools([bound_tool])
+      else:
+        await super().process_llm_request(
+            tool_context=tool_context, llm_request=llm_request
+        )
 
-      instruction = a2ui_catalog.render_as_llm_instructions()
+      instruction = a2ui_catalog.render_as_llm_instructions(self._schema_rendering)
       examples = await self._resolve_a2ui_examples(tool_context)
 
       llm_request.append_instructions([instruction, examples])
 
-      logger.info("Added A2UI schema and examples to system instructions")
+      size = measure_prompt(instruction)
+      logger.info(
+          "Added A2UI schema and examples to system instructions (schema:"
+          f" {size.bytes} bytes, ~{size.tokens} tokens)"
+      )
 
     async def run_async(
         self, *, args: dict[str, Any], tool_context: ToolContext
@@ -309,8 +387,16 @@ class SendA2uiToClientToolset(base_toolset.BaseToolset):
           )
 
         a2ui_catalog = await self._resolve_a2ui_catalog(tool_context)
-        a2ui_json_payload = parse_and_fix(a2ui_json)
-        a2ui_catalog.validator.validate(a2ui_json_payload)
+        if isinstance(a2ui_json, str):
+          a2ui_json_payload = parse_and_fix(a2ui_json)
+        elif isinstance(a2ui_json, dict):
+          # Structured arguments, with a single message not wrapped in a list.
+          a2ui_json_payload = [a2ui_json]
+        else:
+          a2ui_json_payload = list(a2ui_json)
+        provenance = a2ui_catalog.validator.validate(
+            a2ui_json_payload, level=self._validation_level
+        )
 
         logger.info(
             f"Validated call to tool {self.TOOL_NAME} with {self.A2UI_JSON_ARG_NAME}"
@@ -321,7 +407,10 @@ class SendA2uiToClientToolset(base_toolset.BaseToolset):
 
         # Return the validated JSON so the converter can use it.
         # We return it in a dict under "result" key for consistent JSON structure.
-        return {self.VALIDATED_A2UI_JSON_KEY: a2ui_json_payload}
+        result = {self.VALIDATED_A2UI_JSON_KEY: a2ui_json_payload}
+        if isinstance(provenance, ValidationProvenance):
+          result[self.VALIDATION_PROVENANCE_KEY] = provenance.to_dict()
+        return result
 
       except Exception as e:
         err = f"Failed to call A2UI tool {self.TOOL_NAME}: {e}"
@@ -337,10 +426,22 @@ class A2uiPartConverter:
   This converter handles both tool-based A2UI (via `send_a2ui_json_to_client`)
   and text-based A2UI (via A2UI delimiter tags). It uses the provided
   catalog to validate and fix JSON payloads.
+
+  Tool responses were validated by the tool and are passed through as is,
+  unless `validate_tool_responses` is set: they are then validated again, and
+  dropped with a warning if invalid, except when they carry the provenance
+  marker of a validation of the same payload that covers `validation_level`.
   """
 
-  def __init__(self, a2ui_catalog: A2uiCatalog):
+  def __init__(
+      self,
+      a2ui_catalog: A2uiCatalog,
+      validation_level: str = VALIDATION_FULL,
+      validate_tool_responses: bool = False,
+  ):
     self._catalog = a2ui_catalog
+    self._validation_level = validation_level
+    self._validate_tool_responses = validate_tool_responses
 
   def convert(self, part: genai_types.Part) -> list[a2a_types.Part]:
     """Converts a GenAI part to A2A parts, with A2UI validation.
@@ -375,6 +476,20 @@ class A2uiPartConverter:
         logger.info("No result in A2UI tool response")
         return []
 
+      if self._validate_tool_responses:
+        provenance = ValidationProvenance.from_dict(
+            function_response.response.get(
+                SendA2uiToClientToolset._SendA2uiJsonToClientTool.VALIDATION_PROVENANCE_KEY
+            )
+        )
+        try:
+          self._catalog.validator.validate(
+              json_data, level=self._validation_level, provenance=provenance
+          )
+        except ValueError as e:
+          logger.warning(f"A2UI tool response failed validation: {e}")
+          return []
+
       return [create_a2ui_part(message) for message in json_data]
 
     # 2. Handle Tool Calls (FunctionCall) - Skip sending to client
@@ -388,7 +503,11 @@ class A2uiPartConverter:
     # 3. Handle Text-based A2UI (TextPart)
     if text := part.text:
       if has_a2ui_parts(text):
-        return parse_response_to_parts(text, validator=self._catalog.validator)
+        return parse_response_to_parts(
+            text,
+            validator=self._catalog.validator,
+            validation_level=self._validation_level,
+        )
 
     # 4. Default conversion for other parts
     converted_part = part_converter.convert_genai_part_to_a2a_part(part)
@@ -403,8 +522,15 @@ class A2uiEventConverter:
   catalog is session-specific.
   """
 
-  def __init__(self, catalog_key: str = "system:a2ui_catalog"):
+  def __init__(
+      self,
+      catalog_key: str = "system:a2ui_catalog",
+      validation_level: str = VALIDATION_FULL,
+      validate_tool_responses: bool = False,
+  ):
     self._catalog_key = catalog_key
+    self._validation_level = validation_level
+    self._validate_tool_responses = validate_tool_responses
 
   def __call__(
       self,
@@ -420,7 +546,11 @@ class A2uiEventConverter:
     catalog = invocation_context.session.state.get(self._catalog_key)
     if catalog:
       # Use the catalog-aware part converter
-      effective_converter = A2uiPartConverter(catalog).convert
+      effective_converter = A2uiPartConverter(
+          catalog,
+          validation_level=self._validation_level,
+          validate_tool_responses=self._validate_tool_responses,
+      ).convert
     else:
       effective_converter = part_converter_func
 
@@ -0,0 +1,175 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The `a2ui-validate` command: validates recorded A2UI payloads in bulk.
+
+Reads `.json` files (one payload each) and `.jsonl` files (one payload per
+line), or directories containing them, and writes one JSON result per payload:
+
+  {"source": "responses.jsonl:3", "valid": false, "error": "..."}
+
+A file that cannot be read or decoded is reported as one invalid result. A
+throughput summary is printed to stderr. The exit status is 1 if any payload
+is invalid.
+"""
+
+import argparse
+import collections
+import json
+import os
+import sys
+import time
+from typing import Deque, Iterator, List, Optional, TextIO, Tuple
+
+from .basic_catalog.provider import BasicCatalog
+from .core.schema.bulk import DEFAULT_PARALLEL_THRESHOLD, validate_many
+from .core.schema.catalog import A2uiCatalog, CatalogConfig
+from .core.schema.constants import ENCODING, SPEC_VERSION_MAP, VERSION_0_9
+from .core.schema.manager import A2uiSchemaManager
+
+JSON_EXTENSION = ".json"
+JSONL_EXTENSION = ".jsonl"
+
+
+def iter_sources(paths: List[str]) -> Iterator[Tuple[str, str, Optional[str]]]:
+  """Yields (source, json_text, error) for every payload under `paths`.
+
+  Directories are searched recursively, in sorted order, for `.json` and
+  `.jsonl` files. Blank lines of JSONL files are skipped. A file that cannot
+  be read, or is not valid UTF-8, yields a last source with empty text and
+  the error; the error is None otherwise.
+  """
+  for path in paths:
+    if os.path.isdir(path):
+      for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for filename in sorted(filenames):
+          if filename.endswith((JSON_EXTENSION, JSONL_EXTENSION)):
+            yield from _read_file(os.path.join(dirpath, filename))
+    else:
+      yield from _read_file(path)
+
+
+def _read_file(path: str) -> Iterator[Tuple[str, str, Optional[str]]]:
+  try:
+    with open(path, "r", encoding=ENCODING) as f:
+      if not path.endswith(JSONL_EXTENSION):
+        yield path, f.read(), None
+        return
+      for number, line in enumerate(f, start=1):
+        if line.strip():
+          yield f"{path}:{number}", line, None
+  except (OSError, UnicodeDecodeError) as e:
+    yield path, "", f"{type(e).__name__}: {e}"
+
+
+def _load_catalog(
+    version: str, catalog_path: Optional[str], compiled: bool
+) -> A2uiCatalog:
+  if catalog_path:
+    config = CatalogConfig.from_path("custom", catalog_path)
+  else:
+    config = BasicCatalog.get_config(version)
+  manager = A2uiSchemaManager(version, catalogs=[config], compiled_validation=compiled)
+  return manager.get_selected_catalog()
+
+
+def run(
+    paths: List[str],
+    catalog: A2uiCatalog,
+    workers: int,
+    output: TextIO,
+    summary: TextIO,
+) -> int:
+  """Validates every payload under `paths`, returning the number of failures."""
+  sources: Deque[Tuple[str, Optional[str]]] = collections.deque()
+
+  def payloads() -> Iterator[str]:
+    for source, text, error in iter_sources(paths):
+      sources.append((source, error))
+      # Unreadable files go through too, so results stay in input order.
+      yield text
+
+  total = invalid = 0
+  start = time.perf_counter()
+  for result in validate_many(catalog, payloads(), workers=workers):
+    source, error = sources.popleft()
+    record = {"source": source, "valid": result.valid and error is None}
+    if not record["valid"]:
+      invalid += 1
+      record["error"] = error or result.error
+    output.write(json.dumps(record) + "\n")
+    total += 1
+  elapsed = time.perf_counter() - start
+
+  rate = total / elapsed if elapsed > 0 else 0.0
+  if total < DEFAULT_PARALLEL_THRESHOLD:
+    workers = 1  # Validated in this process.
+  summary.write(
+      f"Validated {total} payloads ({invalid} invalid) in {elapsed:.2f}s"
+      f" ({rate:.1f} payloads/s, {workers} workers)\n"
+  )
+  return invalid
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+  parser = argparse.ArgumentParser(
+      prog="a2ui-validate", description="Validate A2UI payloads in bulk."
+  )
+  parser.add_argument(
+      "paths", nargs="+", help="JSON/JSONL files or directories containing them"
+  )
+  parser.add_argument(
+      "--version",
+      choices=sorted(SPEC_VERSION_MAP),
+      default=VERSION_0_9,
+      help="A2UI specification version (default: %(default)s)",
+  )
+  parser.add_argument(
+      "--catalog", help="Path to a catalog JSON file. Defaults to the basic catalog"
+  )
+  parser.add_argument(
+      "--workers",
+      "-j",
+      type=int,
+      default=os.cpu_count() or 1,
+      help=(
+          "Number of worker processes (default: number of CPUs). Fewer than"
+          f" {DEFAULT_PARALLEL_THRESHOLD} payloads are validated in a single"
+          " process"
+      ),
+  )
+  parser.add_argument(
+      "--compiled",
+      action="store_true",
+      help="Use validators generated from the catalog schemas",
+  )
+  parser.add_argument(
+      "--output", "-o", help="Write results to this file instead of stdout"
+  )
+  args = parser.parse_args(argv)
+  if args.workers < 1:
+    parser.error("--workers must be positive")
+
+  catalog = _load_catalog(args.version, args.catalog, args.compiled)
+  if args.output:
+    with open(args.output, "w", encoding=ENCODING) as output:
+      invalid = run(args.paths, catalog, args.workers, output, sys.stderr)
+  else:
+    invalid = run(args.paths, catalog, args.workers, sys.stdout, sys.stderr)
+  return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
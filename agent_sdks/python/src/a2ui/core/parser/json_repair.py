@@ -0,0 +1,323 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Single-pass repair of the JSON defects LLMs commonly produce."""
+
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from ..schema import json_backend
+
+# Kinds of repairs, phrased for "Detected ... in LLM output".
+REPAIR_TRAILING_COMMA = "trailing commas"
+REPAIR_MISSING_COMMA = "missing commas"
+REPAIR_SINGLE_QUOTES = "single-quoted strings"
+REPAIR_UNQUOTED_KEY = "unquoted keys"
+REPAIR_COMMENT = "comments"
+REPAIR_PYTHON_LITERAL = "Python literals"
+REPAIR_CONTROL_CHARACTER = "unescaped control characters"
+REPAIR_LEADING_TEXT = "text before the JSON"
+REPAIR_TRAILING_TEXT = "text after the JSON"
+REPAIR_MULTIPLE_VALUES = "several top-level values"
+
+# What repaired text may hold that JSON does not, for scanners that need to
+# know where values end before the text is repaired (see `streaming`): the
+# quotes that open a string, and the openers of comments with what ends them.
+STRING_QUOTES = "\"'"
+COMMENTS = {"//": "\n", "/*": "*/"}
+
+_WHITESPACE = re.compile(r"[ \t\r\n]+")
+# A double-quoted string without raw control characters, the common case.
+_STRING = re.compile(r'"(?:[^"\\\x00-\x1f]|\\.)*"', re.DOTALL)
+_NUMBER = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_WORD = re.compile(r"[A-Za-z_$][\w$-]*")
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+
+
+@dataclass(frozen=True)
+class Repair:
+  """One change made to the text.
+
+  Attributes:
+    kind: What was repaired, one of the `REPAIR_*` constants.
+    offset: Where in the original text the repaired defect starts.
+  """
+
+  kind: str
+  offset: int
+
+
+@dataclass
+class RepairReport:
+  """The changes `repair_json` made, in text order.
+
+  Attributes:
+    repairs: One entry per repaired defect.
+  """
+
+  repairs: List[Repair] = field(default_factory=list)
+
+  def __bool__(self) -> bool:
+    return bool(self.repairs)
+
+  @property
+  def counts(self) -> "Counter[str]":
+    """Number of repairs of each kind."""
+    return Counter(repair.kind for repair in self.repairs)
+
+
+def repair_json(text: str) -> Tuple[str, RepairReport]:
+  """Repairs common LLM defects in a JSON document in one linear pass.
+
+  Repairs trailing and missing commas, single-quoted strings, unquoted object
+  keys, `//` and `/* */` comments, the Python literals True, False and None,
+  raw control characters in strings, and text before the first or after the
+  last top-level object or array. Several top-level values, e.g. one message
+  per line, are collected into one array, with the elements of arrays spliced
+  in. Anything else is left for the JSON parser to report.
+
+  Text before the JSON may hold brackets, e.g. "Here [is] the UI: [...]": the
+  JSON starts at the first '[' or '{' whose value repairs into valid JSON,
+  looked for after the end of each value that does not (so not after an
+  unclosed bracket, which takes in the rest of the text).
+
+  Args:
+    text: The JSON text, usually a document `json.loads` rejected.
+
+  Returns:
+    The repaired text and what was repaired. Valid JSON comes back unchanged.
+  """
+  start = _root_start(text, 0)
+  first: Optional[Tuple[str, RepairReport]] = None
+  while start >= 0:
+    repairer = _Repairer(text)
+    result = repairer.run(start)
+    # Without text before it, the value cannot start anywhere else.
+    if not text[:start].strip() or _parses(result[0]):
+      return result
+    first = first or result
+    start = _root_start(text, repairer.root_end)
+  return first or (text, RepairReport())
+
+
+class _Repairer:
+
+  def __init__(self, text: str):
+    self._text = text
+    self._out: List[str] = []
+    self._report = RepairReport()
+    # Open containers, as '[' or '{'.
+    self._stack: List[str] = []
+    # Where each top-level value starts in `_out`.
+    self._roots: List[int] = [0]
+    # Where the first top-level value ends in the text.
+    self.root_end = len(text)
+
+  def _repair(self, kind: str, offset: int) -> None:
+    self._report.repairs.append(Repair(kind, offset))
+
+  def run(self, start: int) -> Tuple[str, RepairReport]:
+    """Repairs the text from the top-level value starting at `start`."""
+    text, out = self._text, self._out
+    n = len(text)
+    if text[:start].strip():
+      self._repair(REPAIR_LEADING_TEXT, 0)
+
+    i = start
+    # Whether the last token ended a value (or a key), and where a comma that
+    # may turn out to be trailing was seen.
+    value_end = False
+    comma = -1
+    while i < n:
+      match = _WHITESPACE.match(text, i)
+      if match:
+        out.append(match.group())
+        i = match.end()
+        continue
+
+      char = text[i]
+      if text[i : i + 2] in COMMENTS:
+        i = self._skip_comment(i)
+        continue
+      if not self._stack and value_end:
+        if char == ",":
+          self._repair(REPAIR_TRAILING_COMMA, i)
+          i += 1
+          continue
+        if char not in "[{":
+          self._repair(REPAIR_TRAILING_TEXT, i)
+          break
+        self._repair(REPAIR_MULTIPLE_VALUES, i)
+        self._roots.append(len(out))
+        value_end = False
+
+      if char == ",":
+        if comma >= 0:
+          self._repair(REPAIR_TRAILING_COMMA, i)  # A doubled comma.
+        else:
+          comma = i
+        i += 1
+        continue
+      if char in "]}":
+        if comma >= 0:
+          self._repair(REPAIR_TRAILING_COMMA, comma)
+          comma = -1
+        if self._stack:
+          self._stack.pop()
+          if not self._stack and len(self._roots) == 1:
+            self.root_end = i + 1
+        out.append(char)
+        value_end = True
+        i += 1
+        continue
+
+      if comma >= 0:
+        out.append(",")
+        comma = -1
+      elif value_end and char != ":":
+        self._repair(REPAIR_MISSING_COMMA, i)
+        out.append(",")
+      value_end = True
+
+      if char == ":":
+        out.append(char)
+        value_end = False
+        i += 1
+      elif char in "[{":
+        self._stack.append(char)
+        out.append(char)
+        value_end = False
+        i += 1
+      elif char == '"':
+        i = self._string(i)
+      elif char == "'":
+        self._repair(REPAIR_SINGLE_QUOTES, i)
+        i = self._string(i)
+      elif match := _NUMBER.match(text, i):
+        out.append(match.group())
+        i = match.end()
+      elif match := _WORD.match(text, i):
+        i = self._word(match)
+      else:
+        out.append(char)  # Left for the parser to report.
+        value_end = False
+        i += 1
+
+    if comma >= 0:
+      out.append(",")
+    if not self._report:
+      return text, self._report
+    if len(self._roots) > 1:
+      return self._join_roots(), self._report
+    return "".join(out), self._report
+
+  def _join_roots(self) -> str:
+    """Collects the top-level values into one array."""
+    out = self._out
+    elements = []
+    for start, end in zip(self._roots, self._roots[1:] + [len(out)]):
+      value = "".join(out[start:end]).strip()
+      if value.startswith("[") and value.endswith("]"):
+        value = value[1:-1].strip()
+      if value:
+        elements.append(value)
+    return "[" + ",".join(elements) + "]"
+
+  def _skip_comment(self, i: int) -> int:
+    self._repair(REPAIR_COMMENT, i)
+    end_marker = COMMENTS[self._text[i : i + 2]]
+    end = self._text.find(end_marker, i + 2)
+    if end < 0:
+      return len(self._text)
+    # The newline ending a line comment is kept as whitespace.
+    return end if end_marker == "\n" else end + len(end_marker)
+
+  def _word(self, match: "re.Match[str]") -> int:
+    word = match.group()
+    end = match.end()
+    if self._stack and self._stack[-1] == "{" and self._followed_by_colon(end):
+      self._repair(REPAIR_UNQUOTED_KEY, match.start())
+      self._out.append(f'"{word}"')
+    elif word in _PYTHON_LITERALS:
+      self._repair(REPAIR_PYTHON_LITERAL, match.start())
+      self._out.append(_PYTHON_LITERALS[word])
+    else:
+      self._out.append(word)  # true, null, NaN... or left for the parser.
+    return end
+
+  def _followed_by_colon(self, i: int) -> bool:
+    match = _WHITESPACE.match(self._text, i)
+    if match:
+      i = match.end()
+    return self._text[i : i + 1] == ":"
+
+  def _string(self, i: int) -> int:
+    """Copies the string starting at `i` as a valid JSON string."""
+    text, out = self._text, self._out
+    if text[i] == '"':
+      match = _STRING.match(text, i)
+      if match:
+        out.append(match.group())
+        return match.end()
+
+    start = i
+    quote = text[i]
+    pieces = ['"']
+    i += 1
+    control = False
+    while i < len(text):
+      char = text[i]
+      if char == "\\" and i + 1 < len(text):
+        escaped = text[i + 1]
+        # \' is not a JSON escape; a plain ' needs none.
+        pieces.append("'" if escaped == "'" else text[i : i + 2])
+        i += 2
+        continue
+      i += 1
+      if char == quote:
+        break
+      if char == '"':
+        pieces.append('\\"')
+      elif char < " ":
+        control = True
+        pieces.append(_CONTROL_ESCAPES.get(char, f"\\u{ord(char):04x}"))
+      else:
+        pieces.append(char)
+    else:
+      # Unterminated: leave the string open for the parser to report.
+      out.append("".join(pieces))
+      return i
+    if control:
+      self._repair(REPAIR_CONTROL_CHARACTER, start)
+    pieces.append('"')
+    out.append("".join(pieces))
+    return i
+
+
+def _root_start(text: str, i: int) -> int:
+  """Index of the first '[' or '{' of `text` from `i`, or -1."""
+  starts = [j for j in (text.find("[", i), text.find("{", i)) if j >= 0]
+  return min(starts) if starts else -1
+
+
+def _parses(text: str) -> bool:
+  try:
+    json_backend.loads(text)
+  except json.JSONDecodeError:
+    return False
+  return True
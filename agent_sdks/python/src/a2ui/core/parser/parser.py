@@ -14,14 +14,19 @@
 
 import re
 from dataclasses import dataclass
-from typing import List, Optional, Any
-from ..schema.constants import A2UI_OPEN_TAG, A2UI_CLOSE_TAG
+from typing import Any, Iterator, List, Optional, Tuple
+from ..schema.constants import (
+    A2UI_CLOSE_TAG,
+    A2UI_OPEN_TAG,
+    OUTPUT_FORMAT_JSON,
+    OUTPUT_FORMAT_JSONL,
+)
 from .payload_fixer import parse_and_fix
 
-
-_A2UI_BLOCK_PATTERN = re.compile(
-    f"{re.escape(A2UI_OPEN_TAG)}(.*?){re.escape(A2UI_CLOSE_TAG)}", re.DOTALL
-)
+_WHITESPACE = re.compile(r"\s*")
+# An opening code fence, with its language, e.g. ```json.
+_OPENING_FENCE = re.compile(r"`{3,}[\w+-]*")
+_FENCE = "```"
 
 
 @dataclass
@@ -43,25 +48,122 @@ def has_a2ui_parts(content: str) -> bool:
   return A2UI_OPEN_TAG in content and A2UI_CLOSE_TAG in content
 
 
-def _sanitize_json_string(json_string: str) -> str:
-  """Sanitizes the JSON string by removing markdown code blocks."""
-  json_string = json_string.strip()
-  if json_string.startswith("```json"):
-    json_string = json_string[len("```json") :]
-  elif json_string.startswith("```"):
-    json_string = json_string[len("```") :]
-  if json_string.endswith("```"):
-    json_string = json_string[: -len("```")]
-  json_string = json_string.strip()
-  return json_string
+@dataclass(frozen=True)
+class A2uiBlockSpan:
+  """Where an A2UI block is in a response, as offsets into its text.
+
+  Attributes:
+    start: Offset of the open tag.
+    end: Offset just past the close tag, or the length of the response if the
+      block is unterminated.
+    json_start: Offset of the JSON, past the open tag, whitespace and code
+      fences.
+    json_end: Offset just past the JSON, before code fences, whitespace and
+      the close tag.
+    terminated: Whether the block has a close tag.
+  """
+
+  start: int
+  end: int
+  json_start: int
+  json_end: int
+  terminated: bool = True
+
+  def json_string(self, content: str) -> str:
+    """Returns the JSON text of the block in `content`."""
+    return content[self.json_start : self.json_end]
+
 
+def find_a2ui_blocks(content: str) -> Iterator[A2uiBlockSpan]:
+  """Finds the A2UI blocks of a response without copying any of it.
 
-def parse_response(content: str) -> List[ResponsePart]:
+  The response is scanned once with `str.find`. A block runs from an open tag
+  to the first close tag after it; an open tag without one starts an
+  unterminated block running to the end of the response, which is yielded
+  last. Code fences around the JSON, nested ones included, are excluded from
+  its span.
+
+  Args:
+    content: The raw LLM response.
+
+  Yields:
+    The span of each block, in response order.
+  """
+  position = 0
+  while True:
+    start = content.find(A2UI_OPEN_TAG, position)
+    if start < 0:
+      return
+    body_start = start + len(A2UI_OPEN_TAG)
+    body_end = content.find(A2UI_CLOSE_TAG, body_start)
+    if body_end < 0:
+      json_start, json_end = _json_bounds(content, body_start, len(content))
+      yield A2uiBlockSpan(start, len(content), json_start, json_end, False)
+      return
+    position = body_end + len(A2UI_CLOSE_TAG)
+    json_start, json_end = _json_bounds(content, body_start, body_end)
+    yield A2uiBlockSpan(start, position, json_start, json_end)
+
+
+def _json_bounds(content: str, start: int, end: int) -> Tuple[int, int]:
+  """Narrows `content[start:end]` to the JSON inside whitespace and fences."""
+  while True:
+    start = _WHITESPACE.match(content, start, end).end()
+    if not content.startswith(_FENCE, start, end):
+      break
+    start = _OPENING_FENCE.match(content, start, end).end()
+  while end > start:
+    if content[end - 1].isspace():
+      end -= 1
+    elif content.endswith(_FENCE, start, end):
+      end -= len(_FENCE)
+      while end > start and content[end - 1] == "`":
+        end -= 1
+    else:
+      break
+  return start, end
+
+
+def find_jsonl_lines(content: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+  """Finds the non-blank lines of `content[start:end]`, e.g. a JSONL block.
+
+  Yields:
+    The offsets of each line, without surrounding whitespace.
+  """
+  while start < end:
+    newline = content.find("\n", start, end)
+    next_start = end if newline < 0 else newline + 1
+    line_start = _WHITESPACE.match(content, start, next_start).end()
+    line_end = next_start
+    while line_end > line_start and content[line_end - 1].isspace():
+      line_end -= 1
+    if line_end > line_start:
+      yield line_start, line_end
+    start = next_start
+
+
+def _parse_jsonl(content: str, start: int, end: int) -> List[Any]:
+  """Parses a JSONL block, one message per line."""
+  messages = []
+  for index, (line_start, line_end) in enumerate(find_jsonl_lines(content, start, end)):
+    try:
+      messages.extend(parse_and_fix(content[line_start:line_end]))
+    except ValueError as e:
+      raise ValueError(f"A2UI message {index} (line-delimited) is invalid: {e}") from e
+  return messages
+
+
+def parse_response(
+    content: str, output_format: str = OUTPUT_FORMAT_JSON
+) -> List[ResponsePart]:
   """
   Parses the LLM response into a list of ResponsePart objects.
 
   Args:
       content: The raw LLM response.
+      output_format: How the JSON in the A2UI blocks is written, as requested
+        from `generate_system_prompt`: `OUTPUT_FORMAT_JSON` for a single JSON
+        value, or `OUTPUT_FORMAT_JSONL` for one message per line.
 
   Returns:
       A list of ResponsePart objects.
@@ -69,9 +171,9 @@ def parse_response(content: str) -> List[ResponsePart]:
   Raises:
       ValueError: If no A2UI tags are found or if the JSON part is invalid.
   """
-  matches = list(_A2UI_BLOCK_PATTERN.finditer(content))
+  spans = [span for span in find_a2ui_blocks(content) if span.terminated]
 
-  if not matches:
+  if not spans:
     raise ValueError(
         f"A2UI tags '{A2UI_OPEN_TAG}' and '{A2UI_CLOSE_TAG}' not found in response."
     )
@@ -79,20 +181,20 @@ def parse_response(content: str) -> List[ResponsePart]:
   response_parts = []
   last_end = 0
 
-  for match in matches:
-    start, end = match.span()
+  for span in spans:
     # Text preceding the JSON block
-    text_part = content[last_end:start].strip()
+    text_part = content[last_end : span.start].strip()
 
-    # The JSON content within the tags
-    json_string = match.group(1)
-    json_string_cleaned = _sanitize_json_string(json_string)
-    if not json_string_cleaned:
+    # The JSON content within the tags, without code fences
+    if span.json_start == span.json_end:
       raise ValueError("A2UI JSON part is empty.")
 
-    json_data = parse_and_fix(json_string_cleaned)
+    if output_format == OUTPUT_FORMAT_JSONL:
+      json_data = _parse_jsonl(content, span.json_start, span.json_end)
+    else:
+      json_data = parse_and_fix(span.json_string(content))
     response_parts.append(ResponsePart(text=text_part, a2ui_json=json_data))
-    last_end = end
+    last_end = span.end
 
   # Trailing text after the last JSON block
   trailing_text = content[last_end:].strip()
@@ -14,9 +14,10 @@
 
 import json
 import logging
-import re
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
+from ..schema import json_backend
+from .json_repair import RepairReport, repair_json
 
 logger = logging.getLogger(__name__)
 
@@ -30,23 +31,39 @@ def parse_and_fix(payload: str) -> List[Dict[str, Any]]:
   Returns:
     A parsed and potentially fixed payload (list of dicts).
   """
+  a2ui_json, _ = parse_and_repair(payload)
+  return a2ui_json
+
+
+def parse_and_repair(payload: str) -> Tuple[List[Dict[str, Any]], RepairReport]:
+  """Like `parse_and_fix`, but also reports the repairs that were needed.
+
+  Payloads that do not parse are repaired by `repair_json` in one pass, so
+  that common defects do not cost another LLM call.
+
+  Args:
+    payload: The raw JSON string from the LLM.
+
+  Returns:
+    The parsed payload and the repairs made, empty if it parsed as is.
+
+  Raises:
+    ValueError: If the payload cannot be repaired.
+  """
   try:
-    a2ui_json = _parse(payload)
-    return a2ui_json
-  except (
-      json.JSONDecodeError,
-      ValueError,
-  ) as e:
+    return _parse(payload), RepairReport()
+  except ValueError as e:  # Includes json.JSONDecodeError.
     logger.warning(f"Initial A2UI payload validation failed: {e}")
-    updated_payload = _remove_trailing_commas(payload)
-    a2ui_json = _parse(updated_payload)
-    return a2ui_json
+  updated_payload, report = repair_json(payload)
+  for kind in report.counts:
+    logger.warning(f"Detected {kind} in LLM output; applied autofix.")
+  return _parse(updated_payload), report
 
 
 def _parse(payload: str) -> List[Dict[str, Any]]:
   """Parses the payload and returns a list of A2UI JSON objects."""
   try:
-    a2ui_json = json.loads(payload)
+    a2ui_json = json_backend.loads(payload)
     if not isinstance(a2ui_json, list):
       logger.info("Received a single JSON object, wrapping in a list for validation.")
       a2ui_json = [a2ui_json]
@@ -54,21 +71,3 @@ def _parse(payload: str) -> List[Dict[str, Any]]:
   except json.JSONDecodeError as e:
     logger.error(f"Failed to parse JSON: {e}")
     raise ValueError(f"Failed to parse JSON: {e}")
-
-
-def _remove_trailing_commas(json_str: str) -> str:
-  """Attempts to remove trailing commas from a JSON string.
-
-  Args:
-    json_str: The raw JSON string from the LLM.
-
-  Returns:
-    A potentially fixed JSON string.
-  """
-  # Fix trailing commas: identifying commas followed by optional whitespace and a closing bracket (]) or brace (}).
-  fixed_json = re.sub(r",(?=\s*[\]}])", "", json_str)
-
-  if fixed_json != json_str:
-    logger.warning("Detected trailing commas in LLM output; applied autofix.")
-
-  return fixed_json
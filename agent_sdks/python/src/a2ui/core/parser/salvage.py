@@ -0,0 +1,327 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Salvaging the complete messages of responses cut off mid-generation."""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+from ..schema import json_backend
+from ..schema.constants import (
+    A2UI_CLOSE_TAG,
+    A2UI_OPEN_TAG,
+    OUTPUT_FORMAT_JSON,
+    OUTPUT_FORMAT_JSONL,
+    VALIDATION_FULL,
+)
+from .json_repair import COMMENTS, STRING_QUOTES, repair_json
+from .parser import A2uiBlockSpan, ResponsePart, find_a2ui_blocks, find_jsonl_lines
+from .payload_fixer import parse_and_fix
+
+REASON_TRUNCATED = "truncated"
+
+_JSON_START = re.compile(r"[\[{]")
+# Brackets, and what starts a string or comment as `repair_json` reads them.
+_STRUCTURAL = re.compile(r"[\[\]{}/" + STRING_QUOTES + "]")
+# The rest of a string after its opening quote, written so that a string that
+# never closes fails to match in linear time.
+_STRING_RESTS = {
+    quote: re.compile(rf"[^{quote}\\]*(?:\\.[^{quote}\\]*)*{quote}", re.DOTALL)
+    for quote in STRING_QUOTES
+}
+_CLOSERS = {"[": "]", "{": "}"}
+
+
+@dataclass
+class DroppedMessage:
+  """An A2UI message that could not be kept.
+
+  Attributes:
+    block: Index of the A2UI block holding the message, in response order.
+    index: Position of the message in its block.
+    reason: `REASON_TRUNCATED`, or why the message failed to parse or
+      validate.
+    text: The text of the message as generated, possibly cut off.
+    partial: For a truncated message, what it parses to once its open strings,
+      objects and arrays are closed, or None if that does not parse.
+  """
+
+  block: int
+  index: int
+  reason: str
+  text: str
+  partial: Optional[Any] = None
+
+
+@dataclass
+class SalvagedResponse:
+  """The result of `salvage_response`.
+
+  Attributes:
+    parts: The response parts, like `parse_response` returns them, holding
+      only the messages that were kept.
+    truncated: Whether the response ends inside an A2UI block.
+    dropped: The messages that were not kept, in response order.
+    continuation_offset: For a truncated response, where generation should
+      resume: the response up to this offset ends with the last complete
+      message, so `content[:continuation_offset]` can be handed back to the
+      LLM to continue instead of regenerating everything. None otherwise.
+  """
+
+  parts: List[ResponsePart] = field(default_factory=list)
+  truncated: bool = False
+  dropped: List[DroppedMessage] = field(default_factory=list)
+  continuation_offset: Optional[int] = None
+
+
+def salvage_response(
+    content: str,
+    validator: Optional[Any] = None,
+    validation_level: str = VALIDATION_FULL,
+    output_format: str = OUTPUT_FORMAT_JSON,
+) -> SalvagedResponse:
+  """Parses an LLM response, keeping what it can of a truncated one.
+
+  A response that hit the output token limit ends inside an A2UI block, with
+  the closing brackets and `</a2ui-json>` tag missing, which makes
+  `parse_response` reject it whole. Here every message that was generated in
+  full is kept and the one cut off is reported as dropped.
+
+  With a validator, each message is validated on its own and dropped if
+  invalid, so one bad message does not cost the others. Checks spanning
+  messages, such as a v0.8 `beginRendering` naming the root of a later
+  `surfaceUpdate`, are therefore not run.
+
+  In `OUTPUT_FORMAT_JSONL` blocks, each line is parsed on its own too, so a
+  line that does not parse is dropped, even in a complete block.
+
+  Args:
+    content: The raw LLM response.
+    validator: Optional validator to run against each message.
+    validation_level: How thoroughly the validator checks the messages.
+    output_format: How the JSON in the A2UI blocks is written.
+
+  Returns:
+    The kept parts, what was dropped and, if truncated, where to continue.
+
+  Raises:
+    ValueError: If the response has no A2UI block, or a complete block is
+      empty or does not parse.
+  """
+  if A2UI_OPEN_TAG not in content:
+    raise ValueError(
+        f"A2UI tags '{A2UI_OPEN_TAG}' and '{A2UI_CLOSE_TAG}' not found in response."
+    )
+
+  result = SalvagedResponse()
+  position = 0
+  for block, span in enumerate(find_a2ui_blocks(content)):
+    text = content[position : span.start].strip()
+    position = span.end
+    if not span.terminated:
+      result.truncated = True
+    elif span.json_start == span.json_end:
+      raise ValueError("A2UI JSON part is empty.")
+    if output_format == OUTPUT_FORMAT_JSONL:
+      messages = _salvage_lines(content, span, block, result)
+    elif not span.terminated:
+      messages = _salvage_block(content, span.json_start, block, result)
+    else:
+      messages = list(enumerate(parse_and_fix(span.json_string(content))))
+
+    kept = []
+    for index, message in messages:
+      try:
+        if validator:
+          validator.validate(message, level=validation_level)
+      except ValueError as e:
+        result.dropped.append(
+            DroppedMessage(block, index, str(e), json_backend.dumps(message))
+        )
+        continue
+      kept.append(message)
+    if kept:
+      result.parts.append(ResponsePart(text=text, a2ui_json=kept))
+    elif text:
+      result.parts.append(ResponsePart(text=text))
+
+  trailing_text = content[position:].strip()
+  if trailing_text:
+    result.parts.append(ResponsePart(text=trailing_text))
+  # Messages failing validation were recorded after the truncated one.
+  result.dropped.sort(key=lambda dropped: (dropped.block, dropped.index))
+  return result
+
+
+def _salvage_lines(
+    content: str, span: A2uiBlockSpan, block: int, result: SalvagedResponse
+) -> List[Tuple[int, Any]]:
+  """Parses the messages of a JSONL block line by line.
+
+  The last line of an unterminated block is dropped if it was cut off.
+  """
+  messages = []
+  cut = span.json_start
+  lines = list(find_jsonl_lines(content, span.json_start, span.json_end))
+  for index, (line_start, line_end) in enumerate(lines):
+    if not span.terminated and index == len(lines) - 1:
+      scan = _scan(content, line_start) if content[line_start] in "[{" else None
+      if scan is not None and scan.stack:
+        fragment = content[line_start:line_end]
+        partial = _close(fragment, scan)
+        result.dropped.append(
+            DroppedMessage(block, index, REASON_TRUNCATED, fragment, partial)
+        )
+        break
+    text = content[line_start:line_end]
+    try:
+      messages.extend((index, message) for message in parse_and_fix(text))
+    except ValueError as e:
+      result.dropped.append(DroppedMessage(block, index, str(e), text))
+    cut = line_end
+  if not span.terminated:
+    result.continuation_offset = cut
+  return messages
+
+
+def _salvage_block(
+    content: str, start: int, block: int, result: SalvagedResponse
+) -> List[Tuple[int, Any]]:
+  """Parses the complete messages of the unterminated block at `start`.
+
+  Records the truncated message, if any, in `result.dropped`, and where to
+  continue in `result.continuation_offset`.
+  """
+  match = _JSON_START.search(content, start)
+  if match is None:
+    result.continuation_offset = len(content)  # Only fences so far.
+    return []
+
+  json_start = match.start()
+  scan = _scan(content, json_start)
+  if not scan.stack:
+    # The JSON is complete; only the close tag is missing.
+    result.continuation_offset = scan.end
+    return list(enumerate(parse_and_fix(content[json_start : scan.end])))
+
+  # Containers opened by the truncated message, which is the whole document
+  # for a single object.
+  open_containers = scan.stack
+  cut = json_start
+  messages = []
+  if content[json_start] == "[":
+    open_containers = scan.stack[1:]
+    cut += 1
+    for index, (element_start, element_end) in enumerate(scan.elements):
+      text = content[element_start:element_end]
+      try:
+        messages.extend((index, message) for message in parse_and_fix(text))
+      except ValueError as e:
+        result.dropped.append(DroppedMessage(block, index, str(e), text))
+      cut = element_end
+
+  if scan.element_start >= 0:
+    fragment = content[scan.element_start :]
+    partial = _close(fragment, scan, open_containers)
+    result.dropped.append(
+        DroppedMessage(block, len(scan.elements), REASON_TRUNCATED, fragment, partial)
+    )
+  result.continuation_offset = cut
+  return messages
+
+
+@dataclass
+class _Scan:
+  """Where a JSON document stops, and what is open there."""
+
+  # Spans of the complete elements of a root array.
+  elements: List[Tuple[int, int]] = field(default_factory=list)
+  # Start of the incomplete message, or -1.
+  element_start: int = -1
+  # The open containers, as '[' or '{', outermost first.
+  stack: List[str] = field(default_factory=list)
+  # The quote of the string, or the end of the comment, open at the end.
+  quote: str = ""
+  comment_end: str = ""
+  # Where the document ended, when it is complete.
+  end: int = -1
+
+
+def _scan(content: str, start: int) -> _Scan:
+  """Scans the JSON document at `start` up to its end or the end of input."""
+  scan = _Scan()
+  stack = scan.stack
+  root_array = content[start] == "["
+  pos = start
+  while True:
+    match = _STRUCTURAL.search(content, pos)
+    if match is None:
+      break
+    char = match.group()
+    pos = match.end()
+    if char in STRING_QUOTES:
+      rest = _STRING_RESTS[char].match(content, pos)
+      if rest is None:
+        scan.quote = char
+        break
+      pos = rest.end()
+    elif char == "/":
+      comment_end = COMMENTS.get(content[pos - 1 : pos + 1])
+      if comment_end is None:
+        continue
+      end = content.find(comment_end, pos + 1)
+      if end < 0:
+        scan.comment_end = comment_end
+        break
+      pos = end + len(comment_end)
+    elif char in "[{":
+      if root_array and len(stack) == 1:
+        scan.element_start = match.start()
+      stack.append(char)
+    elif stack:
+      stack.pop()
+      if not stack:
+        scan.end = pos
+        break
+      if root_array and len(stack) == 1 and scan.element_start >= 0:
+        scan.elements.append((scan.element_start, pos))
+        scan.element_start = -1
+  if stack and not root_array:
+    scan.element_start = start
+  return scan
+
+
+def _close(
+    fragment: str, scan: _Scan, stack: Optional[List[str]] = None
+) -> Optional[Any]:
+  """Parses `fragment` with what `scan` found open closed.
+
+  `stack` overrides the containers to close, e.g. without the root array.
+  """
+  if scan.quote:
+    # Drop a dangling escape so that the closing quote is not escaped.
+    backslashes = len(fragment) - len(fragment.rstrip("\\"))
+    if backslashes % 2:
+      fragment = fragment[:-1]
+    fragment += scan.quote
+  fragment += scan.comment_end
+  stack = scan.stack if stack is None else stack
+  fragment += "".join(_CLOSERS[char] for char in reversed(stack))
+  repaired, _ = repair_json(fragment)
+  try:
+    return json_backend.loads(repaired)
+  except json.JSONDecodeError:
+    return None
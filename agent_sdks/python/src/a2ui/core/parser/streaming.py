@@ -0,0 +1,508 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental parsing of LLM responses as they are generated."""
+
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from ..schema import json_backend
+from ..schema.constants import A2UI_CLOSE_TAG, A2UI_OPEN_TAG
+from .json_repair import COMMENTS, STRING_QUOTES, repair_json
+from .parser import ResponsePart
+from .payload_fixer import parse_and_fix
+
+DEFAULT_MAX_BUFFER_SIZE = 1 << 20
+
+# Parser states.
+_TEXT = "text"  # Conversational text, outside any A2UI block.
+_PREAMBLE = "preamble"  # After the open tag, before the JSON (e.g. a fence).
+_JSON = "json"  # Inside the JSON of a block.
+_POSTAMBLE = "postamble"  # After the JSON, before the close tag.
+
+_JSON_START = re.compile(r"[\[{]")
+# Characters that change the scanner state, outside and inside strings and
+# comments. Strings and comments are those `repair_json` accepts. '<' can only
+# start the close tag outside strings, as JSON has no other use for it.
+_STRUCTURAL = re.compile(r"[\[\]{}</%s]" % re.escape(STRING_QUOTES))
+_STRING_SPECIAL = {
+    quote: re.compile(r"[%s\\]" % re.escape(quote)) for quote in STRING_QUOTES
+}
+# What may separate the messages of an array.
+_SEPARATORS = " \t\r\n,"
+
+COMPONENTS = "components"
+# Message keys carrying a component list, v0.8 first.
+COMPONENT_MESSAGE_KEYS = ("surfaceUpdate", "updateComponents")
+SURFACE_ID = "surfaceId"
+# The end of a message prefix about to open its component list.
+_COMPONENTS_KEY = re.compile(
+    r"""(?:"components"|'components'|(?<![\w$-])components)\s*:\s*$"""
+)
+
+
+def _partial_suffix(text: str, tag: str) -> int:
+  """Length of the longest suffix of `text` that is a proper prefix of `tag`."""
+  for length in range(min(len(tag) - 1, len(text)), 0, -1):
+    if text.endswith(tag[:length]):
+      return length
+  return 0
+
+
+class A2uiStreamParser:
+  """Parses an LLM response chunk by chunk, emitting parts as they complete.
+
+  Conversational text is emitted as soon as it cannot be the start of an
+  `<a2ui-json>` tag, with the whitespace around tags stripped like
+  `parse_response` does. Each A2UI message is emitted as soon as its element
+  of the JSON array closes, as a part whose `a2ui_json` is a one-message list,
+  so the first surface can be rendered before the response is complete. A
+  block holding a single JSON object is emitted when the object closes, and
+  so is each line of a block of JSON Lines (see `OUTPUT_FORMAT_JSONL`).
+
+  Code fences inside a block are skipped, and each message goes through
+  `parse_and_fix`. To find where messages end, the scanner reads strings and
+  comments the way `repair_json` does, so single-quoted strings and `//` or
+  `/* */` comments holding brackets do not end a message early; their repair
+  is left to `parse_and_fix`.
+
+  With `stream_components`, component update messages are not held back until
+  their whole component list is written: the components completed by each
+  `feed` are emitted as an update message of their own for the same surface,
+  so a long list is rendered from the top while the rest is generated. The
+  message header (everything before `components`, including the surface ID)
+  must come first for this; otherwise the message is emitted whole. Components
+  are not buffered once emitted, so `max_buffer_size` bounds each component
+  rather than the whole message. When the message closes, the rest of it is
+  only sent if it has keys after the component list.
+
+  Example:
+    parser = A2uiStreamParser()
+    for chunk in llm_stream:
+      for part in parser.feed(chunk):
+        send(part)
+    for part in parser.close():
+      send(part)
+
+  Args:
+    max_buffer_size: Maximum number of characters buffered while waiting for
+      a message, a streamed component or a tag to complete.
+    stream_components: Whether to emit the components of an update message in
+      batches as they complete.
+  """
+
+  def __init__(
+      self,
+      max_buffer_size: int = DEFAULT_MAX_BUFFER_SIZE,
+      stream_components: bool = False,
+  ):
+    if max_buffer_size < len(A2UI_OPEN_TAG):
+      raise ValueError(f"max_buffer_size is too small: {max_buffer_size}")
+    self._max_buffer_size = max_buffer_size
+    self._stream_components = stream_components
+    self._reset()
+
+  def _reset(self) -> None:
+    self._buffer = ""
+    self._state = _TEXT
+    # Whether the text being emitted follows a tag or starts the response.
+    self._segment_start = True
+    # JSON scanner state. `_quote` is the quote of the string being scanned
+    # and `_comment_end` what ends the comment being scanned, if any. `_pos`
+    # is where scanning resumes in the buffer.
+    # Offsets into the JSON text are absolute: `_base` is that of the start of
+    # the buffer, and `_held` holds the text before it that the pending
+    # message still needs, so each feed only copies its own chunk.
+    # `_element_start` is where the pending message starts, or -1.
+    self._root = ""
+    self._depth = 0
+    self._quote = ""
+    self._comment_end = ""
+    self._pos = 0
+    self._base = 0
+    self._held: List[str] = []
+    self._held_size = 0
+    self._element_start = -1
+    self._reset_components()
+
+  def _reset_components(self) -> None:
+    # Component streaming state of the pending message: its header with an
+    # empty component list, its text up to that list, the depth inside the
+    # list (0 when not streaming), where the pending component starts and
+    # where the list ends, and the completed components not yet emitted.
+    self._header: Optional[Dict[str, Any]] = None
+    self._prefix = ""
+    self._components_depth = 0
+    self._component_start = -1
+    self._list_end = -1
+    self._batch: List[Any] = []
+
+  def feed(self, chunk: str) -> List[ResponsePart]:
+    """Consumes a chunk of the response.
+
+    Args:
+      chunk: The next piece of the response text.
+
+    Returns:
+      The parts completed by this chunk, in response order.
+
+    Raises:
+      ValueError: If a block is empty or malformed, or a message outgrows the
+        buffer.
+    """
+    # Only the text not scanned yet is left in the buffer (see `_hold`).
+    self._buffer += chunk
+    parts: List[ResponsePart] = []
+    while self._step(parts):
+      pass
+    self._flush_components(parts)
+    if self._state == _JSON:
+      self._hold()
+    if len(self._buffer) + self._held_size > self._max_buffer_size:
+      raise ValueError(
+          "A2UI stream buffer exceeded"
+          f" {self._max_buffer_size} characters without completing a message"
+      )
+    return parts
+
+  def close(self) -> List[ResponsePart]:
+    """Signals the end of the response and returns the remaining parts.
+
+    The parser can then be reused for another response.
+
+    Raises:
+      ValueError: If an A2UI block is still open.
+    """
+    state = self._state
+    text = self._buffer.strip()
+    self._reset()
+    if state != _TEXT:
+      raise ValueError(f"Unterminated A2UI block: '{A2UI_CLOSE_TAG}' not found.")
+    return [ResponsePart(text=text)] if text else []
+
+  def _step(self, parts: List[ResponsePart]) -> bool:
+    """Advances the state machine; returns False when it needs more input."""
+    if self._state == _TEXT:
+      return self._step_text(parts)
+    if self._state == _PREAMBLE:
+      return self._step_preamble()
+    if self._state == _JSON:
+      return self._step_json(parts)
+    return self._step_postamble()
+
+  def _step_text(self, parts: List[ResponsePart]) -> bool:
+    buffer = self._buffer
+    if self._segment_start:
+      buffer = buffer.lstrip()
+    index = buffer.find(A2UI_OPEN_TAG)
+    if index >= 0:
+      self._emit_text(buffer[:index].rstrip(), parts)
+      self._buffer = buffer[index + len(A2UI_OPEN_TAG) :]
+      self._state = _PREAMBLE
+      return True
+
+    # Hold back what may be the start of a tag, and trailing whitespace that
+    # must be stripped if a tag follows.
+    end = len(buffer) - _partial_suffix(buffer, A2UI_OPEN_TAG)
+    text = buffer[:end]
+    if len(buffer) <= self._max_buffer_size:
+      text = text.rstrip()
+    self._emit_text(text, parts)
+    self._buffer = buffer[len(text) :]
+    return False
+
+  def _emit_text(self, text: str, parts: List[ResponsePart]) -> None:
+    if text:
+      parts.append(ResponsePart(text=text))
+      self._segment_start = False
+
+  def _step_preamble(self) -> bool:
+    buffer = self._buffer
+    match = _JSON_START.search(buffer)
+    close = buffer.find(A2UI_CLOSE_TAG, 0, match.start() if match else len(buffer))
+    if close >= 0:
+      raise ValueError("A2UI JSON part is empty.")
+    if match is None:
+      # Only fences and whitespace so far; keep a possible partial close tag.
+      self._buffer = buffer[len(buffer) - _partial_suffix(buffer, A2UI_CLOSE_TAG) :]
+      return False
+
+    self._buffer = buffer[match.start() :]
+    self._start_json()
+    return True
+
+  def _start_json(self) -> None:
+    """Starts scanning the JSON value at the start of the buffer."""
+    self._root = self._buffer[0]
+    self._depth = 1
+    self._quote = ""
+    self._comment_end = ""
+    self._pos = 1
+    self._base = 0
+    self._held = []
+    self._held_size = 0
+    # A single object is one message; array elements start as they are found.
+    self._element_start = 0 if self._root == "{" else -1
+    self._state = _JSON
+
+  def _text(self, start: int, end: int) -> str:
+    """The JSON text from absolute offset `start` to buffer index `end`."""
+    local = start - self._base
+    if local >= 0:
+      return self._buffer[local:end]
+    pieces = [self._buffer[:end]]
+    for piece in reversed(self._held):
+      pieces.append(piece)
+      local += len(piece)
+      if local >= 0:
+        break
+    return "".join(reversed(pieces))[local:]
+
+  def _needed_from(self) -> int:
+    """Absolute offset of the first character the pending message needs, or -1.
+
+    A streamed message needs its pending component, or the text after its
+    component list; the components emitted and its header are already parsed.
+    """
+    if self._element_start < 0 or self._header is None:
+      return self._element_start
+    if self._components_depth:
+      return self._component_start
+    return self._list_end
+
+  def _hold(self) -> None:
+    """Moves the scanned text out of the buffer, holding what is still needed."""
+    start = self._needed_from()
+    # Held text starts where the needed text does, and stays held until that
+    # changes.
+    if start < 0 or start >= self._base:
+      self._release()
+    if start >= 0:
+      piece = self._buffer[max(start - self._base, 0) : self._pos]
+      if piece:
+        self._held.append(piece)
+        self._held_size += len(piece)
+    self._buffer = self._buffer[self._pos :]
+    self._base += self._pos
+    self._pos = 0
+
+  def _release(self) -> None:
+    self._held = []
+    self._held_size = 0
+
+  def _step_json(self, parts: List[ResponsePart]) -> bool:
+    buffer = self._buffer
+    if self._quote:
+      match = _STRING_SPECIAL[self._quote].search(buffer, self._pos)
+      if match is None:
+        self._pos = len(buffer)
+        return False
+      if match.group() == "\\":
+        if match.end() >= len(buffer):
+          self._pos = match.start()  # Wait for the escaped character.
+          return False
+        self._pos = match.end() + 1
+      else:
+        self._quote = ""
+        self._pos = match.end()
+      return True
+    if self._comment_end:
+      return self._step_comment()
+
+    match = _STRUCTURAL.search(buffer, self._pos)
+    end = match.start() if match else len(buffer)
+    if self._between_messages() and buffer[self._pos : end].strip(_SEPARATORS):
+      raise ValueError("A2UI messages must be JSON objects.")
+    if match is None:
+      self._pos = len(buffer)
+      return False
+
+    char = match.group()
+    self._pos = match.end()
+    if char == "/":
+      opener = buffer[match.start() : match.end() + 1]
+      if len(opener) < 2:
+        self._pos = match.start()  # Wait to see whether a comment starts.
+        return False
+      if opener in COMMENTS:
+        self._comment_end = COMMENTS[opener]
+        self._pos = match.end() + 1
+      elif self._between_messages():
+        raise ValueError("A2UI messages must be JSON objects.")
+    elif char in STRING_QUOTES:
+      if self._between_messages():
+        raise ValueError("A2UI messages must be JSON objects.")
+      self._quote = char
+    elif char in "[{":
+      if self._between_messages():
+        self._element_start = self._base + match.start()
+      elif self._components_depth and self._depth == self._components_depth:
+        self._component_start = self._base + match.start()
+      elif (
+          char == "["
+          and self._stream_components
+          and self._depth == (3 if self._root == "[" else 2)
+      ):
+        self._start_components(self._text(self._element_start, match.start()))
+      self._depth += 1
+    elif char in "]}":
+      self._depth -= 1
+      if self._components_depth and self._depth == self._components_depth:
+        component = self._text(self._component_start, match.end())
+        self._batch.extend(parse_and_fix(component))
+        self._component_start = -1
+      elif self._components_depth and self._depth < self._components_depth:
+        self._components_depth = 0  # The component list closed.
+        self._list_end = self._base + match.start()
+      if self._depth == 0 or (self._depth == 1 and self._root == "["):
+        if self._element_start >= 0:
+          self._emit_message(match.end(), parts)
+        # Drop the consumed text so the buffer only ever holds one message.
+        self._buffer = buffer[match.end() :]
+        self._base += match.end()
+        self._pos = 0
+        self._element_start = -1
+        self._release()
+        if self._depth == 0:
+          self._state = _POSTAMBLE
+    else:  # '<'
+      return self._check_close_tag(match.start())
+    return True
+
+  def _step_comment(self) -> bool:
+    buffer = self._buffer
+    end = buffer.find(self._comment_end, self._pos)
+    # The close tag ends the block even inside a comment, as in
+    # `parse_response`.
+    tag = buffer.find("<", self._pos, len(buffer) if end < 0 else end)
+    if tag >= 0:
+      self._pos = tag + 1
+      return self._check_close_tag(tag)
+    if end < 0:
+      # Keep what may be the start of the end marker.
+      self._pos = max(self._pos, len(buffer) - len(self._comment_end) + 1)
+      return False
+    self._pos = end + len(self._comment_end)
+    self._comment_end = ""
+    return True
+
+  def _check_close_tag(self, index: int) -> bool:
+    """Checks the '<' at `index`; returns False if it may start the close tag."""
+    rest = self._buffer[index : index + len(A2UI_CLOSE_TAG)]
+    if rest == A2UI_CLOSE_TAG:
+      raise ValueError("A2UI block closed before its JSON was complete.")
+    if A2UI_CLOSE_TAG.startswith(rest):
+      self._pos = index  # Wait to see whether the tag completes.
+      return False
+    return True
+
+  def _between_messages(self) -> bool:
+    return self._root == "[" and self._depth == 1 and self._element_start < 0
+
+  def _emit_message(self, end: int, parts: List[ResponsePart]) -> None:
+    """Emits the pending message, which ends at buffer index `end`."""
+    header = self._header
+    if header is None:
+      messages = parse_and_fix(self._text(self._element_start, end))
+    else:
+      self._flush_components(parts)
+      # The components were emitted; the rest is parsed without them.
+      messages = parse_and_fix(self._prefix + "[" + self._text(self._list_end, end))
+      messages = self._remainder(header, messages)
+      self._reset_components()
+    if messages:
+      parts.append(ResponsePart(text="", a2ui_json=messages))
+
+  def _start_components(self, prefix: str) -> None:
+    """Starts streaming components if `prefix` opens a component list."""
+    match = _COMPONENTS_KEY.search(prefix)
+    if match is None:
+      return
+    # Close the message and its body right before the component list.
+    text = prefix[: match.start()].rstrip().rstrip(",") + "}}"
+    try:
+      header = json_backend.loads(text)
+    except json.JSONDecodeError:
+      try:
+        header = json_backend.loads(repair_json(text)[0])
+      except json.JSONDecodeError:
+        return
+    if not isinstance(header, dict) or not header:
+      return
+    key = list(header)[-1]
+    body = header[key]
+    if key not in COMPONENT_MESSAGE_KEYS or not isinstance(body, dict):
+      return
+    if not isinstance(body.get(SURFACE_ID), str):
+      return
+    self._header = header
+    self._prefix = prefix
+    self._components_depth = self._depth + 1
+
+  def _flush_components(self, parts: List[ResponsePart]) -> None:
+    if not self._batch:
+      return
+    parts.append(ResponsePart(text="", a2ui_json=[self._with_components(self._batch)]))
+    self._batch = []
+
+  def _with_components(self, components: List[Any]) -> Dict[str, Any]:
+    message = dict(self._header)
+    key = list(message)[-1]
+    message[key] = {**message[key], COMPONENTS: components}
+    return message
+
+  def _remainder(self, header: Dict[str, Any], messages: List[Any]) -> List[Any]:
+    """What is left to send of a streamed message, parsed without components."""
+    message = messages[0] if len(messages) == 1 else None
+    key = list(header)[-1]
+    body = message.get(key) if isinstance(message, dict) else None
+    if not isinstance(body, dict):
+      return messages
+    if not set(body) - set(header[key]) - {COMPONENTS}:
+      return []
+    return messages
+
+  def _step_postamble(self) -> bool:
+    buffer = self._buffer
+    index = buffer.find(A2UI_CLOSE_TAG)
+    # Another object starts the next message of a JSONL block.
+    start = buffer.find("{", 0, len(buffer) if index < 0 else index)
+    if start >= 0:
+      self._buffer = buffer[start:]
+      self._start_json()
+      return True
+    if index < 0:
+      self._buffer = buffer[len(buffer) - _partial_suffix(buffer, A2UI_CLOSE_TAG) :]
+      return False
+    self._buffer = buffer[index + len(A2UI_CLOSE_TAG) :]
+    self._state = _TEXT
+    self._segment_start = True
+    return True
+
+
+def parse_stream(chunks: Iterable[str], **kwargs) -> Iterator[ResponsePart]:
+  """Parses a response given as an iterable of chunks, yielding parts early.
+
+  Args:
+    chunks: The response text, in pieces.
+    **kwargs: Passed to `A2uiStreamParser`.
+
+  Yields:
+    The parts of the response as soon as each is complete.
+  """
+  parser = A2uiStreamParser(**kwargs)
+  for chunk in chunks:
+    yield from parser.feed(chunk)
+  yield from parser.close()
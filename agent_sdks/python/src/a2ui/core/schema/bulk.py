@@ -0,0 +1,148 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Validation of large batches of A2UI payloads across processes."""
+
+import collections
+import itertools
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Deque, Iterable, Iterator, List, Optional
+
+from . import json_backend
+
+if TYPE_CHECKING:
+  from .catalog import A2uiCatalog
+  from .validator import A2uiValidator
+
+DEFAULT_CHUNK_SIZE = 64
+
+# Inputs with fewer payloads are validated in this process: starting worker
+# processes, and building the validator again in each when spawned, costs more
+# than validating them.
+DEFAULT_PARALLEL_THRESHOLD = 256
+
+# Chunks submitted ahead of the one being consumed, per worker. Bounds memory
+# while keeping every worker busy.
+_CHUNKS_IN_FLIGHT_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class ValidationResult:
+  """The outcome of validating one payload.
+
+  Attributes:
+    index: Position of the payload in the input.
+    valid: Whether the payload passed validation.
+    error: The validation error message, for invalid payloads.
+  """
+
+  index: int
+  valid: bool
+  error: Optional[str] = None
+
+
+def validate_many(
+    catalog: "A2uiCatalog",
+    payloads: Iterable[Any],
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    parallel_threshold: int = DEFAULT_PARALLEL_THRESHOLD,
+) -> Iterator[ValidationResult]:
+  """Validates payloads against a catalog, optionally in worker processes.
+
+  Payloads given as `str` or `bytes` are parsed as JSON first, in the worker,
+  and fail validation if they are not valid JSON. A payload that makes the
+  validator raise any other exception fails validation with its message rather
+  than stopping the batch. Results are yielded in input order as soon as they
+  are available, and the input is consumed lazily, so arbitrarily large
+  corpora can be streamed through.
+
+  The catalog validator is built before the pool starts. Forked workers
+  inherit it; spawned workers rebuild it, loading compiled validators from the
+  on-disk cache the parent populated.
+
+  Args:
+    catalog: The catalog to validate against.
+    payloads: A2UI payloads (messages or lists of messages) or JSON text.
+    workers: Number of worker processes. 1 validates in this process.
+    chunk_size: Number of payloads sent to a worker at a time.
+    parallel_threshold: Inputs with fewer payloads are validated in this
+      process whatever `workers` is. Up to this many payloads are read ahead
+      to find out.
+
+  Yields:
+    One ValidationResult per payload.
+  """
+  if workers < 1:
+    raise ValueError(f"workers must be positive, got {workers}")
+  if chunk_size < 1:
+    raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+  validator = catalog.validator
+  items = iter(payloads)
+  head = list(itertools.islice(items, parallel_threshold)) if workers > 1 else []
+  if workers == 1 or len(head) < parallel_threshold:
+    for index, payload in enumerate(itertools.chain(head, items)):
+      yield _validate_one(validator, index, payload)
+    return
+
+  chunks = _chunks(enumerate(itertools.chain(head, items)), chunk_size)
+  pending: Deque["Future[List[ValidationResult]]"] = collections.deque()
+  with ProcessPoolExecutor(
+      max_workers=workers, initializer=_init_worker, initargs=(catalog,)
+  ) as executor:
+    for chunk in itertools.islice(chunks, workers * _CHUNKS_IN_FLIGHT_PER_WORKER):
+      pending.append(executor.submit(_validate_chunk, chunk))
+    while pending:
+      results = pending.popleft().result()
+      chunk = next(chunks, None)
+      if chunk is not None:
+        pending.append(executor.submit(_validate_chunk, chunk))
+      yield from results
+
+
+def _chunks(items: Iterator[Any], size: int) -> Iterator[List[Any]]:
+  while True:
+    chunk = list(itertools.islice(items, size))
+    if not chunk:
+      return
+    yield chunk
+
+
+def _validate_one(
+    validator: "A2uiValidator", index: int, payload: Any
+) -> ValidationResult:
+  try:
+    if isinstance(payload, (str, bytes)):
+      payload = json_backend.loads(payload)
+    validator.validate(payload)
+  except ValueError as e:  # Includes json.JSONDecodeError.
+    return ValidationResult(index=index, valid=False, error=str(e))
+  except Exception as e:  # One malformed payload must not stop the batch.
+    return ValidationResult(index=index, valid=False, error=f"{type(e).__name__}: {e}")
+  return ValidationResult(index=index, valid=True)
+
+
+# The validator of a worker process, set up once by `_init_worker`.
+_worker_validator: Optional["A2uiValidator"] = None
+
+
+def _init_worker(catalog: "A2uiCatalog") -> None:
+  global _worker_validator
+  _worker_validator = catalog.validator
+
+
+def _validate_chunk(chunk: List[Any]) -> List[ValidationResult]:
+  return [_validate_one(_worker_validator, index, payload) for index, payload in chunk]
@@ -0,0 +1,183 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Thread-safe bounded caches used by the schema layer."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+  """A snapshot of cache counters.
+
+  Attributes:
+    hits: Number of lookups served from the cache.
+    misses: Number of lookups that had to build a new value.
+    evictions: Number of entries dropped to respect `maxsize`.
+    size: Current number of entries.
+    maxsize: Maximum number of entries kept.
+    expirations: Number of entries dropped because they outlived the TTL.
+  """
+
+  hits: int
+  misses: int
+  evictions: int
+  size: int
+  maxsize: int
+  expirations: int = 0
+
+
+class LruCache(Generic[K, V]):
+  """A bounded least-recently-used cache safe for concurrent access.
+
+  Values are built outside the lock, so a slow factory never blocks lookups of
+  other keys. If two callers race on the same missing key, the first value
+  stored wins and is returned to both.
+
+  With a `ttl`, entries expire that many seconds after they were stored and
+  are dropped when next looked up.
+  """
+
+  def __init__(
+      self,
+      maxsize: int = 32,
+      ttl: Optional[float] = None,
+      clock: Callable[[], float] = time.monotonic,
+  ):
+    if maxsize < 1:
+      raise ValueError(f"Cache maxsize must be positive, got {maxsize}")
+    if ttl is not None and ttl <= 0:
+      raise ValueError(f"Cache ttl must be positive, got {ttl}")
+    self._maxsize = maxsize
+    self._ttl = ttl
+    self._clock = clock
+    # Values are stored with their expiry time, or None without a TTL.
+    self._entries: "OrderedDict[K, Tuple[V, Optional[float]]]" = OrderedDict()
+    self._lock = threading.Lock()
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+    self._expirations = 0
+
+  @property
+  def maxsize(self) -> int:
+    return self._maxsize
+
+  @property
+  def ttl(self) -> Optional[float]:
+    return self._ttl
+
+  @property
+  def stats(self) -> CacheStats:
+    with self._lock:
+      return CacheStats(
+          hits=self._hits,
+          misses=self._misses,
+          evictions=self._evictions,
+          size=len(self._entries),
+          maxsize=self._maxsize,
+          expirations=self._expirations,
+      )
+
+  def __len__(self) -> int:
+    with self._lock:
+      return len(self._entries)
+
+  def __contains__(self, key: K) -> bool:
+    with self._lock:
+      return self._live(key)
+
+  def get(self, key: K) -> Optional[V]:
+    """Returns the cached value for `key`, or None, updating the counters."""
+    with self._lock:
+      if self._live(key):
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return self._entries[key][0]
+      self._misses += 1
+      return None
+
+  def put(self, key: K, value: V) -> None:
+    """Stores `value` under `key`, evicting the least recently used entries."""
+    with self._lock:
+      self._store(key, value)
+
+  def pop(self, key: K) -> Optional[V]:
+    """Removes the entry for `key` and returns its value, or None if absent."""
+    with self._lock:
+      if not self._live(key):
+        return None
+      return self._entries.pop(key)[0]
+
+  def get_or_create(self, key: K, factory: Callable[[], V]) -> V:
+    """Returns the cached value for `key`, building it with `factory` on a miss."""
+    cached = self.get(key)
+    if cached is not None:
+      return cached
+
+    value = factory()
+    with self._lock:
+      if self._live(key):
+        # Another caller built the same entry concurrently; keep theirs.
+        self._entries.move_to_end(key)
+        return self._entries[key][0]
+      self._store(key, value)
+    return value
+
+  def resize(self, maxsize: int) -> None:
+    """Changes the capacity, evicting entries if the cache shrinks."""
+    if maxsize < 1:
+      raise ValueError(f"Cache maxsize must be positive, got {maxsize}")
+    with self._lock:
+      self._maxsize = maxsize
+      self._evict()
+
+  def clear(self) -> None:
+    """Drops all entries and resets the counters."""
+    with self._lock:
+      self._entries.clear()
+      self._hits = 0
+      self._misses = 0
+      self._evictions = 0
+      self._expirations = 0
+
+  def _live(self, key: K) -> bool:
+    """Whether `key` has an unexpired entry, dropping it if it expired."""
+    entry = self._entries.get(key)
+    if entry is None:
+      return False
+    expires_at = entry[1]
+    if expires_at is not None and self._clock() >= expires_at:
+      del self._entries[key]
+      self._expirations += 1
+      return False
+    return True
+
+  def _store(self, key: K, value: V) -> None:
+    expires_at = None if self._ttl is None else self._clock() + self._ttl
+    self._entries[key] = (value, expires_at)
+    self._entries.move_to_end(key)
+    self._evict()
+
+  def _evict(self) -> None:
+    while len(self._entries) > self._maxsize:
+      self._entries.popitem(last=False)
+      self._evictions += 1
@@ -12,15 +12,34 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import copy
+import hashlib
 import json
 import logging
 import os
+import posixpath
 from dataclasses import dataclass, field, replace
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple, TYPE_CHECKING
 
+from . import json_backend
+from .cache import LruCache
 from .catalog_provider import A2uiCatalogProvider, FileSystemCatalogProvider
-from .constants import CATALOG_COMPONENTS_KEY, CATALOG_ID_KEY
+from .component_refs import ComponentRefIndex
+from .constants import (
+    CATALOG_COMPONENTS_KEY,
+    CATALOG_ID_KEY,
+    ENCODING,
+    OUTPUT_FORMAT_JSON,
+    OUTPUT_FORMAT_JSONL,
+    SCHEMA_RENDERING_BRIEF,
+    SCHEMA_RENDERING_FULL,
+    SCHEMA_RENDERING_SIGNATURES,
+    SCHEMA_RENDERINGS,
+)
+from .rendering import compact_schema
+
+_DEFS_KEY = "$defs"
+_LOCAL_DEFS_REF = f"#/{_DEFS_KEY}/"
 
 
 @dataclass
@@ -63,6 +82,9 @@ class A2uiCatalog:
     s2c_schema: The server-to-client schema.
     common_types_schema: The common types schema.
     catalog_schema: The catalog schema.
+    compiled_validation: Whether payloads are validated with Python code
+      generated from the schemas (see `codegen`) instead of the generic
+      `jsonschema` interpreter. Does not change which payloads are accepted.
   """
 
   version: str
@@ -70,6 +92,7 @@ class A2uiCatalog:
   s2c_schema: Dict[str, Any]
   common_types_schema: Dict[str, Any]
   catalog_schema: Dict[str, Any]
+  compiled_validation: bool = False
 
   @property
   def catalog_id(self) -> str:
@@ -77,88 +100,187 @@ class A2uiCatalog:
       raise ValueError(f"Catalog '{self.name}' missing catalogId")
     return self.catalog_schema[CATALOG_ID_KEY]
 
+  @cached_property
+  def fingerprint(self) -> str:
+    """A content hash of the catalog version and all of its schemas.
+
+    Catalogs with the same fingerprint validate payloads identically, so it is
+    used to key process-wide caches such as the compiled validator cache.
+    """
+    hasher = hashlib.sha256(self.version.encode(ENCODING))
+    for schema in (self.s2c_schema, self.common_types_schema, self.catalog_schema):
+      hasher.update(b"\0")
+      hasher.update(json_backend.dumps(schema, sort_keys=True).encode(ENCODING))
+    return hasher.hexdigest()
+
+  @cached_property
+  def component_ref_index(self) -> ComponentRefIndex:
+    """The properties of each component that reference other components.
+
+    Built once per catalog instance; pruned catalogs get their own index.
+    """
+    return ComponentRefIndex.from_catalog(self)
+
+  @cached_property
+  def function_schema(self) -> Dict[str, Any]:
+    """A list of messages as a function-calling parameter schema.
+
+    See `function_schema.build_function_schema`. Built once per catalog
+    instance; callers must not modify it.
+    """
+    from .function_schema import build_function_schema
+
+    return build_function_schema(self)
+
   @property
   def validator(self) -> "A2uiValidator":
-    from .validator import A2uiValidator
+    from .validator import get_cached_validator
 
-    return A2uiValidator(self)
+    return get_cached_validator(self)
 
-  def with_pruned_components(self, allowed_components: List[str]) -> "A2uiCatalog":
+  def with_pruned_components(
+      self, allowed_components: List[str], cache: bool = True
+  ) -> "A2uiCatalog":
     """Returns a new catalog with only allowed components.
 
+    The pruned catalog shares the sub-schemas it keeps with this one instead
+    of copying them, so neither must be modified. Definitions of `$defs` that
+    only the pruned components need are dropped with them. Results are cached
+    process-wide by catalog fingerprint and component set (see
+    `get_pruned_catalog_cache`), so pruning per request is a lookup.
+
     Args:
       allowed_components: List of component names to include.
+      cache: Whether to go through the cache. Turn it off for catalogs that
+        are used once, so they do not evict the ones served.
 
     Returns:
-      A copy of the catalog with only allowed components.
+      The catalog with only allowed components, or this catalog if all are
+      allowed.
     """
-
-    schema_copy = copy.deepcopy(self.catalog_schema)
-
     # Allow all components if no allowed components are specified
     if not allowed_components:
       return self
 
-    if CATALOG_COMPONENTS_KEY in schema_copy and isinstance(
-        schema_copy[CATALOG_COMPONENTS_KEY], dict
-    ):
-      all_comps = schema_copy[CATALOG_COMPONENTS_KEY]
-      schema_copy[CATALOG_COMPONENTS_KEY] = {
-          k: v for k, v in all_comps.items() if k in allowed_components
-      }
-
-    # Filter anyComponent oneOf if it exists
-    # Path: $defs -> anyComponent -> oneOf
-    if "$defs" in schema_copy and "anyComponent" in schema_copy["$defs"]:
-      any_comp = schema_copy["$defs"]["anyComponent"]
-      if "oneOf" in any_comp and isinstance(any_comp["oneOf"], list):
-        filtered_one_of = []
-        for item in any_comp["oneOf"]:
-          if "$ref" in item:
-            ref = item["$ref"]
-            if ref.startswith(f"#/{CATALOG_COMPONENTS_KEY}/"):
-              comp_name = ref.split("/")[-1]
-              if comp_name in allowed_components:
-                filtered_one_of.append(item)
-            else:
-              logging.warning(f"Skipping unknown ref format: {ref}")
-          else:
-            logging.warning(f"Skipping non-ref item in anyComponent oneOf: {item}")
-
-        any_comp["oneOf"] = filtered_one_of
-
-    return replace(self, catalog_schema=schema_copy)
-
-  def render_as_llm_instructions(self) -> str:
-    """Renders the catalog and schema as LLM instructions."""
+    allowed = frozenset(allowed_components)
+    components = self.catalog_schema.get(CATALOG_COMPONENTS_KEY)
+    if isinstance(components, dict):
+      allowed = allowed.intersection(components)
+      if len(allowed) == len(components):
+        return self
+
+    if not cache:
+      return replace(self, catalog_schema=_prune_catalog_schema(self, allowed))
+    return _PRUNED_CATALOG_CACHE.get_or_create(
+        (self.fingerprint, self.name, self.compiled_validation, allowed),
+        lambda: replace(self, catalog_schema=_prune_catalog_schema(self, allowed)),
+    )
+
+  def render_as_llm_instructions(
+      self, rendering: str = SCHEMA_RENDERING_FULL, cache: bool = True
+  ) -> str:
+    """Renders the catalog and schema as LLM instructions.
+
+    The rendering is cached process-wide by catalog fingerprint (see
+    `get_instructions_cache`), so catalogs rebuilt with the same content, e.g.
+    per request from an inline catalog, are rendered once.
+
+    Args:
+      rendering: `SCHEMA_RENDERING_FULL` for the schemas as indented JSON,
+        `SCHEMA_RENDERING_COMPACT` for minified JSON without boilerplate keys
+        nor definitions repeating the common types, or
+        `SCHEMA_RENDERING_BRIEF` for that with descriptions cut to their first
+        sentence, or `SCHEMA_RENDERING_SIGNATURES` for TypeScript-like type
+        declarations (see `signatures.render_signatures`).
+      cache: Whether to go through the cache. Turn it off for renderings that
+        are used once, so they do not evict the ones served.
+
+    Raises:
+      ValueError: If the rendering is unknown.
+    """
+    if rendering not in SCHEMA_RENDERINGS:
+      raise ValueError(
+          f"Unknown schema rendering '{rendering}', expected one of {SCHEMA_RENDERINGS}"
+      )
+    if not cache:
+      return self._render_llm_instructions(rendering)
+    return _INSTRUCTIONS_CACHE.get_or_create(
+        (self.fingerprint, rendering),
+        lambda: self._render_llm_instructions(rendering),
+    )
+
+  def _render_llm_instructions(self, rendering: str) -> str:
+    if rendering == SCHEMA_RENDERING_SIGNATURES:
+      from .signatures import render_signatures
+
+      return render_signatures(self)
+
+    s2c_schema = self.s2c_schema
+    common_types_schema = self.common_types_schema
+    catalog_schema = self.catalog_schema
+    indent = 2
+    if rendering != SCHEMA_RENDERING_FULL:
+      brief = rendering == SCHEMA_RENDERING_BRIEF
+      shared_defs = (common_types_schema or {}).get("$defs")
+      common_types_id = (common_types_schema or {}).get("$id", "common_types.json")
+      shared_ref = f"{posixpath.basename(common_types_id)}#/$defs/"
+      s2c_schema = compact_schema(s2c_schema, shared_defs, shared_ref, brief)
+      common_types_schema = compact_schema(common_types_schema, brief=brief)
+      catalog_schema = compact_schema(catalog_schema, shared_defs, shared_ref, brief)
+      indent = None
+
     all_schemas = []
     all_schemas.append("---BEGIN A2UI JSON SCHEMA---")
 
     server_client_str = (
-        json.dumps(self.s2c_schema, indent=2) if self.s2c_schema else "{}"
+        json_backend.dumps(s2c_schema, indent=indent) if s2c_schema else "{}"
     )
     all_schemas.append(f"### Server To Client Schema:\n{server_client_str}")
 
-    if self.common_types_schema:
-      common_str = json.dumps(self.common_types_schema, indent=2)
+    if common_types_schema:
+      common_str = json_backend.dumps(common_types_schema, indent=indent)
       all_schemas.append(f"### Common Types Schema:\n{common_str}")
 
-    catalog_str = json.dumps(self.catalog_schema, indent=2)
+    catalog_str = json_backend.dumps(catalog_schema, indent=indent)
     all_schemas.append(f"### Catalog Schema:\n{catalog_str}")
 
     all_schemas.append("---END A2UI JSON SCHEMA---")
 
     return "\n\n".join(all_schemas)
 
-  def load_examples(self, path: Optional[str], validate: bool = False) -> str:
-    """Loads and validates examples from a directory."""
+  def load_examples(
+      self,
+      path: Optional[str],
+      validate: bool = False,
+      output_format: str = OUTPUT_FORMAT_JSON,
+  ) -> str:
+    """Loads and validates examples from a directory.
+
+    With `OUTPUT_FORMAT_JSONL`, examples holding a list of messages are
+    rewritten with one message per line.
+    """
+    examples = self.read_examples(path, validate=validate, output_format=output_format)
+    return "\n\n".join(format_example(name, content) for name, content in examples)
+
+  def read_examples(
+      self,
+      path: Optional[str],
+      validate: bool = False,
+      output_format: str = OUTPUT_FORMAT_JSON,
+  ) -> List[Tuple[str, str]]:
+    """Reads the examples of a directory, as in `load_examples`.
+
+    Returns:
+      The name (file name without extension) and content of each example,
+      sorted by name.
+    """
     if not path or not os.path.isdir(path):
       if path:
         logging.warning(f"Example path {path} is not a directory")
-      return ""
+      return []
 
-    merged_examples = []
-    for filename in os.listdir(path):
+    examples = []
+    for filename in sorted(os.listdir(path)):
       if filename.endswith(".json"):
         full_path = os.path.join(path, filename)
         basename = os.path.splitext(filename)[0]
@@ -167,20 +289,156 @@ class A2uiCatalog:
             content = f.read()
             if validate and not self._validate_example(full_path, basename, content):
               continue
-            merged_examples.append(
-                f"---BEGIN {basename}---\n{content}\n---END {basename}---"
-            )
+            if output_format == OUTPUT_FORMAT_JSONL:
+              content = _as_jsonl(content)
+            examples.append((basename, content))
         except Exception as e:
           logging.warning(f"Failed to load example {full_path}: {e}")
-    if not merged_examples:
-      return ""
-    return "\n\n".join(merged_examples)
+    return examples
 
   def _validate_example(self, full_path: str, basename: str, content: str) -> bool:
     try:
-      json_data = json.loads(content)
+      json_data = json_backend.loads(content)
       self.validator.validate(json_data)
     except Exception as e:
       logging.warning(f"Failed to validate example {full_path}: {e}")
       return False
     return True
+
+
+# Rendering the schemas as indented JSON dominates the cost of building a
+# prompt, so rendered instructions are shared process-wide and keyed by the
+# catalog content fingerprint and the rendering.
+DEFAULT_INSTRUCTIONS_CACHE_SIZE = 32
+_INSTRUCTIONS_CACHE: LruCache[Tuple[str, str], str] = LruCache(
+    maxsize=DEFAULT_INSTRUCTIONS_CACHE_SIZE
+)
+
+
+def get_instructions_cache() -> LruCache[Tuple[str, str], str]:
+  """Returns the process-wide cache of rendered catalog instructions."""
+  return _INSTRUCTIONS_CACHE
+
+
+# Pruned catalogs, keyed by the fingerprint, name and validation mode of the
+# catalog they come from and the allowed components.
+DEFAULT_PRUNED_CATALOG_CACHE_SIZE = 64
+_PRUNED_CATALOG_CACHE: LruCache[Tuple[str, str, bool, FrozenSet[str]], A2uiCatalog] = (
+    LruCache(maxsize=DEFAULT_PRUNED_CATALOG_CACHE_SIZE)
+)
+
+
+def get_pruned_catalog_cache() -> (
+    LruCache[Tuple[str, str, bool, FrozenSet[str]], A2uiCatalog]
+):
+  """Returns the process-wide cache of pruned catalogs."""
+  return _PRUNED_CATALOG_CACHE
+
+
+def _prune_catalog_schema(
+    catalog: A2uiCatalog, allowed: FrozenSet[str]
+) -> Dict[str, Any]:
+  """Returns the catalog schema with only `allowed` components.
+
+  Only the containers that change are copied: the schema, its components,
+  its `$defs` and `anyComponent`.
+  """
+  schema = dict(catalog.catalog_schema)
+  dropped = []
+  components = schema.get(CATALOG_COMPONENTS_KEY)
+  if isinstance(components, dict):
+    schema[CATALOG_COMPONENTS_KEY] = {
+        k: v for k, v in components.items() if k in allowed
+    }
+    dropped = [v for k, v in components.items() if k not in allowed]
+
+  defs = schema.get(_DEFS_KEY)
+  if not isinstance(defs, dict):
+    return schema
+  defs = dict(defs)
+
+  # Filter anyComponent oneOf if it exists
+  # Path: $defs -> anyComponent -> oneOf
+  any_comp = defs.get("anyComponent")
+  if isinstance(any_comp, dict) and isinstance(any_comp.get("oneOf"), list):
+    filtered_one_of = []
+    for item in any_comp["oneOf"]:
+      if "$ref" in item:
+        ref = item["$ref"]
+        if ref.startswith(f"#/{CATALOG_COMPONENTS_KEY}/"):
+          comp_name = ref.split("/")[-1]
+          if comp_name in allowed:
+            filtered_one_of.append(item)
+        else:
+          logging.warning(f"Skipping unknown ref format: {ref}")
+      else:
+        logging.warning(f"Skipping non-ref item in anyComponent oneOf: {item}")
+    defs["anyComponent"] = {**any_comp, "oneOf": filtered_one_of}
+
+  # Definitions reachable from the pruned components but not from what is
+  # kept are dropped. Those referenced from the other schemas are kept, as
+  # are definitions nothing references.
+  roots = [value for key, value in schema.items() if key != _DEFS_KEY]
+  roots.extend(defs[name] for name in _external_def_names(catalog) if name in defs)
+  if "anyComponent" in defs:
+    roots.append(defs["anyComponent"])
+  unneeded = _def_closure(dropped, defs) - _def_closure(roots, defs)
+  schema[_DEFS_KEY] = {k: v for k, v in defs.items() if k not in unneeded}
+  return schema
+
+
+def _def_closure(schemas: List[Any], defs: Dict[str, Any]) -> Set[str]:
+  """The names of the `$defs` that `schemas` reference, transitively."""
+  names = set()
+  pending = list(schemas)
+  while pending:
+    node = pending.pop()
+    if isinstance(node, dict):
+      ref = node.get("$ref")
+      if isinstance(ref, str) and ref.startswith(_LOCAL_DEFS_REF):
+        name = ref[len(_LOCAL_DEFS_REF) :].partition("/")[0]
+        if name in defs and name not in names:
+          names.add(name)
+          pending.append(defs[name])
+      pending.extend(node.values())
+    elif isinstance(node, list):
+      pending.extend(node)
+  return names
+
+
+def _external_def_names(catalog: A2uiCatalog) -> Set[str]:
+  """The `$defs` names the other schemas reference in another document.
+
+  References are not resolved, so a definition of the catalog with the name
+  of a referenced definition of another document is kept too.
+  """
+  names = set()
+  pending = [catalog.s2c_schema, catalog.common_types_schema]
+  while pending:
+    node = pending.pop()
+    if isinstance(node, dict):
+      ref = node.get("$ref")
+      if isinstance(ref, str):
+        path, _, fragment = ref.partition("#")
+        if path and fragment.startswith(f"/{_DEFS_KEY}/"):
+          names.add(fragment[len(_DEFS_KEY) + 2 :].partition("/")[0])
+      pending.extend(node.values())
+    elif isinstance(node, list):
+      pending.extend(node)
+  return names
+
+
+def format_example(name: str, content: str) -> str:
+  """Writes an example as shown in prompts, between markers naming it."""
+  return f"---BEGIN {name}---\n{content}\n---END {name}---"
+
+
+def _as_jsonl(content: str) -> str:
+  """Rewrites a JSON list of messages with one message per line."""
+  try:
+    messages = json_backend.loads(content)
+  except json.JSONDecodeError:
+    return content  # Shown as written; validation reports it if enabled.
+  if not isinstance(messages, list):
+    messages = [messages]
+  return "\n".join(json_backend.dumps(message) for message in messages)
@@ -0,0 +1,916 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Generates specialized Python validators from A2UI schemas.
+
+The generic `jsonschema` interpreter re-dispatches every keyword of every
+subschema for every payload. For a given catalog the schema never changes, so
+this module translates it once into plain Python functions, one per
+(subschema, base URI) pair, in the spirit of fastjsonschema.
+
+A generated validator only answers whether a payload is valid. It accepts and
+rejects exactly what `Draft202012Validator` does, without a format checker;
+callers fall back to `jsonschema` to describe rejected payloads. Constructs the
+generator does not translate (e.g. `$dynamicRef`) make the generated code bail
+out, in which case it returns None and the caller must use `jsonschema`.
+
+Generated modules are cached on disk keyed by a hash of the schema they were
+generated from (`source_key`), so only the first process that sees a catalog
+pays for code generation. Cached modules are executed on load, so they are only
+loaded from a directory and file owned by the user running the agent and
+writable by no one else.
+"""
+
+import ast
+import hashlib
+import importlib.metadata
+import itertools
+import logging
+import numbers
+import os
+import re
+import stat
+import tempfile
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from jsonschema import Draft202012Validator
+from jsonschema_specifications import REGISTRY as SPECIFICATIONS
+from referencing import Registry
+from referencing.exceptions import Unresolvable
+from referencing.jsonschema import DRAFT202012
+
+from . import json_backend
+from .constants import ENCODING
+from .discriminator import build_dispatch
+
+# Bump whenever the generated code changes, to invalidate on-disk caches.
+CODEGEN_VERSION = "2"
+
+# Directory of the on-disk cache. An empty value disables the disk cache.
+CACHE_DIR_ENV = "A2UI_VALIDATOR_CACHE_DIR"
+
+_HEADER = "# A2UI compiled validator, codegen v{version}, key {key}"
+
+# A compiled validator returns True or False, or None when the payload needs a
+# construct the generated code does not handle.
+CompiledValidator = Callable[[Any], Optional[bool]]
+
+_TYPE_CHECKS = {
+    "array": "isinstance(d, list)",
+    "boolean": "isinstance(d, bool)",
+    "integer": "_is_integer(d)",
+    "null": "d is None",
+    "number": "_is_number(d)",
+    "object": "isinstance(d, dict)",
+    "string": "isinstance(d, str)",
+}
+
+_OBJECT_KEYWORDS = (
+    "required",
+    "minProperties",
+    "maxProperties",
+    "properties",
+    "patternProperties",
+    "additionalProperties",
+    "propertyNames",
+    "dependentRequired",
+    "dependentSchemas",
+    "unevaluatedProperties",
+)
+_ARRAY_KEYWORDS = (
+    "minItems",
+    "maxItems",
+    "uniqueItems",
+    "prefixItems",
+    "items",
+    "contains",
+)
+_STRING_KEYWORDS = ("minLength", "maxLength", "pattern")
+_NUMBER_KEYWORDS = (
+    "minimum",
+    "maximum",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+    "multipleOf",
+)
+_GENERIC_KEYWORDS = (
+    "type",
+    "const",
+    "enum",
+    "$ref",
+    "allOf",
+    "anyOf",
+    "oneOf",
+    "not",
+    "if",
+    "format",
+)
+
+# The dialect generated code implements; subschemas declaring another one
+# are left to `jsonschema`, which validates them in their own dialect.
+_DIALECTS = (
+    Draft202012Validator.META_SCHEMA["$id"],
+    Draft202012Validator.META_SCHEMA["$id"] + "#",
+)
+
+# Assertion and applicator keywords of the validator that are not translated.
+_UNSUPPORTED_KEYWORDS = frozenset(Draft202012Validator.VALIDATORS) - frozenset(
+    _OBJECT_KEYWORDS
+    + _ARRAY_KEYWORDS
+    + _STRING_KEYWORDS
+    + _NUMBER_KEYWORDS
+    + _GENERIC_KEYWORDS
+)
+
+
+class CompiledValidatorFallback(Exception):
+  """Raised by generated code when a payload needs `jsonschema` itself."""
+
+
+class UnsupportedSchemaError(ValueError):
+  """Raised when a schema cannot be translated at all."""
+
+
+def _is_number(instance: Any) -> bool:
+  return not isinstance(instance, bool) and isinstance(instance, numbers.Number)
+
+
+def _is_integer(instance: Any) -> bool:
+  if isinstance(instance, bool):
+    return False
+  return isinstance(instance, int) or (
+      isinstance(instance, float) and instance.is_integer()
+  )
+
+
+def _not_multiple(instance: Any, multiple_of: Any) -> bool:
+  # Mirrors the `multipleOf` keyword of jsonschema, including its float handling.
+  if isinstance(multiple_of, float):
+    quotient = instance / multiple_of
+    try:
+      return int(quotient) != quotient
+    except OverflowError:
+      raise CompiledValidatorFallback("multipleOf overflow")
+  return bool(instance % multiple_of)
+
+
+# `_equal` and `_uniq` mirror the `const`, `enum` and `uniqueItems` comparisons
+# of jsonschema (`jsonschema._utils.equal` and `uniq`), which are not public:
+# `True` is not `1` and `False` is not `0`, in containers too.
+_TRUE = object()
+_FALSE = object()
+
+
+def _unbool(element: Any) -> Any:
+  if element is True:
+    return _TRUE
+  if element is False:
+    return _FALSE
+  return element
+
+
+def _equal(one: Any, two: Any) -> bool:
+  if one is two:
+    return True
+  if isinstance(one, str) or isinstance(two, str):
+    return one == two
+  if isinstance(one, Sequence) and isinstance(two, Sequence):
+    return len(one) == len(two) and all(_equal(i, j) for i, j in zip(one, two))
+  if isinstance(one, Mapping) and isinstance(two, Mapping):
+    return len(one) == len(two) and all(
+        key in two and _equal(value, two[key]) for key, value in one.items()
+    )
+  return _unbool(one) == _unbool(two)
+
+
+def _uniq(container: Any) -> bool:
+  try:
+    ordered = sorted(_unbool(i) for i in container)
+    for i, j in zip(ordered, itertools.islice(ordered, 1, None)):
+      if _equal(i, j):
+        return False
+  except (NotImplementedError, TypeError):
+    seen = []
+    for element in container:
+      element = _unbool(element)
+      if any(_equal(i, element) for i in seen):
+        return False
+      seen.append(element)
+  return True
+
+
+def _valid(instance: Any) -> bool:
+  return True
+
+
+def _invalid(instance: Any) -> bool:
+  return False
+
+
+def _no_keys(instance: Any) -> Tuple[()]:
+  return ()
+
+
+# Names available to generated modules besides their own definitions.
+_RUNTIME = {
+    "re": re,
+    "_equal": _equal,
+    "_uniq": _uniq,
+    "_is_number": _is_number,
+    "_is_integer": _is_integer,
+    "_not_multiple": _not_multiple,
+    "_valid": _valid,
+    "_invalid": _invalid,
+    "_no_keys": _no_keys,
+    "_Fallback": CompiledValidatorFallback,
+}
+
+
+class _Generator:
+  """Translates a schema and everything it references into Python source.
+
+  Every function is keyed by the subschema and the base URI it is evaluated
+  under, which is exactly the state `jsonschema` threads through `descend` and
+  `$ref` resolution.
+  """
+
+  def __init__(self, schema: Any, registry: Registry):
+    resource = DRAFT202012.create_resource(schema)
+    self._root = (schema, SPECIFICATIONS.combine(registry).resolver_with_root(resource))
+    self._names: Dict[Tuple[str, int, str], str] = {}
+    self._pending: List[Tuple[str, str, Any, Any]] = []
+    # Keeps every translated subschema alive so that `id()` keys stay unique.
+    self._schemas: List[Any] = []
+    self._assignments: Dict[Tuple[Any, str], str] = {}
+    self._constants: List[str] = []
+    self._definitions: List[str] = []
+    # Dispatch tables reference functions, so they are emitted last.
+    self._tables: List[str] = []
+
+  def generate(self, header: str) -> str:
+    entry = self._validity(*self._root)
+    while self._pending:
+      kind, name, schema, resolver = self._pending.pop()
+      if kind == "v":
+        body = self._validity_body(schema, resolver)
+      else:
+        body = self._evaluated_body(schema, resolver)
+      self._definitions.append(
+          "\n".join([f"def {name}(d):"] + [f"  {line}" for line in body])
+      )
+
+    return (
+        "\n\n".join(
+            [header]
+            + self._constants
+            + self._definitions
+            + self._tables
+            + [f"def validate(d):\n  return {entry}(d)"]
+        )
+        + "\n"
+    )
+
+  # Function registry.
+
+  def _function(self, kind: str, schema: Any, resolver: Any) -> str:
+    # `referencing` has no public accessor for the base URI of a resolver;
+    # `_base_uri` is present in every release from the minimum required one.
+    key = (kind, id(schema), resolver._base_uri)
+    name = self._names.get(key)
+    if name is None:
+      name = f"_{kind}{len(self._names)}"
+      self._names[key] = name
+      self._schemas.append(schema)
+      self._pending.append((kind, name, schema, resolver))
+    return name
+
+  def _validity(self, schema: Any, resolver: Any) -> str:
+    """Name of a function telling whether an instance is valid under `schema`."""
+    if schema is True or schema == {}:
+      return "_valid"
+    if schema is False:
+      return "_invalid"
+    return self._function("v", schema, resolver)
+
+  def _descend(self, schema: Any, resolver: Any) -> str:
+    """Like `_validity`, for a subschema entered through `descend`."""
+    if isinstance(schema, dict):
+      resolver = resolver.in_subresource(DRAFT202012.create_resource(schema))
+    return self._validity(schema, resolver)
+
+  def _evaluated(self, schema: Any, resolver: Any) -> str:
+    """Name of a function returning the object keys `schema` evaluates."""
+    if isinstance(schema, bool) or schema == {}:
+      return "_no_keys"
+    return self._function("e", schema, resolver)
+
+  def _resolve(self, ref: str, resolver: Any):
+    try:
+      return resolver.lookup(ref)
+    except Unresolvable:
+      return None
+
+  def _constant(self, value: Any) -> str:
+    if isinstance(value, frozenset):
+      literal = f"frozenset({sorted(value)!r})"
+      embedded = f"{sorted(value)!r}"
+      expected: Any = sorted(value)
+    else:
+      literal = embedded = repr(value)
+      expected = value
+    try:
+      if ast.literal_eval(embedded) != expected:
+        raise ValueError(literal)
+    except (ValueError, SyntaxError):
+      raise UnsupportedSchemaError(f"Cannot embed schema value {literal}")
+    return self._assign("_c", (type(value), literal), literal, self._constants)
+
+  def _compiled_pattern(self, pattern: str) -> str:
+    re.compile(pattern)  # Raises re.error, as jsonschema would on validation.
+    return self._assign(
+        "_p", (re.Pattern, pattern), f"re.compile({pattern!r})", self._constants
+    )
+
+  def _table(self, entries: Dict[str, str]) -> str:
+    items = ", ".join(f"{key!r}: {value}" for key, value in entries.items())
+    return self._assign("_t", (dict, items), f"{{{items}}}", self._tables)
+
+  def _assign(
+      self, prefix: str, key: Tuple[Any, str], expression: str, section: List[str]
+  ) -> str:
+    name = self._assignments.get(key)
+    if name is None:
+      name = f"{prefix}{len(self._assignments)}"
+      self._assignments[key] = name
+      section.append(f"{name} = {expression}")
+    return name
+
+  # Validity functions.
+
+  def _validity_body(self, schema: Any, resolver: Any) -> List[str]:
+    if not isinstance(schema, dict):
+      return ["raise _Fallback('non-schema value')"]
+    if schema.get("$schema", _DIALECTS[0]) not in _DIALECTS:
+      return ["raise _Fallback('$schema')"]
+    unsupported = _UNSUPPORTED_KEYWORDS.intersection(schema)
+    if unsupported:
+      return [f"raise _Fallback({sorted(unsupported)!r})"]
+    try:
+      return self._validity_lines(schema, resolver) + ["return True"]
+    except (UnsupportedSchemaError, re.error, TypeError, AttributeError) as e:
+      # Malformed keyword values: let jsonschema report them.
+      return [f"raise _Fallback({str(e)!r})"]
+
+  def _validity_lines(self, schema: Dict[str, Any], resolver: Any) -> List[str]:
+    lines: List[str] = []
+    narrowed = None
+
+    if "type" in schema:
+      types = schema["type"]
+      types = [types] if isinstance(types, str) else list(types)
+      if any(t not in _TYPE_CHECKS for t in types):
+        raise UnsupportedSchemaError(f"Unknown type in {types}")
+      checks = " or ".join(_TYPE_CHECKS[t] for t in types) or "False"
+      lines.append(f"if not ({checks}):")
+      lines.append("  return False")
+      if len(types) == 1:
+        narrowed = types[0]
+
+    if "const" in schema:
+      const = schema["const"]
+      if isinstance(const, str):
+        lines.append(f"if not d == {self._constant(const)}:")
+      else:
+        lines.append(f"if not _equal(d, {self._constant(const)}):")
+      lines.append("  return False")
+
+    if "enum" in schema:
+      enum = schema["enum"]
+      if isinstance(enum, list) and all(isinstance(e, str) for e in enum):
+        lines.append(
+            f"if not (isinstance(d, str) and d in {self._constant(frozenset(enum))}):"
+        )
+      else:
+        lines.append(f"if not any(_equal(e, d) for e in {self._constant(list(enum))}):")
+      lines.append("  return False")
+
+    lines += self._guarded("object", narrowed, self._object_lines(schema, resolver))
+    lines += self._guarded("array", narrowed, self._array_lines(schema, resolver))
+    lines += self._guarded("string", narrowed, self._string_lines(schema))
+    lines += self._guarded("number", narrowed, self._number_lines(schema))
+
+    if "$ref" in schema:
+      resolved = self._resolve(schema["$ref"], resolver)
+      if resolved is None:
+        lines.append(f"raise _Fallback({'unresolvable ' + schema['$ref']!r})")
+        return lines
+      lines.append(f"if not {self._validity(resolved.contents, resolved.resolver)}(d):")
+      lines.append("  return False")
+
+    for sub in schema.get("allOf", ()):
+      lines.append(f"if not {self._descend(sub, resolver)}(d):")
+      lines.append("  return False")
+
+    if "anyOf" in schema:
+      branches = ", ".join(self._descend(sub, resolver) for sub in schema["anyOf"])
+      lines.append(f"if not any(f(d) for f in ({branches},)):")
+      lines.append("  return False")
+
+    if "oneOf" in schema:
+      lines += self._one_of_lines(schema, resolver)
+
+    if "not" in schema:
+      lines.append(f"if {self._validity(schema['not'], resolver)}(d):")
+      lines.append("  return False")
+
+    if "if" in schema and ("then" in schema or "else" in schema):
+      lines.append(f"if {self._validity(schema['if'], resolver)}(d):")
+      if "then" in schema:
+        lines.append(f"  if not {self._descend(schema['then'], resolver)}(d):")
+        lines.append("    return False")
+      else:
+        lines.append("  pass")
+      if "else" in schema:
+        lines.append(f"elif not {self._descend(schema['else'], resolver)}(d):")
+        lines.append("  return False")
+
+    return lines
+
+  def _one_of_lines(self, schema: Dict[str, Any], resolver: Any) -> List[str]:
+    branches = schema["oneOf"]
+    # jsonschema finds the first valid branch through `descend` and checks
+    # the remaining ones without entering their subresource.
+    lines = ["for i, f in enumerate(("]
+    lines += [f"    {self._descend(sub, resolver)}," for sub in branches]
+    lines.append(")):")
+    lines.append("  if f(d):")
+    lines.append("    break")
+    lines.append("else:")
+    lines.append("  return False")
+    rest = ", ".join(self._validity(sub, resolver) for sub in branches)
+    lines.append(f"for f in ({rest},)[i + 1:]:")
+    lines.append("  if f(d):")
+    lines.append("    return False")
+
+    dispatch = build_dispatch(branches, schema, resolver)
+    if dispatch is None:
+      return lines
+
+    # Tagged unions: the tag rules out every other branch.
+    if dispatch.property_name is not None:
+      table = self._table({
+          value: self._descend(branches[index], resolver)
+          for value, index in dispatch.by_value.items()
+      })
+      selected = [
+          "f = None",
+          "if isinstance(d, dict):",
+          f"  t = d.get({dispatch.property_name!r})",
+          "  if isinstance(t, str):",
+          f"    f = {table}.get(t, _invalid)",
+      ]
+    else:
+      table = self._table({
+          key: self._descend(branches[index], resolver)
+          for key, index in dispatch.by_key.items()
+      })
+      selected = [
+          "f = None",
+          "if isinstance(d, dict):",
+          f"  fs = {{f for k, f in {table}.items() if k in d}}",
+          "  if len(fs) == 1:",
+          "    f = fs.pop()",
+      ]
+    return (
+        selected
+        + ["if f is not None:", "  if not f(d):", "    return False", "else:"]
+        + [f"  {line}" for line in lines]
+    )
+
+  def _guarded(
+      self, json_type: str, narrowed: Optional[str], body: List[str]
+  ) -> List[str]:
+    if not body:
+      return []
+    if narrowed == json_type or (json_type == "number" and narrowed == "integer"):
+      return body
+    if narrowed is not None:
+      return []  # The type check already rejects every other type.
+    return [f"if {_TYPE_CHECKS[json_type]}:"] + [f"  {line}" for line in body]
+
+  def _object_lines(self, schema: Dict[str, Any], resolver: Any) -> List[str]:
+    lines: List[str] = []
+
+    if "required" in schema and schema["required"]:
+      lines.append(
+          f"if not d.keys() >= {self._constant(frozenset(schema['required']))}:"
+      )
+      lines.append("  return False")
+    if "minProperties" in schema:
+      lines.append(f"if len(d) < {schema['minProperties']!r}:")
+      lines.append("  return False")
+    if "maxProperties" in schema:
+      lines.append(f"if len(d) > {schema['maxProperties']!r}:")
+      lines.append("  return False")
+
+    properties = schema.get("properties", {})
+    patterns = schema.get("patternProperties", {})
+    additional = schema.get("additionalProperties", True)
+    if properties or (additional is not True and additional != {}):
+      table = self._table(
+          {name: self._descend(sub, resolver) for name, sub in properties.items()}
+      )
+      lines.append("for k, x in d.items():")
+      lines.append(f"  f = {table}.get(k)")
+      if additional is True or additional == {}:
+        lines.append("  if f is not None and not f(x):")
+        lines.append("    return False")
+      else:
+        lines.append("  if f is None:")
+        extra = "    "
+        if patterns:
+          # find_additional_properties joins the patterns into one regex.
+          joined = self._compiled_pattern("|".join(patterns))
+          lines.append(f"    if {joined}.search(k):")
+          lines.append("      continue")
+        lines.append(f"{extra}if not {self._descend(additional, resolver)}(x):")
+        lines.append(f"{extra}  return False")
+        lines.append("  elif not f(x):")
+        lines.append("    return False")
+
+    for pattern, sub in patterns.items():
+      compiled = self._compiled_pattern(pattern)
+      lines.append("for k, x in d.items():")
+      lines.append(
+          f"  if {compiled}.search(k) and not {self._descend(sub, resolver)}(x):"
+      )
+      lines.append("    return False")
+
+    if "propertyNames" in schema:
+      lines.append("for k in d:")
+      lines.append(f"  if not {self._descend(schema['propertyNames'], resolver)}(k):")
+      lines.append("    return False")
+
+    for name, dependency in schema.get("dependentRequired", {}).items():
+      lines.append(
+          f"if {name!r} in d and not d.keys() >="
+          f" {self._constant(frozenset(dependency))}:"
+      )
+      lines.append("  return False")
+
+    for name, dependency in schema.get("dependentSchemas", {}).items():
+      lines.append(
+          f"if {name!r} in d and not {self._descend(dependency, resolver)}(d):"
+      )
+      lines.append("  return False")
+
+    if "unevaluatedProperties" in schema:
+      unevaluated = schema["unevaluatedProperties"]
+      lines.append(f"evaluated = {self._evaluated(schema, resolver)}(d)")
+      lines.append("for k, x in d.items():")
+      lines.append(
+          f"  if k not in evaluated and not {self._descend(unevaluated, resolver)}(x):"
+      )
+      lines.append("    return False")
+
+    return lines
+
+  def _array_lines(self, schema: Dict[str, Any], resolver: Any) -> List[str]:
+    lines: List[str] = []
+
+    if "minItems" in schema:
+      lines.append(f"if len(d) < {schema['minItems']!r}:")
+      lines.append("  return False")
+    if "maxItems" in schema:
+      lines.append(f"if len(d) > {schema['maxItems']!r}:")
+      lines.append("  return False")
+    if schema.get("uniqueItems"):
+      lines.append("if not _uniq(d):")
+      lines.append("  return False")
+
+    prefix_items = schema.get("prefixItems", [])
+    for index, sub in enumerate(prefix_items):
+      lines.append(
+          f"if len(d) > {index} and not {self._descend(sub, resolver)}(d[{index}]):"
+      )
+      lines.append("  return False")
+
+    if "items" in schema:
+      items = schema["items"]
+      prefix = len(prefix_items)
+      if items is False:
+        lines.append(f"if len(d) > {prefix}:")
+        lines.append("  return False")
+      else:
+        rest = f"d[{prefix}:]" if prefix else "d"
+        lines.append(f"for x in {rest}:")
+        lines.append(f"  if not {self._descend(items, resolver)}(x):")
+        lines.append("    return False")
+
+    if "contains" in schema:
+      min_contains = schema.get("minContains", 1)
+      max_contains = schema.get("maxContains")
+      counted = (
+          f"sum(1 for x in d if {self._validity(schema['contains'], resolver)}(x))"
+      )
+      lines.append(f"matches = {counted}")
+      if max_contains is not None:
+        lines.append(f"if matches > {max_contains!r}:")
+        lines.append("  return False")
+      lines.append(f"if matches < {min_contains!r}:")
+      lines.append("  return False")
+
+    return lines
+
+  def _string_lines(self, schema: Dict[str, Any]) -> List[str]:
+    lines: List[str] = []
+    if "minLength" in schema:
+      lines.append(f"if len(d) < {schema['minLength']!r}:")
+      lines.append("  return False")
+    if "maxLength" in schema:
+      lines.append(f"if len(d) > {schema['maxLength']!r}:")
+      lines.append("  return False")
+    if "pattern" in schema:
+      lines.append(f"if not {self._compiled_pattern(schema['pattern'])}.search(d):")
+      lines.append("  return False")
+    return lines
+
+  def _number_lines(self, schema: Dict[str, Any]) -> List[str]:
+    lines: List[str] = []
+    comparisons = (
+        ("minimum", "<"),
+        ("maximum", ">"),
+        ("exclusiveMinimum", "<="),
+        ("exclusiveMaximum", ">="),
+    )
+    for keyword, operator in comparisons:
+      if keyword in schema:
+        lines.append(f"if d {operator} {self._constant(schema[keyword])}:")
+        lines.append("  return False")
+    if "multipleOf" in schema:
+      lines.append(f"if _not_multiple(d, {self._constant(schema['multipleOf'])}):")
+      lines.append("  return False")
+    return lines
+
+  # Evaluated-keys functions, mirroring find_evaluated_property_keys_by_schema.
+
+  def _evaluated_body(self, schema: Any, resolver: Any) -> List[str]:
+    if not isinstance(schema, dict):
+      return ["raise _Fallback('non-schema value')"]
+    if "$dynamicRef" in schema:
+      return ["raise _Fallback('$dynamicRef')"]
+    if schema.get("$schema", _DIALECTS[0]) not in _DIALECTS:
+      return ["raise _Fallback('$schema')"]
+    try:
+      return (
+          ["evaluated = set()"]
+          + self._evaluated_lines(schema, resolver)
+          + ["return evaluated"]
+      )
+    except (UnsupportedSchemaError, re.error, TypeError, AttributeError) as e:
+      return [f"raise _Fallback({str(e)!r})"]
+
+  def _evaluated_lines(self, schema: Dict[str, Any], resolver: Any) -> List[str]:
+    lines: List[str] = []
+
+    if "$ref" in schema:
+      resolved = self._resolve(schema["$ref"], resolver)
+      if resolved is None:
+        return [f"raise _Fallback({'unresolvable ' + schema['$ref']!r})"]
+      lines.append(
+          f"evaluated.update({self._evaluated(resolved.contents, resolved.resolver)}(d))"
+      )
+
+    properties = schema.get("properties")
+    if isinstance(properties, dict) and properties:
+      lines.append(
+          f"evaluated.update({self._constant(frozenset(properties))}.intersection(d))"
+      )
+
+    for keyword in ("additionalProperties", "unevaluatedProperties"):
+      if keyword not in schema or schema[keyword] is None:
+        continue
+      sub = schema[keyword]
+      if sub is True or sub == {}:
+        lines.append("evaluated.update(d)")
+      elif sub is not False:
+        lines.append(
+            "evaluated.update(k for k, x in d.items()"
+            f" if {self._descend(sub, resolver)}(x))"
+        )
+
+    for pattern in schema.get("patternProperties", {}):
+      compiled = self._compiled_pattern(pattern)
+      lines.append(f"evaluated.update(k for k in d if {compiled}.search(k))")
+
+    for name, dependency in schema.get("dependentSchemas", {}).items():
+      lines.append(f"if {name!r} in d:")
+      lines.append(f"  evaluated.update({self._evaluated(dependency, resolver)}(d))")
+
+    for keyword in ("allOf", "oneOf", "anyOf"):
+      for sub in schema.get(keyword, ()):
+        lines.append(f"if {self._descend(sub, resolver)}(d):")
+        lines.append(f"  evaluated.update({self._evaluated(sub, resolver)}(d))")
+
+    if "if" in schema:
+      lines.append(f"if {self._validity(schema['if'], resolver)}(d):")
+      lines.append(f"  evaluated.update({self._evaluated(schema['if'], resolver)}(d))")
+      if "then" in schema:
+        lines.append(
+            f"  evaluated.update({self._evaluated(schema['then'], resolver)}(d))"
+        )
+      if "else" in schema:
+        lines.append("else:")
+        lines.append(
+            f"  evaluated.update({self._evaluated(schema['else'], resolver)}(d))"
+        )
+
+    return lines
+
+
+def generate_validator_source(
+    schema: Dict[str, Any], registry: Registry, key: str = ""
+) -> str:
+  """Translates a JSON Schema (draft 2020-12) into Python source.
+
+  Args:
+    schema: The root schema.
+    registry: The registry used to resolve `$ref`s, as passed to
+      `Draft202012Validator`.
+    key: Identifies the schema in the generated header, e.g. `source_key`.
+
+  Returns:
+    The source of a module whose `validate(instance)` function returns whether
+    the instance is valid, or raises `CompiledValidatorFallback`.
+
+  Raises:
+    UnsupportedSchemaError: If the schema contains values that cannot be
+      embedded in Python source.
+  """
+  header = _HEADER.format(version=CODEGEN_VERSION, key=key)
+  return _Generator(schema, registry).generate(header)
+
+
+def compile_validator_source(
+    source: str, filename: str = "<a2ui>"
+) -> CompiledValidator:
+  """Executes generated source and returns its guarded entry point."""
+  namespace = dict(_RUNTIME)
+  exec(compile(source, filename, "exec"), namespace)
+  validate = namespace["validate"]
+
+  def compiled(instance: Any) -> Optional[bool]:
+    try:
+      return validate(instance)
+    except CompiledValidatorFallback:
+      return None
+    except Exception:  # e.g. RecursionError; jsonschema will decide.
+      return None
+
+  return compiled
+
+
+def default_cache_dir() -> Optional[str]:
+  """Returns the on-disk cache directory, or None if disk caching is disabled."""
+  if CACHE_DIR_ENV in os.environ:
+    return os.environ[CACHE_DIR_ENV] or None
+  cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+      os.path.expanduser("~"), ".cache"
+  )
+  return os.path.join(cache_home, "a2ui", "validators")
+
+
+def _package_version() -> str:
+  try:
+    return importlib.metadata.version("a2ui-agent")
+  except importlib.metadata.PackageNotFoundError:
+    return "unknown"
+
+
+_PACKAGE_VERSION = _package_version()
+
+
+def source_key(schema: Dict[str, Any], registry: Registry) -> str:
+  """Returns a content hash of everything the generated source depends on.
+
+  That is the schema and registry as built, which may differ between releases
+  for the same catalog, and the versions of this package and of the generator.
+  """
+  digest = hashlib.sha256()
+  parts = [
+      CODEGEN_VERSION,
+      _PACKAGE_VERSION,
+      json_backend.dumps(schema, sort_keys=True),
+  ]
+  for uri in sorted(registry):
+    parts.append(uri)
+    parts.append(json_backend.dumps(registry.contents(uri), sort_keys=True))
+  for part in parts:
+    digest.update(part.encode(ENCODING))
+    digest.update(b"\0")
+  return digest.hexdigest()
+
+
+def load_compiled_validator(
+    schema: Dict[str, Any],
+    registry: Registry,
+    cache_dir: Optional[str] = None,
+) -> Optional[CompiledValidator]:
+  """Loads the compiled validator of a schema, generating it on a cache miss.
+
+  Args:
+    schema: The root schema.
+    registry: The registry used to resolve `$ref`s.
+    cache_dir: The on-disk cache directory. Defaults to `default_cache_dir()`.
+
+  Returns:
+    The compiled validator, or None if the schema could not be compiled.
+  """
+  if cache_dir is None:
+    cache_dir = default_cache_dir()
+  key = source_key(schema, registry)
+  header = _HEADER.format(version=CODEGEN_VERSION, key=key)
+  path = os.path.join(cache_dir, f"{key}.py") if cache_dir else None
+
+  source = _read_cached_source(path, header) if path else None
+  if source is None:
+    try:
+      source = generate_validator_source(schema, registry, key)
+    except Exception as e:
+      logging.warning(f"Failed to generate a compiled validator: {e}")
+      return None
+    if path:
+      _write_cached_source(path, source)
+
+  try:
+    return compile_validator_source(source, path or "<a2ui>")
+  except Exception as e:
+    logging.warning(f"Failed to load the compiled validator {path}: {e}")
+    return None
+
+
+def _is_private(st: os.stat_result) -> bool:
+  """Whether a file is owned by the current user and writable by no one else."""
+  if not hasattr(os, "getuid"):  # No POSIX ownership, e.g. on Windows.
+    return True
+  return st.st_uid == os.getuid() and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _read_cached_source(path: str, header: str) -> Optional[str]:
+  directory = os.path.dirname(path)
+  try:
+    if not _is_private(os.stat(directory)):
+      logging.warning(
+          f"Ignoring compiled validators in {directory}: it must be owned by the"
+          " current user and writable by no one else"
+      )
+      return None
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+  except OSError:
+    return None
+  with os.fdopen(fd, "r", encoding=ENCODING) as f:
+    if not _is_private(os.fstat(fd)):
+      logging.warning(
+          f"Ignoring compiled validator {path}: it must be owned by the current"
+          " user and writable by no one else"
+      )
+      return None
+    try:
+      source = f.read()
+    except (OSError, UnicodeDecodeError):
+      return None
+  if not source.startswith(header + "\n"):
+    logging.warning(f"Ignoring stale compiled validator {path}")
+    return None
+  return source
+
+
+def _write_cached_source(path: str, source: str) -> None:
+  directory = os.path.dirname(path)
+  try:
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not _is_private(os.stat(directory)):
+      # Would be ignored by `_read_cached_source`.
+      return
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+      with os.fdopen(fd, "w", encoding=ENCODING) as f:
+        f.write(source)
+      os.replace(tmp_path, path)
+    except BaseException:
+      os.unlink(tmp_path)
+      raise
+  except OSError as e:
+    logging.warning(f"Failed to cache the compiled validator in {directory}: {e}")
@@ -0,0 +1,206 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Structural checks over the component graph of a surface."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .component_refs import ComponentRefIndex
+from .constants import (
+    ISSUE_INTEGRITY,
+    ISSUE_RECURSION,
+    ISSUE_TOPOLOGY,
+    MAX_GLOBAL_DEPTH,
+)
+
+ID = "id"
+
+
+@dataclass(frozen=True)
+class GraphError:
+  """A structural problem found in a component graph.
+
+  Attributes:
+    message: Human readable description of the problem.
+    component_index: Position of the offending component in the `components`
+      array, if the problem is tied to one component.
+    kind: The category of the problem: `ISSUE_INTEGRITY` (IDs and references),
+      `ISSUE_TOPOLOGY` (self-references, cycles, orphans) or `ISSUE_RECURSION`
+      (depth).
+  """
+
+  message: str
+  component_index: Optional[int] = None
+  kind: str = ISSUE_INTEGRITY
+
+
+@dataclass
+class ComponentGraph:
+  """The ID index and reference adjacency of a batch of components.
+
+  Built in a single pass over the components; every check then runs against
+  this structure without re-extracting references.
+
+  Attributes:
+    positions: First position of each component ID in the batch.
+    edges: Outgoing references per component ID, as (target_id, field_name),
+      in payload order.
+    duplicates: (component_id, position) of every repeated ID.
+    anonymous_edges: (position, target_id, field_name) for references held by
+      components without an ID.
+  """
+
+  positions: Dict[str, int] = field(default_factory=dict)
+  edges: Dict[str, List[Tuple[str, str]]] = field(default_factory=dict)
+  duplicates: List[Tuple[str, int]] = field(default_factory=list)
+  anonymous_edges: List[Tuple[int, str, str]] = field(default_factory=list)
+
+  @classmethod
+  def build(
+      cls, components: List[Dict[str, Any]], ref_index: ComponentRefIndex
+  ) -> "ComponentGraph":
+    """Indexes component IDs and references in one pass."""
+    graph = cls()
+    for position, comp in enumerate(components):
+      graph.add(position, comp, ref_index)
+    return graph
+
+  def add(
+      self, position: int, comp: Dict[str, Any], ref_index: ComponentRefIndex
+  ) -> None:
+    """Indexes one component, found at `position` in the batch."""
+    comp_id = comp.get(ID)
+    refs = list(ref_index.references(comp))
+    if comp_id is None:
+      self.anonymous_edges.extend((position, ref, name) for ref, name in refs)
+    elif comp_id in self.positions:
+      self.duplicates.append((comp_id, position))
+      self.edges[comp_id].extend(refs)
+    else:
+      self.positions[comp_id] = position
+      self.edges[comp_id] = refs
+
+  def iter_errors(self, root_id: Optional[str]) -> Iterator[GraphError]:
+    """Yields every structural problem, most fundamental first.
+
+    Checks performed:
+    1.  All component IDs are unique.
+    2.  The root component exists.
+    3.  All references point to existing IDs.
+    4.  No component references itself.
+    5.  No circular references and no path deeper than `MAX_GLOBAL_DEPTH`.
+    6.  Every component is reachable from the root.
+
+    In an incremental update (`root_id` is None), components may reference IDs
+    already on the client, so only checks 1, 4 and 5 apply.
+
+    Args:
+      root_id: The root component ID of the surface, or None for an
+        incremental update.
+    """
+    positions = self.positions
+
+    for comp_id, position in self.duplicates:
+      yield GraphError(f"Duplicate component ID: {comp_id}", position)
+
+    if root_id is not None:
+      if root_id not in positions:
+        yield GraphError(f"Missing root component: No component has id='{root_id}'")
+
+      for comp_id, refs in self._edges_in_payload_order():
+        for ref_id, field_name in refs:
+          if ref_id not in positions:
+            yield GraphError(
+                f"Component '{comp_id}' references non-existent component"
+                f" '{ref_id}' in field '{field_name}'",
+                positions.get(comp_id),
+            )
+
+    for comp_id, refs in self.edges.items():
+      for ref_id, field_name in refs:
+        if ref_id == comp_id:
+          yield GraphError(
+              f"Self-reference detected: Component '{comp_id}' references itself"
+              f" in field '{field_name}'",
+              positions[comp_id],
+              ISSUE_TOPOLOGY,
+          )
+
+    visited: Set[str] = set()
+    if root_id is not None:
+      if root_id in positions:
+        yield from self._traverse(root_id, visited)
+
+      orphans = [comp_id for comp_id in positions if comp_id not in visited]
+      for comp_id in sorted(orphans):
+        yield GraphError(
+            f"Component '{comp_id}' is not reachable from '{root_id}'",
+            positions[comp_id],
+            ISSUE_TOPOLOGY,
+        )
+    else:
+      for comp_id in positions:
+        if comp_id not in visited:
+          yield from self._traverse(comp_id, visited)
+
+  def _edges_in_payload_order(self) -> Iterator[Tuple[Optional[str], List]]:
+    for comp_id, refs in self.edges.items():
+      yield comp_id, refs
+    for _, ref_id, field_name in self.anonymous_edges:
+      yield None, [(ref_id, field_name)]
+
+  def _traverse(self, start_id: str, visited: Set[str]) -> Iterator[GraphError]:
+    """Depth-first traversal with an explicit stack.
+
+    Visits nodes in the same order as a recursive DFS, reporting the first
+    back edge into each component as a cycle and the first path that exceeds
+    `MAX_GLOBAL_DEPTH`. Traversal continues past problems so that
+    reachability stays accurate.
+    """
+    edges = self.edges
+    on_path: Set[str] = set()
+    reported_cycles: Set[str] = set()
+    depth_reported = False
+
+    visited.add(start_id)
+    on_path.add(start_id)
+    stack = [(start_id, iter(edges.get(start_id, ())), 0)]
+    while stack:
+      node_id, neighbors, depth = stack[-1]
+      for neighbor, _ in neighbors:
+        if neighbor == node_id:
+          continue  # Reported as a self-reference.
+        if neighbor not in visited:
+          if depth + 1 > MAX_GLOBAL_DEPTH and not depth_reported:
+            depth_reported = True
+            yield GraphError(
+                f"Global recursion limit exceeded: logical depth > {MAX_GLOBAL_DEPTH}",
+                self.positions.get(neighbor),
+                ISSUE_RECURSION,
+            )
+          visited.add(neighbor)
+          on_path.add(neighbor)
+          stack.append((neighbor, iter(edges.get(neighbor, ())), depth + 1))
+          break
+        if neighbor in on_path and neighbor not in reported_cycles:
+          reported_cycles.add(neighbor)
+          yield GraphError(
+              f"Circular reference detected involving component '{neighbor}'",
+              self.positions.get(neighbor),
+              ISSUE_TOPOLOGY,
+          )
+      else:
+        stack.pop()
+        on_path.discard(node_id)
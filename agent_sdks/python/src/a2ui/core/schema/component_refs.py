@@ -0,0 +1,232 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Index of the component properties that reference other components."""
+
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterator, Set, Tuple
+
+from .constants import CATALOG_COMPONENTS_KEY, VERSION_0_8
+
+if TYPE_CHECKING:
+  from .catalog import A2uiCatalog
+
+# Property names treated as single component references regardless of schema.
+_SINGLE_REF_NAMES = ("child", "contentChild", "entryPointChild")
+# Property names treated as child lists regardless of schema.
+_LIST_REF_NAMES = ("children",)
+# Key of the component ID inside tab-style nested items, e.g. Tabs.tabs[i].child.
+NESTED_CHILD_KEY = "child"
+
+_COMBINATORS = ("oneOf", "anyOf", "allOf")
+
+
+@dataclass(frozen=True)
+class ComponentRefFields:
+  """The reference-carrying properties of a single component type.
+
+  Attributes:
+    single: Properties holding one component ID (e.g. `child`).
+    lists: Properties holding a list of component IDs or a ChildList object
+      (e.g. `children`).
+  """
+
+  single: FrozenSet[str] = frozenset()
+  lists: FrozenSet[str] = frozenset()
+
+
+_NO_FIELDS = ComponentRefFields()
+
+
+@dataclass(frozen=True)
+class ComponentRefIndex:
+  """Which properties of each catalog component reference other components.
+
+  The index is derived once from the catalog schemas so that validation only
+  has to walk the payload. Arrays of items with a `child` (e.g. `tabs` in
+  Tabs) are recognized in the payload, for every component type.
+
+  Attributes:
+    fields: Reference fields keyed by component type name.
+  """
+
+  fields: Dict[str, ComponentRefFields] = field(default_factory=dict)
+
+  @classmethod
+  def from_catalog(cls, catalog: "A2uiCatalog") -> "ComponentRefIndex":
+    """Builds the index from the component definitions of a catalog."""
+    return cls(
+        fields={
+            comp_name: _extract_ref_fields(comp_schema)
+            for comp_name, comp_schema in _catalog_components(catalog).items()
+        }
+    )
+
+  def fields_for(self, comp_type: str) -> ComponentRefFields:
+    """Returns the reference fields of a component type."""
+    return self.fields.get(comp_type, _NO_FIELDS)
+
+  def references(self, component: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """Yields (referenced_id, field_name) for every reference in a component.
+
+    Supports both the v0.9+ flattened form (`{"component": "Card", ...}`) and
+    the v0.8 structured form (`{"component": {"Card": {...}}}`).
+    """
+    comp_val = component.get("component")
+    if isinstance(comp_val, str):
+      yield from self._references_in_props(comp_val, component)
+    elif isinstance(comp_val, dict):
+      for comp_type, props in comp_val.items():
+        if isinstance(props, dict):
+          yield from self._references_in_props(comp_type, props)
+
+  def _references_in_props(
+      self, comp_type: str, props: Dict[str, Any]
+  ) -> Iterator[Tuple[str, str]]:
+    if not comp_type:
+      return
+
+    ref_fields = self.fields.get(comp_type, _NO_FIELDS)
+
+    for key, value in props.items():
+      if key in ref_fields.single:
+        if isinstance(value, str):
+          yield value, key
+        elif isinstance(value, dict) and "componentId" in value:  # ChildList template
+          yield value["componentId"], f"{key}.componentId"
+      elif key in ref_fields.lists:
+        if isinstance(value, list):
+          for item in value:
+            if isinstance(item, str):
+              yield item, key
+        elif isinstance(value, dict):
+          if "explicitList" in value:
+            for item in value["explicitList"]:
+              if isinstance(item, str):
+                yield item, f"{key}.explicitList"
+          elif "template" in value:
+            template = value["template"]
+            if isinstance(template, dict) and "componentId" in template:
+              yield template["componentId"], f"{key}.template.componentId"
+          elif "componentId" in value:
+            yield value["componentId"], f"{key}.componentId"
+
+      # Tab-style arrays of {title, child} items, whatever their schema says.
+      if isinstance(value, list) and key not in ref_fields.lists:
+        for idx, item in enumerate(value):
+          if isinstance(item, dict):
+            child_id = item.get(NESTED_CHILD_KEY)
+            if child_id and isinstance(child_id, str):
+              yield child_id, f"{key}[{idx}].{NESTED_CHILD_KEY}"
+
+
+def _catalog_components(catalog: "A2uiCatalog") -> Dict[str, Any]:
+  """Returns the component definitions of a catalog, keyed by type name."""
+  all_components = {}
+  if catalog.version == VERSION_0_8:
+    # Components may be inlined in the s2c schema:
+    # surfaceUpdate -> components -> items -> properties -> component -> properties
+    try:
+      s2c = catalog.s2c_schema or {}
+      props = s2c.get("properties", {})
+      if "surfaceUpdate" in props:
+        su = props["surfaceUpdate"].get("properties", {})
+        if "components" in su:
+          items = su["components"].get("items", {})
+          if "properties" in items:
+            comp_wrapper = items["properties"].get("component", {})
+            all_components = comp_wrapper.get("properties", {})
+    except Exception:
+      logging.warning("Failed to extract component ref fields from v0.8 schema")
+
+    if not all_components and catalog.catalog_schema:
+      all_components = catalog.catalog_schema.get(CATALOG_COMPONENTS_KEY, {})
+  else:  # v0.9+
+    all_components = catalog.catalog_schema.get(CATALOG_COMPONENTS_KEY, {})
+
+  return all_components if isinstance(all_components, dict) else {}
+
+
+def _is_component_id_ref(prop_schema: Dict[str, Any]) -> bool:
+  """Checks whether a property schema looks like a ComponentId reference."""
+  if not isinstance(prop_schema, dict):
+    return False
+  ref = prop_schema.get("$ref", "")
+  if isinstance(ref, str) and (
+      ref.endswith("ComponentId") or ref.endswith("child") or "/child" in ref
+  ):
+    return True
+
+  if prop_schema.get("type") == "string" and prop_schema.get("title") == "ComponentId":
+    return True
+
+  return any(
+      _is_component_id_ref(sub)
+      for key in _COMBINATORS
+      for sub in prop_schema.get(key, [])
+  )
+
+
+def _is_child_list_ref(prop_schema: Dict[str, Any]) -> bool:
+  """Checks whether a property schema looks like a ChildList reference."""
+  if not isinstance(prop_schema, dict):
+    return False
+  ref = prop_schema.get("$ref", "")
+  if isinstance(ref, str) and (
+      ref.endswith("ChildList") or ref.endswith("children") or "/children" in ref
+  ):
+    return True
+
+  if prop_schema.get("type") == "object":
+    props = prop_schema.get("properties", {})
+    if "explicitList" in props or "template" in props or "componentId" in props:
+      return True
+
+  if prop_schema.get("type") == "array":
+    if _is_component_id_ref(prop_schema.get("items", {})):
+      return True
+
+  return any(
+      _is_child_list_ref(sub)
+      for key in _COMBINATORS
+      for sub in prop_schema.get(key, [])
+  )
+
+
+def _extract_ref_fields(comp_schema: Dict[str, Any]) -> ComponentRefFields:
+  """Collects the reference fields of one component schema."""
+  single_refs: Set[str] = set()
+  list_refs: Set[str] = set()
+
+  def extract_from_props(cs: Dict[str, Any]):
+    if not isinstance(cs, dict):
+      return
+    props = cs.get("properties", {})
+    for prop_name, prop_schema in props.items():
+      if _is_component_id_ref(prop_schema) or prop_name in _SINGLE_REF_NAMES:
+        single_refs.add(prop_name)
+      elif _is_child_list_ref(prop_schema) or prop_name in _LIST_REF_NAMES:
+        list_refs.add(prop_name)
+
+    # Recurse into allOf/oneOf/anyOf for properties
+    for key in _COMBINATORS:
+      for sub in cs.get(key, []):
+        extract_from_props(sub)
+
+  extract_from_props(comp_schema)
+  return ComponentRefFields(
+      single=frozenset(single_refs),
+      lists=frozenset(list_refs),
+  )
@@ -44,6 +44,30 @@ SPEC_VERSION_MAP = {
 
 SPECIFICATION_DIR = "specification"
 
+# Recursion Limits
+MAX_GLOBAL_DEPTH = 50
+MAX_FUNC_CALL_DEPTH = 5
+
+# Categories of the issues in a validation report.
+ISSUE_SCHEMA = "schema"
+ISSUE_INTEGRITY = "integrity"
+ISSUE_TOPOLOGY = "topology"
+ISSUE_RECURSION = "recursion"
+ISSUE_PATH = "path"
+
+# Validation levels, from cheapest to most thorough. Structural checks are
+# integrity, topology, recursion and path syntax.
+VALIDATION_NONE = "none"
+VALIDATION_STRUCTURAL = "structural"
+VALIDATION_SCHEMA = "schema"
+VALIDATION_FULL = "full"
+VALIDATION_LEVELS = (
+    VALIDATION_NONE,
+    VALIDATION_STRUCTURAL,
+    VALIDATION_SCHEMA,
+    VALIDATION_FULL,
+)
+
 ENCODING = "utf-8"
 
 A2UI_OPEN_TAG = "<a2ui-json>"
@@ -56,3 +80,32 @@ The generated response MUST follow these rules:
 3.  Between or around these blocks, you can provide conversational text.
 4.  The JSON part MUST be a single, raw JSON object (usually a list of A2UI messages) and MUST validate against the provided A2UI JSON SCHEMA.
 """
+
+# Formats of the JSON inside an A2UI block.
+OUTPUT_FORMAT_JSON = "json"  # A single JSON value, usually a list of messages.
+OUTPUT_FORMAT_JSONL = "jsonl"  # JSON Lines, one message per line.
+OUTPUT_FORMATS = (OUTPUT_FORMAT_JSON, OUTPUT_FORMAT_JSONL)
+
+# How schemas are rendered into LLM instructions.
+SCHEMA_RENDERING_FULL = "full"  # Indented JSON, as defined.
+# Minified JSON without boilerplate keys or duplicated definitions.
+SCHEMA_RENDERING_COMPACT = "compact"
+# Compact, with descriptions cut to their first sentence.
+SCHEMA_RENDERING_BRIEF = "brief"
+# TypeScript-like type declarations (see `signatures.py`).
+SCHEMA_RENDERING_SIGNATURES = "signatures"
+SCHEMA_RENDERINGS = (
+    SCHEMA_RENDERING_FULL,
+    SCHEMA_RENDERING_COMPACT,
+    SCHEMA_RENDERING_BRIEF,
+    SCHEMA_RENDERING_SIGNATURES,
+)
+
+JSONL_WORKFLOW_RULES = f"""
+The generated response MUST follow these rules:
+1.  The response can contain one or more A2UI JSON blocks.
+2.  Each A2UI JSON block MUST be wrapped in `{A2UI_OPEN_TAG}` and `{A2UI_CLOSE_TAG}` tags.
+3.  Between or around these blocks, you can provide conversational text.
+4.  The JSON part MUST be in JSON Lines format: one A2UI message per line, each a single, raw JSON object on one line that MUST validate against the provided A2UI JSON SCHEMA.
+5.  Do NOT wrap the messages in a list, do NOT put commas between them, and do NOT break a message across lines.
+"""
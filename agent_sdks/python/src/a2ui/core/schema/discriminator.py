@@ -0,0 +1,217 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Discriminator-based dispatch for `oneOf` unions.
+
+A2UI unions are tagged: components by their `component` name (annotated with
+`"discriminator": {"propertyName": "component"}` in catalogs) and messages by
+their single top-level key (`createSurface`, `updateComponents`, ...). Instead
+of trying every branch, the validator reads the tag and validates the instance
+against the one branch that can match it. This accepts and rejects exactly the
+same instances as a plain `oneOf`, because the tag rules out every other
+branch, while reporting the errors of the intended branch.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Type
+
+from jsonschema import Draft202012Validator, ValidationError
+from jsonschema.validators import extend
+from referencing.exceptions import Unresolvable
+from referencing.jsonschema import DRAFT202012
+
+DISCRIMINATOR = "discriminator"
+PROPERTY_NAME = "propertyName"
+
+# Bounds the $ref/allOf chains followed to find the tag of a branch.
+_MAX_TAG_DEPTH = 16
+
+
+@dataclass(frozen=True)
+class OneOfDispatch:
+  """How to find the only `oneOf` branch an instance can match.
+
+  Attributes:
+    property_name: The discriminator property, for unions annotated with a
+      `discriminator`. None for unions tagged by a required key.
+    by_value: Branch index by discriminator value.
+    by_key: Branch index by a required key that no other branch requires.
+  """
+
+  property_name: Optional[str] = None
+  by_value: Dict[str, int] = field(default_factory=dict)
+  by_key: Dict[str, int] = field(default_factory=dict)
+
+  def tag(self, instance: Any) -> Optional[str]:
+    """Returns the discriminator value of an instance, if it has one."""
+    if self.property_name is None or not isinstance(instance, dict):
+      return None
+    value = instance.get(self.property_name)
+    return value if isinstance(value, str) else None
+
+  def select(self, instance: Any) -> Optional[int]:
+    """Returns the index of the only branch that can match `instance`.
+
+    Returns None when the instance does not carry a usable tag, in which case
+    every branch has to be tried. An unknown discriminator value also returns
+    None; use `tag` to tell the two apart.
+    """
+    if not isinstance(instance, dict):
+      return None
+    if self.property_name is not None:
+      value = self.tag(instance)
+      return self.by_value.get(value) if value is not None else None
+    branches = {index for key, index in self.by_key.items() if key in instance}
+    return branches.pop() if len(branches) == 1 else None
+
+
+@dataclass
+class _BranchTags:
+  required: Set[str] = field(default_factory=set)
+  consts: Dict[str, Any] = field(default_factory=dict)
+
+
+def build_dispatch(
+    one_of: Any, schema: Dict[str, Any], resolver: Any
+) -> Optional[OneOfDispatch]:
+  """Derives the dispatch table of a `oneOf`, if its branches are tagged.
+
+  Args:
+    one_of: The `oneOf` branches.
+    schema: The schema holding the `oneOf`, which may carry a `discriminator`.
+    resolver: The `referencing` resolver the schema is evaluated with.
+
+  Returns:
+    The dispatch table, or None if the branches cannot be told apart by a
+    discriminator value or by a uniquely required key.
+  """
+  if not isinstance(one_of, list) or len(one_of) < 2:
+    return None
+  branches = [_collect_tags(branch, resolver) for branch in one_of]
+  if any(tags is None for tags in branches):
+    return None
+
+  discriminator = schema.get(DISCRIMINATOR)
+  if isinstance(discriminator, dict):
+    property_name = discriminator.get(PROPERTY_NAME)
+    if not isinstance(property_name, str):
+      return None
+    by_value = {}
+    for index, tags in enumerate(branches):
+      value = tags.consts.get(property_name)
+      if not isinstance(value, str) or value in by_value:
+        return None
+      by_value[value] = index
+    return OneOfDispatch(property_name=property_name, by_value=by_value)
+
+  # Untagged unions still dispatch when every branch requires a key that no
+  # other branch requires, like the top-level A2UI message union.
+  counts = Counter(key for tags in branches for key in tags.required)
+  by_key = {}
+  for index, tags in enumerate(branches):
+    unique = [key for key in tags.required if counts[key] == 1]
+    if not unique:
+      return None
+    for key in unique:
+      by_key[key] = index
+  return OneOfDispatch(by_key=by_key)
+
+
+def _collect_tags(schema: Any, resolver: Any, depth: int = 0) -> Optional[_BranchTags]:
+  """Collects what a branch always requires, following `$ref` and `allOf`.
+
+  Only keywords that apply unconditionally are considered, so an instance that
+  lacks a required key, or whose property differs from a `const`, is rejected
+  by the branch.
+  """
+  if not isinstance(schema, dict) or depth > _MAX_TAG_DEPTH:
+    return None
+  resolver = resolver.in_subresource(DRAFT202012.create_resource(schema))
+  tags = _BranchTags()
+
+  required = schema.get("required")
+  if isinstance(required, list):
+    tags.required.update(key for key in required if isinstance(key, str))
+  properties = schema.get("properties")
+  if isinstance(properties, dict):
+    for name, prop in properties.items():
+      if isinstance(prop, dict) and "const" in prop:
+        tags.consts[name] = prop["const"]
+
+  parts: List[Any] = list(schema.get("allOf", ()))
+  if "$ref" in schema:
+    try:
+      resolved = resolver.lookup(schema["$ref"])
+    except Unresolvable:
+      return None
+    parts.append((resolved.contents, resolved.resolver))
+  for part in parts:
+    if isinstance(part, tuple):
+      sub_tags = _collect_tags(part[0], part[1], depth + 1)
+    else:
+      sub_tags = _collect_tags(part, resolver, depth + 1)
+    if sub_tags is None:
+      return None
+    tags.required |= sub_tags.required
+    for name, value in sub_tags.consts.items():
+      if tags.consts.setdefault(name, value) != value:
+        return None  # Contradictory constants; leave it to plain oneOf.
+  return tags
+
+
+def create_discriminating_validator_class() -> Type[Draft202012Validator]:
+  """Returns a Draft 2020-12 validator class that dispatches tagged unions.
+
+  Each class keeps its own table cache, so create one class per schema rather
+  than sharing it across unrelated schemas.
+  """
+  one_of = Draft202012Validator.VALIDATORS["oneOf"]
+  dispatches: Dict[Tuple[int, str], Any] = {}
+
+  def discriminated_one_of(
+      validator: Draft202012Validator,
+      branches: Any,
+      instance: Any,
+      schema: Dict[str, Any],
+  ) -> Iterator[ValidationError]:
+    # The dispatch table depends on how the branches' $refs resolve, i.e. on
+    # the base URI they are evaluated under. `referencing` has no public
+    # accessor for it.
+    resolver = validator._resolver
+    key = (id(branches), resolver._base_uri)
+    cached = dispatches.get(key)
+    if cached is None:
+      dispatch = build_dispatch(branches, schema, resolver)
+      # Keeps `branches` alive so that its id() cannot be reused.
+      cached = dispatches[key] = (branches, dispatch)
+    dispatch = cached[1]
+
+    if dispatch is not None:
+      index = dispatch.select(instance)
+      if index is not None:
+        yield from validator.descend(instance, branches[index], schema_path=index)
+        return
+      value = dispatch.tag(instance)
+      if value is not None:
+        yield ValidationError(
+            f"{value!r} is not a valid {dispatch.property_name!r}, expected one"
+            f" of: {', '.join(sorted(dispatch.by_value))}",
+            path=(dispatch.property_name,),
+        )
+        return
+
+    yield from one_of(validator, branches, instance, schema)
+
+  return extend(Draft202012Validator, {"oneOf": discriminated_one_of})
@@ -0,0 +1,217 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Simplifies A2UI schemas for LLM function-calling declarations.
+
+Function declarations (e.g. `google.genai.types.Schema`) accept only a subset
+of JSON Schema, in the OpenAPI style: upper-case `type`, `properties`,
+`required`, `items`, `anyOf`, string `enum`s, `nullable`, descriptions, a few
+bounds, and references written `ref` to definitions under a root `defs`
+(sent to the Gemini API from google-genai 1.42.0). `build_function_schema`
+turns the message schema of a catalog into that subset:
+
+- Each `$ref` target becomes one definition, so shared and recursive schemas
+  (e.g. dynamic values) are written once. References inside `allOf` are
+  inlined, as `allOf` is merged into a single object.
+- `oneOf` becomes `anyOf`; `const` becomes a one-value `enum`; a `null` type
+  becomes `nullable`.
+- Everything else (`if`/`then`, `not`, patterns, maps...) is dropped, so the
+  result accepts more than the catalog does. Arguments are still validated
+  against the full schema when the tool runs.
+"""
+
+import posixpath
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from jsonschema_specifications import REGISTRY as SPECIFICATIONS
+from referencing.exceptions import Unresolvable
+from referencing.jsonschema import DRAFT202012
+
+if TYPE_CHECKING:
+  from .catalog import A2uiCatalog
+
+DEFS = "defs"
+REF = "ref"
+
+_TYPES = {
+    "string": "STRING",
+    "number": "NUMBER",
+    "integer": "INTEGER",
+    "boolean": "BOOLEAN",
+    "array": "ARRAY",
+    "object": "OBJECT",
+}
+# Keywords copied as they are.
+_BOUNDS = ("minItems", "maxItems", "minimum", "maximum", "minLength", "maxLength")
+
+
+def build_function_schema(catalog: "A2uiCatalog") -> Dict[str, Any]:
+  """Builds a function-declaration schema for a list of A2UI messages.
+
+  Definitions are only allowed at the root of a declaration's parameters: when
+  the schema describes one parameter, move its `defs` to the parameters
+  object.
+
+  Args:
+    catalog: The catalog whose messages and components the schema describes.
+
+  Returns:
+    A schema in the function-declaration subset of JSON Schema, as a dict
+    that e.g. `google.genai.types.Schema.model_validate` accepts.
+  """
+  validator = catalog.validator
+  resource = DRAFT202012.create_resource(validator.schema)
+  resolver = SPECIFICATIONS.combine(validator.registry).resolver_with_root(resource)
+  simplifier = _Simplifier()
+  result = simplifier.simplify(validator.schema, resolver)
+  if simplifier.defs:
+    result[DEFS] = simplifier.defs
+  return result
+
+
+class _Simplifier:
+
+  def __init__(self):
+    self.defs: Dict[str, Dict[str, Any]] = {}
+    # Definition names by absolute reference.
+    self._names: Dict[str, str] = {}
+    # References being inlined, to cut cycles.
+    self._inlining: List[str] = []
+
+  def simplify(
+      self, schema: Any, resolver: Any, inline: bool = False
+  ) -> Dict[str, Any]:
+    """Simplifies `schema`; `inline` inlines its `$ref` instead of a `ref`."""
+    if not isinstance(schema, dict):
+      return {}
+    resolver = resolver.in_subresource(DRAFT202012.create_resource(schema))
+    result: Dict[str, Any] = {}
+
+    ref = schema.get("$ref")
+    if ref is not None:
+      result = self._ref(ref, resolver, inline)
+
+    for sub in schema.get("allOf", []):
+      _merge(result, self.simplify(sub, resolver, inline=True))
+
+    branches = schema.get("oneOf", schema.get("anyOf"))
+    if branches:
+      options = [self.simplify(sub, resolver) for sub in branches]
+      # A branch accepting anything makes the union accept anything.
+      if len(options) == 1:
+        _merge(result, options[0])
+      elif all(options):
+        result["anyOf"] = options
+
+    self._type(schema, result)
+    if "description" in schema:
+      result["description"] = schema["description"]
+    for keyword in _BOUNDS:
+      if keyword in schema:
+        result[keyword] = schema[keyword]
+
+    if "const" in schema:
+      _set_enum(result, [schema["const"]])
+    elif "enum" in schema:
+      _set_enum(result, schema["enum"])
+
+    properties = schema.get("properties")
+    if isinstance(properties, dict):
+      simplified = result.setdefault("properties", {})
+      for name, sub in properties.items():
+        simplified[name] = self.simplify(sub, resolver)
+      result.setdefault("type", "OBJECT")
+    required = [
+        name
+        for name in schema.get("required", [])
+        if name in result.get("properties", {})
+    ]
+    if required:
+      result["required"] = sorted(set(result.get("required", [])) | set(required))
+
+    items = schema.get("items")
+    if isinstance(items, dict):
+      result["items"] = self.simplify(items, resolver)
+      result.setdefault("type", "ARRAY")
+    return result
+
+  def _ref(self, ref: str, resolver: Any, inline: bool) -> Dict[str, Any]:
+    try:
+      resolved = resolver.lookup(ref)
+    except Unresolvable:
+      return {}
+    base_uri = resolved.resolver._base_uri
+    fragment = ref.partition("#")[2]
+    key = f"{base_uri}#{fragment}"
+
+    if inline:
+      if key in self._inlining:
+        return {}
+      self._inlining.append(key)
+      try:
+        return self.simplify(resolved.contents, resolved.resolver, inline=True)
+      finally:
+        self._inlining.pop()
+
+    name = self._names.get(key)
+    if name is None:
+      name = self._new_name(fragment, base_uri)
+      self._names[key] = name
+      self.defs[name] = {}  # Reserved, for references inside the definition.
+      self.defs[name] = self.simplify(resolved.contents, resolved.resolver)
+    return {REF: f"#/{DEFS}/{name}"}
+
+  def _new_name(self, fragment: str, base_uri: str) -> str:
+    """A definition name, from the last segment of the reference."""
+    name = fragment.rstrip("/").rpartition("/")[2]
+    if not name:
+      name = posixpath.splitext(posixpath.basename(base_uri))[0] or "schema"
+    unique = name
+    count = 1
+    while unique in self.defs:
+      count += 1
+      unique = f"{name}{count}"
+    return unique
+
+  def _type(self, schema: Dict[str, Any], result: Dict[str, Any]) -> None:
+    types = schema.get("type")
+    if types is None:
+      return
+    if isinstance(types, str):
+      types = [types]
+    if "null" in types:
+      result["nullable"] = True
+    types = [_TYPES[t] for t in types if t in _TYPES]
+    if len(types) == 1:
+      result["type"] = types[0]
+    elif types and "anyOf" not in result:
+      result["anyOf"] = [{"type": t} for t in types]
+
+
+def _set_enum(result: Dict[str, Any], values: List[Any]) -> None:
+  """Sets an enum, which function declarations only support for strings."""
+  if values and all(isinstance(value, str) for value in values):
+    result["enum"] = list(values)
+    result["type"] = "STRING"
+
+
+def _merge(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+  """Merges `source` into `target`, as for `allOf`."""
+  for key, value in source.items():
+    if key == "properties":
+      target.setdefault(key, {}).update(value)
+    elif key == "required":
+      target[key] = sorted(set(target.get(key, [])) | set(value))
+    else:
+      target.setdefault(key, value)
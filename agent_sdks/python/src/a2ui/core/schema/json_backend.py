@@ -0,0 +1,193 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""JSON parsing and serialization through the fastest available library.
+
+orjson is used when installed, then msgspec, then the standard library. The
+results are those of the standard `json` module in every case:
+
+- `loads` returns the same values, and raises the same `json.JSONDecodeError`
+  (documents the fast library rejects are parsed again by `json`).
+- `dumps` returns the same text as `json.dumps` with `ensure_ascii=True` and,
+  without `indent`, compact separators. Objects the fast library cannot write
+  identically (e.g. ones holding some floats, or non-string keys) are written
+  by `json`.
+
+The one exception is NaN and infinite floats, which are not valid JSON: the
+fast libraries write them as null.
+
+Install the `fast` (orjson) or `msgspec` extra of `a2ui-agent` to get one, and
+set `A2UI_JSON_BACKEND` to `orjson`, `msgspec` or `json` to pick a library.
+"""
+
+import json
+import logging
+import os
+import re
+from typing import IO, Any, Optional, Union
+
+try:
+  import orjson
+except ImportError:  # pragma: no cover - depends on the environment.
+  orjson = None
+
+try:
+  import msgspec
+except ImportError:  # pragma: no cover - depends on the environment.
+  msgspec = None
+
+logger = logging.getLogger(__name__)
+
+BACKEND_ENV = "A2UI_JSON_BACKEND"
+BACKEND_ORJSON = "orjson"
+BACKEND_MSGSPEC = "msgspec"
+BACKEND_STDLIB = "json"
+
+_AVAILABLE = {
+    BACKEND_ORJSON: orjson is not None,
+    BACKEND_MSGSPEC: msgspec is not None,
+    BACKEND_STDLIB: True,
+}
+
+_DIGITS = "0123456789"
+# What `json.dumps(ensure_ascii=True)` escapes beyond what the fast libraries
+# escape. Such characters can only occur inside strings.
+_NON_ASCII = re.compile("[\x7f-\U0010ffff]")
+
+
+def _default_backend() -> str:
+  name = os.environ.get(BACKEND_ENV)
+  if name:
+    if _AVAILABLE.get(name):
+      return name
+    logger.warning(
+        f"JSON backend '{name}' from {BACKEND_ENV} is unavailable, using the default"
+    )
+  for name in (BACKEND_ORJSON, BACKEND_MSGSPEC):
+    if _AVAILABLE[name]:
+      return name
+  return BACKEND_STDLIB
+
+
+_backend = _default_backend()
+
+
+def get_backend() -> str:
+  """Returns the name of the library in use."""
+  return _backend
+
+
+def set_backend(name: Optional[str] = None) -> None:
+  """Switches to the named library, or to the default one for None.
+
+  Raises:
+    ValueError: If the library is unknown or not installed.
+  """
+  global _backend
+  if name is None:
+    _backend = _default_backend()
+    return
+  if not _AVAILABLE.get(name):
+    raise ValueError(f"JSON backend '{name}' is not available")
+  _backend = name
+
+
+def loads(data: Union[str, bytes]) -> Any:
+  """Parses a JSON document, like `json.loads`."""
+  if _backend == BACKEND_ORJSON:
+    try:
+      return orjson.loads(data)
+    except orjson.JSONDecodeError:
+      pass  # Let `json` accept it (e.g. NaN, huge ints) or explain the error.
+  elif _backend == BACKEND_MSGSPEC:
+    try:
+      return msgspec.json.decode(data)
+    except (msgspec.DecodeError, TypeError):
+      pass
+  return json.loads(data)
+
+
+def load(fp: IO[Any]) -> Any:
+  """Parses the JSON document in a file, like `json.load`."""
+  return loads(fp.read())
+
+
+def dumps(obj: Any, indent: Optional[int] = None, sort_keys: bool = False) -> str:
+  """Serializes `obj` exactly like `json.dumps`.
+
+  Args:
+    obj: The value to serialize.
+    indent: Indentation of nested values, or None for compact output with
+      `(",", ":")` separators.
+    sort_keys: Whether to sort the keys of objects.
+  """
+  text = None
+  if _backend == BACKEND_ORJSON and indent in (None, 2):
+    # Types `json` cannot write, or writes differently, are passed through,
+    # which makes orjson raise and `json` take over.
+    option = (
+        orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+    if sort_keys:
+      option |= orjson.OPT_SORT_KEYS
+    if indent:
+      option |= orjson.OPT_INDENT_2
+    try:
+      text = orjson.dumps(obj, option=option).decode("utf-8")
+    except TypeError:
+      pass
+  elif _backend == BACKEND_MSGSPEC and indent is None:
+    try:
+      encoded = msgspec.json.encode(obj, order="sorted" if sort_keys else None)
+      text = encoded.decode("utf-8")
+    except (TypeError, msgspec.EncodeError):
+      pass
+
+  if text is not None and not _may_have_float_exponent(text):
+    if text.isascii() and "\x7f" not in text:
+      return text
+    return _NON_ASCII.sub(_escape, text)
+
+  if indent is None:
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys)
+  return json.dumps(obj, indent=indent, sort_keys=sort_keys)
+
+
+def _may_have_float_exponent(text: str) -> bool:
+  """Whether `text` may hold a float that `json` writes differently.
+
+  The fast libraries write floats like `repr` does, except for the ones
+  `repr` writes with an exponent: 1e16 is written `1e16`, not `1e+16`, and
+  1e-05 `0.00001`. Digits are rare in JSON text, so they are looked for one
+  by one rather than with a regular expression. Strings that merely look like
+  such floats are false positives, written by `json`.
+  """
+  for digit in _DIGITS:
+    index = text.find(digit)
+    while index >= 0:
+      if text[index + 1 : index + 2] in ("e", "E") or text.startswith("0.0000", index):
+        return True
+      index = text.find(digit, index + 1)
+  return False
+
+
+def _escape(match: "re.Match[str]") -> str:
+  code = ord(match.group())
+  if code < 0x10000:
+    return f"\\u{code:04x}"
+  # Characters outside the BMP are written as a UTF-16 surrogate pair.
+  code -= 0x10000
+  return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
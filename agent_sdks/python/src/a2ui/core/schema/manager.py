@@ -13,16 +13,29 @@
 # limitations under the License.
 
 import copy
+import functools
+import hashlib
 import json
 import logging
 import os
 import importlib.resources
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from .utils import load_from_bundled_resource, deep_update
 from ..inference_strategy import InferenceStrategy
 from .constants import *
+from .cache import LruCache
 from .catalog import CatalogConfig, A2uiCatalog
+from .prompt_budget import PromptAssembly, assemble_prompt
+
+# Selected catalog fingerprint, allowed components, include/validate flags,
+# output format, schema rendering, a hash of the descriptions, the token
+# budget and the section order.
+PromptKey = Tuple[
+    str, Tuple[str, ...], bool, bool, bool, str, str, str, Optional[int], bool
+]
+
+DEFAULT_PROMPT_CACHE_SIZE = 64
 
 
 class A2uiSchemaManager(InferenceStrategy):
@@ -36,15 +49,34 @@ class A2uiSchemaManager(InferenceStrategy):
       schema_modifiers: Optional[
           List[Callable[[Dict[str, Any]], Dict[str, Any]]]
       ] = None,
+      compiled_validation: bool = False,
+      prompt_cache_size: int = DEFAULT_PROMPT_CACHE_SIZE,
   ):
+    """Initializes the schema manager.
+
+    Args:
+      version: The A2UI specification version.
+      catalogs: The catalogs supported by the agent.
+      accepts_inline_catalogs: Whether clients may send their own catalog.
+      schema_modifiers: Functions applied to every loaded schema.
+      compiled_validation: Whether to validate payloads with validators
+        generated from the catalog schemas. The validators of the supported
+        catalogs are compiled, or loaded from the on-disk cache, at startup.
+      prompt_cache_size: How many system prompts `generate_system_prompt`
+        keeps, or 0 to build every prompt anew.
+    """
     self._version = version
     self._accepts_inline_catalogs = accepts_inline_catalogs
+    self._compiled_validation = compiled_validation
 
     self._server_to_client_schema = None
     self._common_types_schema = None
     self._supported_catalogs: List[A2uiCatalog] = []
     self._catalog_example_paths: Dict[str, str] = {}
     self._schema_modifiers = schema_modifiers or []
+    self._prompt_cache: Optional[LruCache[PromptKey, PromptAssembly]] = (
+        LruCache(maxsize=prompt_cache_size) if prompt_cache_size else None
+    )
     self._load_schemas(version, catalogs or [])
 
   @property
@@ -55,6 +87,15 @@ class A2uiSchemaManager(InferenceStrategy):
   def supported_catalog_ids(self) -> List[str]:
     return [c.catalog_id for c in self._supported_catalogs]
 
+  @property
+  def prompt_cache(self) -> Optional[LruCache[PromptKey, PromptAssembly]]:
+    """The cache of assembled system prompts, or None if it is disabled.
+
+    Its `stats` count hits and misses. Examples are read from disk when a
+    prompt is first built: `clear()` it after changing them.
+    """
+    return self._prompt_cache
+
   def _apply_modifiers(self, schema: Dict[str, Any]) -> Dict[str, Any]:
     if self._schema_modifiers:
       for modifier in self._schema_modifiers:
@@ -93,10 +134,15 @@ class A2uiSchemaManager(InferenceStrategy):
           catalog_schema=catalog_schema,
           s2c_schema=self._server_to_client_schema,
           common_types_schema=self._common_types_schema,
+          compiled_validation=self._compiled_validation,
       )
       self._supported_catalogs.append(catalog)
       self._catalog_example_paths[catalog.catalog_id] = config.examples_path
 
+    if self._compiled_validation:
+      for catalog in self._supported_catalogs:
+        catalog.validator  # Generates or loads the compiled validator.
+
   def _select_catalog(
       self, client_ui_capabilities: Optional[dict[str, Any]] = None
   ) -> A2uiCatalog:
@@ -157,6 +203,7 @@ class A2uiSchemaManager(InferenceStrategy):
           catalog_schema=merged_schema,
           s2c_schema=self._server_to_client_schema,
           common_types_schema=self._common_types_schema,
+          compiled_validation=self._supported_catalogs[0].compiled_validation,
       )
 
     if not client_supported_catalog_ids:
@@ -182,11 +229,18 @@ class A2uiSchemaManager(InferenceStrategy):
     pruned_catalog = catalog.with_pruned_components(allowed_components)
     return pruned_catalog
 
-  def load_examples(self, catalog: A2uiCatalog, validate: bool = False) -> str:
+  def load_examples(
+      self,
+      catalog: A2uiCatalog,
+      validate: bool = False,
+      output_format: str = OUTPUT_FORMAT_JSON,
+  ) -> str:
     """Loads examples for a catalog."""
     if catalog.catalog_id in self._catalog_example_paths:
       return catalog.load_examples(
-          self._catalog_example_paths[catalog.catalog_id], validate=validate
+          self._catalog_example_paths[catalog.catalog_id],
+          validate=validate,
+          output_format=output_format,
       )
     return ""
 
@@ -200,11 +254,149 @@ class A2uiSchemaManager(InferenceStrategy):
       include_schema: bool = False,
       include_examples: bool = False,
       validate_examples: bool = False,
+      output_format: str = OUTPUT_FORMAT_JSON,
+      schema_rendering: str = SCHEMA_RENDERING_FULL,
+      max_prompt_tokens: Optional[int] = None,
+      schema_first: bool = False,
   ) -> str:
-    """Assembles the final system instruction for the LLM."""
+    """Assembles the final system instruction for the LLM.
+
+    With `output_format` set to `OUTPUT_FORMAT_JSONL`, the LLM is told to
+    write one A2UI message per line instead of a JSON list, and examples are
+    shown that way. Parse such responses with `output_format` set likewise.
+
+    `schema_rendering` selects how an included schema is written (see
+    `A2uiCatalog.render_as_llm_instructions`); `SCHEMA_RENDERING_COMPACT`
+    saves a third or more of its tokens.
+
+    With `max_prompt_tokens`, the schema and examples are fitted to that
+    estimated number of tokens (see `assemble_system_prompt`).
+
+    With `schema_first`, the schema and examples come before the role,
+    workflow and UI descriptions, so the prompts of agents with different
+    descriptions start with the same text, which LLM providers can cache.
+
+    Prompts are cached (see `prompt_cache`) by the fingerprint of the selected
+    catalog, the allowed components, the flags and the descriptions.
+    """
+    return self.assemble_system_prompt(
+        role_description,
+        workflow_description=workflow_description,
+        ui_description=ui_description,
+        client_ui_capabilities=client_ui_capabilities,
+        allowed_components=allowed_components,
+        include_schema=include_schema,
+        include_examples=include_examples,
+        validate_examples=validate_examples,
+        output_format=output_format,
+        schema_rendering=schema_rendering,
+        max_prompt_tokens=max_prompt_tokens,
+        schema_first=schema_first,
+    ).prompt
+
+  def assemble_system_prompt(
+      self,
+      role_description: str,
+      workflow_description: str = "",
+      ui_description: str = "",
+      client_ui_capabilities: Optional[dict[str, Any]] = None,
+      allowed_components: List[str] = [],
+      include_schema: bool = False,
+      include_examples: bool = False,
+      validate_examples: bool = False,
+      output_format: str = OUTPUT_FORMAT_JSON,
+      schema_rendering: str = SCHEMA_RENDERING_FULL,
+      max_prompt_tokens: Optional[int] = None,
+      schema_first: bool = False,
+  ) -> PromptAssembly:
+    """Assembles the system prompt, with a breakdown of what it includes.
+
+    Takes the arguments of `generate_system_prompt`. With `max_prompt_tokens`,
+    the role, workflow and UI descriptions are kept whole and the schema and
+    examples fitted in the rest of the budget, as estimated offline by
+    `rendering.estimate_tokens` (see `prompt_budget`): the schema switches to
+    more compact renderings than `schema_rendering`, then drops components,
+    last of `allowed_components` (or of the catalog) first; examples are
+    added by relevance to the descriptions while they fit. The returned
+    `PromptAssembly` lists what was kept and dropped.
+
+    Raises:
+      ValueError: If an argument is invalid, or if the descriptions, with the
+        smallest schema when `include_schema` is set, exceed the budget.
+    """
+    if output_format not in OUTPUT_FORMATS:
+      raise ValueError(
+          f"Unknown output format '{output_format}', expected one of {OUTPUT_FORMATS}"
+      )
+    if schema_rendering not in SCHEMA_RENDERINGS:
+      raise ValueError(
+          f"Unknown schema rendering '{schema_rendering}', expected one of"
+          f" {SCHEMA_RENDERINGS}"
+      )
+    if max_prompt_tokens is not None and max_prompt_tokens <= 0:
+      raise ValueError(f"max_prompt_tokens must be positive, got {max_prompt_tokens}")
+    catalog = self._select_catalog(client_ui_capabilities)
+    build = functools.partial(
+        self._build_system_prompt,
+        catalog,
+        role_description,
+        workflow_description,
+        ui_description,
+        allowed_components,
+        include_schema,
+        include_examples,
+        validate_examples,
+        output_format,
+        schema_rendering,
+        max_prompt_tokens,
+        schema_first,
+    )
+    if self._prompt_cache is None:
+      return build()
+
+    # Under a budget, the order of the allowed components is their priority.
+    components = tuple(
+        dict.fromkeys(allowed_components)
+        if max_prompt_tokens is not None
+        else sorted(set(allowed_components))
+    )
+    descriptions = "\0".join([role_description, workflow_description, ui_description])
+    key = (
+        catalog.fingerprint,
+        components,
+        include_schema,
+        include_examples,
+        validate_examples,
+        output_format,
+        schema_rendering,
+        hashlib.sha256(descriptions.encode(ENCODING)).hexdigest(),
+        max_prompt_tokens,
+        schema_first,
+    )
+    return self._prompt_cache.get_or_create(key, build)
+
+  def _build_system_prompt(
+      self,
+      catalog: A2uiCatalog,
+      role_description: str,
+      workflow_description: str,
+      ui_description: str,
+      allowed_components: List[str],
+      include_schema: bool,
+      include_examples: bool,
+      validate_examples: bool,
+      output_format: str,
+      schema_rendering: str,
+      max_prompt_tokens: Optional[int],
+      schema_first: bool,
+  ) -> PromptAssembly:
     parts = [role_description]
 
-    workflow = DEFAULT_WORKFLOW_RULES
+    workflow = (
+        JSONL_WORKFLOW_RULES
+        if output_format == OUTPUT_FORMAT_JSONL
+        else DEFAULT_WORKFLOW_RULES
+    )
     if workflow_description:
       workflow += f"\n{workflow_description}"
     parts.append(f"## Workflow Description:\n{workflow}")
@@ -212,16 +404,32 @@ class A2uiSchemaManager(InferenceStrategy):
     if ui_description:
       parts.append(f"## UI Description:\n{ui_description}")
 
-    selected_catalog = self.get_selected_catalog(
-        client_ui_capabilities, allowed_components
+    selected_catalog = catalog.with_pruned_components(allowed_components)
+    catalog_components = selected_catalog.catalog_schema.get(CATALOG_COMPONENTS_KEY)
+    catalog_components = (
+        catalog_components if isinstance(catalog_components, dict) else {}
     )
+    components = [
+        name
+        for name in dict.fromkeys(allowed_components or catalog_components)
+        if name in catalog_components
+    ]
 
-    if include_schema:
-      parts.append(selected_catalog.render_as_llm_instructions())
-
+    examples = []
     if include_examples:
-      examples_str = self.load_examples(selected_catalog, validate=validate_examples)
-      if examples_str:
-        parts.append(f"### Examples:\n{examples_str}")
+      examples = selected_catalog.read_examples(
+          self._catalog_example_paths.get(selected_catalog.catalog_id),
+          validate=validate_examples,
+          output_format=output_format,
+      )
 
-    return "\n\n".join(parts)
+    return assemble_prompt(
+        parts,
+        selected_catalog,
+        components,
+        schema_rendering if include_schema else None,
+        examples,
+        max_tokens=max_prompt_tokens,
+        query="\n".join([role_description, workflow_description, ui_description]),
+        schema_first=schema_first,
+    )
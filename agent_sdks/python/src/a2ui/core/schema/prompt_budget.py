@@ -0,0 +1,272 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Assembles system prompts within a token budget.
+
+A system prompt holds the agent instructions (role, workflow and UI
+descriptions), the catalog schema and examples. `assemble_prompt` keeps the
+instructions whole and, given a budget, fits the rest in the tokens left, as
+estimated by `rendering.estimate_tokens`:
+
+1. The schema is written in the requested rendering or, if it does not leave
+   room for all the examples, in the next more compact one of
+   `SCHEMA_RENDERINGS`.
+2. Failing that, in the largest rendering that fits by itself. If even the
+   most compact one does not, the lowest priority components are pruned from
+   the catalog until it does.
+3. Examples are added, most relevant to the descriptions first, while they
+   fit. Examples using a pruned component are left out.
+
+The instructions come first, or last with `schema_first`: prompts then start
+with the same schema and examples whatever the agent descriptions, a prefix
+LLM providers can cache.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Tuple
+
+from .constants import SCHEMA_RENDERINGS
+from .rendering import estimate_tokens
+
+if TYPE_CHECKING:
+  from .catalog import A2uiCatalog
+
+SECTION_INSTRUCTIONS = "instructions"
+SECTION_SCHEMA = "schema"
+SECTION_EXAMPLES = "examples"
+
+EXAMPLES_HEADER = "### Examples:\n"
+_SEPARATOR = "\n\n"
+
+# Component types in v0.9 (`"component": "Text"`) and v0.8
+# (`"component": {"Text": {...}}`) messages.
+_COMPONENT_TYPE = re.compile(r'"component"\s*:\s*(?:"(\w+)"|\{\s*"(\w+)")')
+_WORD = re.compile(r"[a-z]{4,}")
+
+
+@dataclass(frozen=True)
+class PromptAssembly:
+  """A system prompt and a breakdown of what went into it.
+
+  Attributes:
+    prompt: The system prompt.
+    tokens: Estimated number of tokens of the prompt.
+    max_tokens: The token budget, or None if there is none.
+    schema_rendering: The rendering of the schema, or None if the prompt has
+      no schema.
+    components: The components shown in the schema, by priority.
+    dropped_components: The components pruned to fit the budget, by priority.
+    examples: The names of the examples shown.
+    dropped_examples: The names of the examples left out, by relevance.
+    section_tokens: Estimated number of tokens of the instructions, schema and
+      examples sections (`SECTION_*`).
+  """
+
+  prompt: str
+  tokens: int
+  max_tokens: Optional[int]
+  schema_rendering: Optional[str]
+  components: Tuple[str, ...]
+  dropped_components: Tuple[str, ...]
+  examples: Tuple[str, ...]
+  dropped_examples: Tuple[str, ...]
+  section_tokens: Dict[str, int]
+
+
+def assemble_prompt(
+    instructions: List[str],
+    catalog: "A2uiCatalog",
+    components: Sequence[str],
+    schema_rendering: Optional[str],
+    examples: Sequence[Tuple[str, str]],
+    max_tokens: Optional[int] = None,
+    query: str = "",
+    schema_first: bool = False,
+) -> PromptAssembly:
+  """Assembles a system prompt, within `max_tokens` if given.
+
+  Args:
+    instructions: The sections always included, e.g. the role description.
+    catalog: The catalog whose schema is shown.
+    components: The components of the catalog, highest priority first.
+    schema_rendering: The preferred rendering of the schema, or None to leave
+      the schema out.
+    examples: The name and content of each example.
+    max_tokens: The token budget, or None to include everything.
+    query: The text examples are ranked against, e.g. the UI description.
+    schema_first: Whether the schema and examples come before the
+      instructions.
+
+  Returns:
+    The prompt and its breakdown.
+
+  Raises:
+    ValueError: If the instructions, with the schema if requested, do not fit
+      within `max_tokens`.
+  """
+  from .catalog import format_example
+
+  head = _SEPARATOR.join(instructions)
+  section_tokens = {SECTION_INSTRUCTIONS: estimate_tokens(head)}
+  available = None
+  if max_tokens is not None:
+    available = max_tokens - section_tokens[SECTION_INSTRUCTIONS]
+    if available < 0:
+      raise ValueError(
+          f"The prompt instructions take about {section_tokens[SECTION_INSTRUCTIONS]}"
+          f" tokens, over the budget of {max_tokens}"
+      )
+
+  sections = []
+  kept = list(components)
+  if schema_rendering is not None:
+    reserved = 0
+    if available is not None and examples:
+      reserved = _cost(EXAMPLES_HEADER) + sum(
+          _cost(format_example(name, content)) for name, content in examples
+      )
+    schema_rendering, count, schema = _fit_schema(
+        catalog, kept, schema_rendering, available, reserved
+    )
+    kept = kept[:count]
+    sections.append(schema)
+    section_tokens[SECTION_SCHEMA] = estimate_tokens(schema)
+    if available is not None:
+      available -= _cost(schema)
+  dropped_components = tuple(c for c in components if c not in kept)
+
+  selected = []
+  dropped_examples = []
+  if examples:
+    candidates = []
+    for name, content in examples:
+      if dropped_components and not _components_of(content) <= set(kept):
+        dropped_examples.append(name)
+      else:
+        candidates.append((name, content))
+    if available is None:
+      selected = candidates
+    else:
+      chosen = set()
+      available -= _cost(EXAMPLES_HEADER)
+      for name, content in _rank(candidates, query):
+        cost = _cost(format_example(name, content))
+        if cost <= available:
+          chosen.add(name)
+          available -= cost
+        else:
+          dropped_examples.append(name)
+      # Shown in their original order, so the same selection gives the same
+      # prompt.
+      selected = [example for example in candidates if example[0] in chosen]
+  if selected:
+    section = EXAMPLES_HEADER + _SEPARATOR.join(
+        format_example(name, content) for name, content in selected
+    )
+    sections.append(section)
+    section_tokens[SECTION_EXAMPLES] = estimate_tokens(section)
+
+  parts = sections + [head] if schema_first else [head] + sections
+  prompt = _SEPARATOR.join(parts)
+  return PromptAssembly(
+      prompt=prompt,
+      tokens=estimate_tokens(prompt),
+      max_tokens=max_tokens,
+      schema_rendering=schema_rendering,
+      components=tuple(kept),
+      dropped_components=dropped_components,
+      examples=tuple(name for name, _ in selected),
+      dropped_examples=tuple(dropped_examples),
+      section_tokens=section_tokens,
+  )
+
+
+def _fit_schema(
+    catalog: "A2uiCatalog",
+    components: List[str],
+    rendering: str,
+    available: Optional[int],
+    reserved: int,
+) -> Tuple[str, int, str]:
+  """Returns the rendering, number of components kept and schema that fit.
+
+  The largest rendering leaving `reserved` tokens is preferred to the largest
+  one that fits.
+  """
+  renderings = SCHEMA_RENDERINGS[SCHEMA_RENDERINGS.index(rendering) :]
+  schemas = {}
+  for candidate in renderings:
+    schemas[candidate] = catalog.render_as_llm_instructions(candidate)
+    if available is None or _cost(schemas[candidate]) + reserved <= available:
+      return candidate, len(components), schemas[candidate]
+  for candidate, schema in schemas.items():
+    if _cost(schema) <= available:
+      return candidate, len(components), schema
+
+  # The most compact rendering with as many components as fit. Pruning
+  # components only shrinks the schema, so the count is searched by bisection.
+  # The catalogs tried are not cached, only the one chosen.
+  rendering = renderings[-1]
+  best = 0
+  low, high = 1, len(components) - 1
+  while low <= high:
+    count = (low + high) // 2
+    schema = catalog.with_pruned_components(
+        components[:count], cache=False
+    ).render_as_llm_instructions(rendering, cache=False)
+    if _cost(schema) <= available:
+      best = count
+      low = count + 1
+    else:
+      high = count - 1
+  if not best:
+    raise ValueError(
+        f"The catalog schema does not fit in the {available} tokens left of the"
+        " prompt budget, even with a single component"
+    )
+  schema = catalog.with_pruned_components(components[:best]).render_as_llm_instructions(
+      rendering
+  )
+  return rendering, best, schema
+
+
+def _cost(section: str) -> int:
+  """The tokens a section adds to a prompt, with its separator.
+
+  Sections are joined by a blank line, which counts one token. That is an
+  upper bound: whitespace at the edges of a section merges with it.
+  """
+  return estimate_tokens(section) + 1
+
+
+def _components_of(content: str) -> Set[str]:
+  """The component types an example uses."""
+  return {v08 or v09 for v09, v08 in _COMPONENT_TYPE.findall(content) if v08 or v09}
+
+
+def _words(text: str) -> Set[str]:
+  return {word.rstrip("s") for word in _WORD.findall(text.lower())}
+
+
+def _rank(examples: List[Tuple[str, str]], query: str) -> List[Tuple[str, str]]:
+  """Sorts examples by the number of words they share with `query`.
+
+  Ties keep their order.
+  """
+  query_words = _words(query)
+  return sorted(
+      examples,
+      key=lambda example: -len(query_words & _words(f"{example[0]} {example[1]}")),
+  )
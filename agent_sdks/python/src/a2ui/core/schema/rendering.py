@@ -0,0 +1,168 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compact rendering of schemas for LLM prompts, and prompt size estimates.
+
+The schemas are written for validators: they carry `$schema` and `$id`
+boilerplate, titles and long descriptions that an LLM does not need, and
+custom catalogs often repeat the common type definitions. `compact_schema`
+strips those, and `measure_prompt` reports how large a prompt is.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .constants import ENCODING
+
+# Keywords that only matter to validators and schema tooling.
+BOILERPLATE_KEYS = frozenset(("$schema", "$id", "$comment", "title"))
+# Keywords whose values map names to schemas, rather than being schemas.
+_SCHEMA_MAPS = frozenset(
+    ("properties", "patternProperties", "$defs", "definitions", "dependentSchemas")
+)
+# Keywords whose values are instances, not schemas, and are kept as they are.
+_INSTANCE_KEYS = frozenset(("const", "default", "enum", "examples"))
+_DEFINITION_KEYS = ("$defs", "definitions")
+
+# The end of a sentence: a period, question or exclamation mark followed by the
+# end of the text or by whitespace and a capital, so "e.g. this" is not one.
+_SENTENCE_END = re.compile(r"[.!?](?=\s*$|\s+[A-Z])")
+# Word pieces, digit runs, whitespace runs and punctuation runs.
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|[0-9]+|\s+|[^A-Za-z0-9\s]+")
+
+
+@dataclass(frozen=True)
+class PromptSize:
+  """The size of a prompt.
+
+  Attributes:
+    bytes: Length of the UTF-8 encoded text.
+    tokens: Estimated number of tokens (see `estimate_tokens`).
+  """
+
+  bytes: int
+  tokens: int
+
+
+def measure_prompt(text: str) -> PromptSize:
+  """Returns the byte length and estimated token count of `text`."""
+  return PromptSize(len(text.encode(ENCODING)), estimate_tokens(text))
+
+
+def estimate_tokens(text: str) -> int:
+  """Estimates how many tokens an LLM tokenizer splits `text` into.
+
+  A rough, dependency-free approximation of BPE tokenizers: a word counts one
+  token per 6 letters, numbers one per 3 digits, punctuation one per 2
+  characters, and whitespace one per run unless it is a single space (which
+  tokenizers merge into the next word). Use it to compare renderings and to
+  budget prompts, not for billing.
+  """
+  tokens = 0
+  for piece in _TOKEN_PIECES.findall(text):
+    first = piece[0]
+    if first.isalpha():
+      tokens += math.ceil(len(piece) / 6)
+    elif first.isdigit():
+      tokens += math.ceil(len(piece) / 3)
+    elif first.isspace():
+      tokens += piece != " "
+    else:
+      tokens += math.ceil(len(piece) / 2)
+  return tokens
+
+
+def first_sentence(description: str) -> str:
+  """Returns the first sentence of a description."""
+  match = _SENTENCE_END.search(description)
+  return description[: match.end()] if match else description
+
+
+def compact_schema(
+    schema: Any,
+    shared_defs: Optional[Dict[str, Any]] = None,
+    shared_ref: str = "",
+    brief: bool = False,
+) -> Any:
+  """Returns a copy of `schema` for LLM prompts, without boilerplate.
+
+  Args:
+    schema: The JSON schema to compact. It is not modified.
+    shared_defs: Definitions rendered elsewhere in the prompt, e.g. the common
+      types. Definitions of `schema` equal to the shared one of the same name
+      are dropped, and references to them point to the shared one instead.
+    shared_ref: The reference prefix of the shared definitions, e.g.
+      `common_types.json#/$defs/`.
+    brief: Whether to cut descriptions to their first sentence.
+
+  Returns:
+    The compacted schema.
+  """
+  schema = _compact(schema, brief)
+  if not shared_defs or not isinstance(schema, dict):
+    return schema
+
+  shared_defs = _compact(shared_defs, brief)
+  renames = {}
+  for key in _DEFINITION_KEYS:
+    defs = schema.get(key)
+    if not isinstance(defs, dict):
+      continue
+    for name in [n for n, d in defs.items() if shared_defs.get(n) == d]:
+      del defs[name]
+      renames[f"#/{key}/{name}"] = f"{shared_ref}{name}"
+    if not defs:
+      del schema[key]
+  return _rename_refs(schema, renames) if renames else schema
+
+
+def _compact(schema: Any, brief: bool, names: bool = False) -> Any:
+  """Copies `schema`; `names` is set for maps whose keys are not keywords."""
+  if isinstance(schema, list):
+    return [_compact(item, brief) for item in schema]
+  if not isinstance(schema, dict):
+    return schema
+  result = {}
+  for key, value in schema.items():
+    if names:
+      result[key] = _compact(value, brief)
+    elif key in _INSTANCE_KEYS:
+      result[key] = value
+    elif key in BOILERPLATE_KEYS:
+      continue
+    elif key == "description" and isinstance(value, str):
+      result[key] = first_sentence(value) if brief else value
+    else:
+      result[key] = _compact(value, brief, names=key in _SCHEMA_MAPS)
+  return result
+
+
+def _rename_refs(schema: Any, renames: Dict[str, str], names: bool = False) -> Any:
+  if isinstance(schema, list):
+    return [_rename_refs(item, renames) for item in schema]
+  if not isinstance(schema, dict):
+    return schema
+  result = {}
+  for key, value in schema.items():
+    if names:
+      result[key] = _rename_refs(value, renames)
+    elif key in _INSTANCE_KEYS:
+      result[key] = value
+    elif key == "$ref" and isinstance(value, str):
+      result[key] = renames.get(value, value)
+    else:
+      result[key] = _rename_refs(value, renames, names=key in _SCHEMA_MAPS)
+  return result
@@ -0,0 +1,345 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Stateful validation of the payloads sent to one client.
+
+A payload that does not create a surface only carries the components that
+changed, so on its own it cannot be checked for dangling references or
+orphaned components. A `SurfaceValidationSession` remembers the component graph
+of every surface it has seen created and checks each update against the whole
+surface, touching only the changed components and their ancestors.
+"""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from .cache import LruCache
+from .component_graph import ComponentGraph, GraphError
+from .constants import ISSUE_RECURSION, ISSUE_TOPOLOGY, MAX_GLOBAL_DEPTH
+from .surfaces import (
+    CREATE_SURFACE_KEYS,
+    DELETE_SURFACE_KEYS,
+    SURFACE_ID,
+    UPDATE_COMPONENTS_KEYS,
+    SurfaceIndex,
+    index_surfaces,
+)
+
+if TYPE_CHECKING:
+  from .catalog import A2uiCatalog
+
+COMPONENTS = "components"
+
+DEFAULT_MAX_SURFACES = 64
+DEFAULT_MAX_SURFACE_COMPONENTS = 10_000
+
+Edges = List[Tuple[str, str]]
+
+
+@dataclass
+class SurfaceGraph:
+  """The component graph of one surface, accumulated across updates.
+
+  Attributes:
+    root_id: The root component ID of the surface.
+    edges: Outgoing references per component ID, as (target_id, field_name).
+    parents: IDs of the components referencing each component ID.
+  """
+
+  root_id: str
+  edges: Dict[str, Edges] = field(default_factory=dict)
+  parents: Dict[str, Set[str]] = field(default_factory=dict)
+
+  def apply(self, delta: ComponentGraph) -> Dict[str, Optional[Edges]]:
+    """Adds or replaces the components of an update.
+
+    Returns:
+      The previous references of every updated component (None for new
+      components), which `revert` uses to undo the update.
+    """
+    previous = {}
+    for comp_id, refs in delta.edges.items():
+      previous[comp_id] = self.edges.get(comp_id)
+      self._set(comp_id, refs)
+    return previous
+
+  def revert(self, previous: Dict[str, Optional[Edges]]) -> None:
+    """Undoes an update given the result of `apply`."""
+    for comp_id, refs in reversed(list(previous.items())):
+      self._set(comp_id, refs)
+
+  def iter_errors(
+      self, delta: ComponentGraph, previous: Dict[str, Optional[Edges]]
+  ) -> Iterator[GraphError]:
+    """Yields the structural problems an applied update causes.
+
+    Component IDs are never removed from a surface, so only the references
+    added by the update can dangle or close a cycle, and only the updated
+    components and the components they stopped referencing can become
+    unreachable. Duplicate IDs and self-references within the update are left
+    to `ComponentGraph.iter_errors`.
+
+    Args:
+      delta: The graph of the update, already applied.
+      previous: The result of `apply` for the update.
+    """
+    positions = delta.positions
+    if self.root_id not in self.edges:
+      yield GraphError(f"Missing root component: No component has id='{self.root_id}'")
+
+    for comp_id, refs in delta.edges.items():
+      for ref_id, field_name in refs:
+        if ref_id not in self.edges:
+          yield GraphError(
+              f"Component '{comp_id}' references non-existent component"
+              f" '{ref_id}' in field '{field_name}'",
+              positions[comp_id],
+          )
+
+    added: Dict[str, Set[str]] = {}
+    detached: Set[str] = set()
+    for comp_id, old_refs in previous.items():
+      old = {ref_id for ref_id, _ in old_refs or ()}
+      new = {ref_id for ref_id, _ in self.edges[comp_id]}
+      added[comp_id] = new - old - {comp_id}
+      detached |= old - new
+
+    ancestry: Dict[str, Tuple[Optional[int], Set[str]]] = {}
+
+    def ancestry_of(comp_id: str) -> Tuple[Optional[int], Set[str]]:
+      if comp_id not in ancestry:
+        ancestry[comp_id] = self._ancestry(comp_id)
+      return ancestry[comp_id]
+
+    depth_reported = False
+    for comp_id, targets in added.items():
+      if not targets:
+        continue
+      depth, ancestors = ancestry_of(comp_id)
+      # A new edge closes a cycle exactly when its target already reaches it.
+      for ref_id in sorted(targets & ancestors):
+        yield GraphError(
+            f"Circular reference detected involving component '{ref_id}'",
+            positions.get(ref_id),
+            ISSUE_TOPOLOGY,
+        )
+      if depth is None or depth_reported:
+        continue
+      for ref_id in targets:
+        if self._exceeds_depth(ref_id, depth + 1):
+          depth_reported = True
+          yield GraphError(
+              f"Global recursion limit exceeded: logical depth > {MAX_GLOBAL_DEPTH}",
+              positions.get(ref_id),
+              ISSUE_RECURSION,
+          )
+          break
+
+    candidates = list(positions) + sorted(detached - positions.keys())
+    for comp_id in candidates:
+      if comp_id in self.edges and ancestry_of(comp_id)[0] is None:
+        yield GraphError(
+            f"Component '{comp_id}' is not reachable from '{self.root_id}'",
+            positions.get(comp_id),
+            ISSUE_TOPOLOGY,
+        )
+
+  def _set(self, comp_id: str, refs: Optional[Edges]) -> None:
+    for ref_id, _ in self.edges.get(comp_id, ()):
+      parents = self.parents.get(ref_id)
+      if parents is not None:
+        parents.discard(comp_id)
+        if not parents:
+          del self.parents[ref_id]
+    if refs is None:
+      self.edges.pop(comp_id, None)
+      return
+    self.edges[comp_id] = refs
+    for ref_id, _ in refs:
+      self.parents.setdefault(ref_id, set()).add(comp_id)
+
+  def _ancestry(self, comp_id: str) -> Tuple[Optional[int], Set[str]]:
+    """Walks up the parents of a component.
+
+    Returns:
+      The length of the shortest path from the root to the component, or None
+      if it is not reachable, and the set of all its ancestors.
+    """
+    depth = 0 if comp_id == self.root_id else None
+    ancestors: Set[str] = set()
+    frontier = [comp_id]
+    distance = 0
+    while frontier:
+      distance += 1
+      next_frontier = []
+      for node_id in frontier:
+        for parent_id in self.parents.get(node_id, ()):
+          if parent_id in ancestors:
+            continue
+          ancestors.add(parent_id)
+          if parent_id == self.root_id and depth is None:
+            depth = distance
+          next_frontier.append(parent_id)
+      frontier = next_frontier
+    return depth, ancestors
+
+  def _exceeds_depth(self, start_id: str, depth: int) -> bool:
+    """Whether the subtree of a component at `depth` goes past the limit."""
+    visited: Set[str] = set()
+    stack = [(start_id, depth)]
+    while stack:
+      node_id, node_depth = stack.pop()
+      if node_depth > MAX_GLOBAL_DEPTH:
+        return True
+      if node_id in visited:
+        continue
+      visited.add(node_id)
+      stack.extend(
+          (ref_id, node_depth + 1) for ref_id, _ in self.edges.get(node_id, ())
+      )
+    return False
+
+
+class SurfaceValidationSession:
+  """Validates the stream of payloads sent to one client.
+
+  Every payload goes through the catalog validator first. Component updates
+  for a surface created by an earlier payload of the session are then checked
+  against the whole surface: the root must exist, every reference must resolve
+  and every component must stay reachable from the root, without cycles or
+  excessive depth. Updates for surfaces the session has not seen created get
+  the stateless checks only.
+
+  Memory is bounded: at most `max_surfaces` surfaces are tracked, the least
+  recently updated one being forgotten first, and a surface may not grow past
+  `max_components` components. A `deleteSurface` message drops its surface.
+
+  A rejected payload leaves the session unchanged. Sessions are not thread
+  safe; use one per client connection.
+  """
+
+  def __init__(
+      self,
+      catalog: "A2uiCatalog",
+      max_surfaces: int = DEFAULT_MAX_SURFACES,
+      max_components: int = DEFAULT_MAX_SURFACE_COMPONENTS,
+  ):
+    """Initializes the session.
+
+    Args:
+      catalog: The catalog the payloads are validated against.
+      max_surfaces: Maximum number of surfaces tracked at once.
+      max_components: Maximum number of components per surface.
+    """
+    if max_components < 1:
+      raise ValueError(f"max_components must be positive, got {max_components}")
+    self._catalog = catalog
+    self._ref_index = catalog.component_ref_index
+    self._max_components = max_components
+    self._surfaces: LruCache[str, SurfaceGraph] = LruCache(maxsize=max_surfaces)
+
+  def __contains__(self, surface_id: str) -> bool:
+    return surface_id in self._surfaces
+
+  def __len__(self) -> int:
+    return len(self._surfaces)
+
+  def get_surface(self, surface_id: str) -> Optional[SurfaceGraph]:
+    """Returns the tracked graph of a surface, if any."""
+    return self._surfaces.get(surface_id)
+
+  def evict(self, surface_id: str) -> None:
+    """Stops tracking a surface."""
+    self._surfaces.pop(surface_id)
+
+  def clear(self) -> None:
+    """Stops tracking every surface."""
+    self._surfaces.clear()
+
+  def validate(self, a2ui_json: Union[Dict[str, Any], List[Any]]) -> None:
+    """Validates a payload and records its effect on the tracked surfaces.
+
+    Args:
+      a2ui_json: A single A2UI message or a list of messages.
+
+    Raises:
+      ValueError: If the payload is invalid on its own or for the surfaces it
+        updates.
+    """
+    messages = a2ui_json if isinstance(a2ui_json, list) else [a2ui_json]
+    self._catalog.validator.validate(messages)
+
+    surfaces = index_surfaces(messages)
+    # Surfaces created or deleted by this payload, committed once it is valid.
+    # Creations are registered upfront because v0.8 sends beginRendering after
+    # the components.
+    pending: Dict[str, Optional[SurfaceGraph]] = {
+        surface.surface_id: SurfaceGraph(surface.root_id)
+        for surface in surfaces
+        if surface.surface_id is not None and surface.is_created
+    }
+    applied: List[Tuple[SurfaceGraph, Dict[str, Optional[Edges]]]] = []
+    try:
+      for position, message in enumerate(messages):
+        if isinstance(message, dict):
+          self._apply_message(position, message, surfaces, pending, applied)
+    except ValueError:
+      for graph, previous in reversed(applied):
+        graph.revert(previous)
+      raise
+
+    for surface_id, graph in pending.items():
+      if graph is None:
+        self._surfaces.pop(surface_id)
+      else:
+        self._surfaces.put(surface_id, graph)
+
+  def _apply_message(
+      self,
+      position: int,
+      message: Dict[str, Any],
+      surfaces: SurfaceIndex,
+      pending: Dict[str, Optional[SurfaceGraph]],
+      applied: List[Tuple[SurfaceGraph, Dict[str, Optional[Edges]]]],
+  ) -> None:
+    for key, body in message.items():
+      if not isinstance(body, dict) or not isinstance(body.get(SURFACE_ID), str):
+        continue
+      surface_id = body[SURFACE_ID]
+      if key in CREATE_SURFACE_KEYS:
+        surface = surfaces.get(surface_id)
+        if position != surface.create_indices[0]:
+          pending[surface_id] = SurfaceGraph(surface.root_id)
+      elif key in DELETE_SURFACE_KEYS:
+        pending[surface_id] = None
+      elif key in UPDATE_COMPONENTS_KEYS:
+        if surface_id in pending:
+          graph = pending[surface_id]
+        else:
+          graph = self._surfaces.get(surface_id)
+        components = body.get(COMPONENTS)
+        if graph is None or not components:
+          continue
+        delta = ComponentGraph.build(components, self._ref_index)
+        added = sum(1 for comp_id in delta.edges if comp_id not in graph.edges)
+        if len(graph.edges) + added > self._max_components:
+          raise ValueError(
+              f"Surface '{surface_id}' exceeds the limit of"
+              f" {self._max_components} components"
+          )
+        previous = graph.apply(delta)
+        applied.append((graph, previous))
+        error = next(graph.iter_errors(delta, previous), None)
+        if error is not None:
+          raise ValueError(error.message)
@@ -0,0 +1,295 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Renders catalogs as TypeScript-like type signatures for LLM prompts.
+
+Type declarations describe the same payloads as the JSON schemas in a
+fraction of the tokens:
+
+    // A hint for the base text style.
+    type Text = ComponentCommon & CatalogComponentCommon & {
+      component: "Text";
+      text: DynamicString; // The text content to display.
+      variant?: "h1" | "h2" | "caption" | "body"; // Default: "body".
+    };
+
+Each definition, component and function of the schemas becomes one
+declaration named after it, and references use those names. Catalog
+functions are written as function signatures. Keywords without a type
+equivalent (patterns, formats, bounds...) are left out: payloads are still
+validated against the full schema.
+"""
+
+import json
+import posixpath
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .constants import (
+    CATALOG_COMPONENTS_KEY,
+    CATALOG_ID_KEY,
+    CATALOG_STYLES_KEY,
+    VERSION_0_8,
+)
+from .rendering import BOILERPLATE_KEYS, first_sentence
+
+if TYPE_CHECKING:
+  from .catalog import A2uiCatalog
+
+CATALOG_FUNCTIONS_KEY = "functions"
+# The type of one message.
+MESSAGE_TYPE = "Message"
+
+_DEFINITION_KEYS = ("$defs", "definitions")
+_PRIMITIVES = {
+    "string": "string",
+    "number": "number",
+    "integer": "number",
+    "boolean": "boolean",
+    "null": "null",
+}
+_INDENT = "  "
+
+
+def render_signatures(catalog: "A2uiCatalog") -> str:
+  """Renders the schemas of a catalog as TypeScript-like declarations.
+
+  Args:
+    catalog: The catalog to render, with its server-to-client and common
+      types schemas.
+
+  Returns:
+    The declarations, between the A2UI JSON schema markers.
+  """
+  catalog_schema = catalog.catalog_schema
+  functions = catalog_schema.get(CATALOG_FUNCTIONS_KEY) or {}
+  intro = (
+      "The A2UI JSON schema, written as TypeScript-like types. Each A2UI"
+      f" message is a JSON object of type `{MESSAGE_TYPE}`. `?` marks an"
+      " optional property. Components refer to other components by id."
+  )
+  if functions:
+    intro += (
+        ' A function call is written {"call": "<function name>", "args":'
+        " {<arguments by name>}}."
+    )
+
+  sections = ["---BEGIN A2UI JSON SCHEMA---", intro]
+  s2c_schema = {
+      key: value
+      for key, value in (catalog.s2c_schema or {}).items()
+      if key not in _DEFINITION_KEYS
+  }
+  catalog_keys = {CATALOG_COMPONENTS_KEY, CATALOG_FUNCTIONS_KEY, CATALOG_ID_KEY}
+  if catalog.version == VERSION_0_8:
+    s2c_schema = _inject_0_8_catalog(s2c_schema, catalog_schema)
+    catalog_keys.add(CATALOG_STYLES_KEY)
+  messages = [_declaration(MESSAGE_TYPE, s2c_schema)]
+  messages.extend(_declarations(_definitions(catalog.s2c_schema)))
+  sections.append("### Messages:\n" + "\n".join(messages))
+
+  common_types = _definitions(catalog.common_types_schema)
+  if common_types:
+    sections.append("### Common Types:\n" + "\n".join(_declarations(common_types)))
+
+  components = catalog_schema.get(CATALOG_COMPONENTS_KEY) or {}
+  if components:
+    sections.append("### Components:\n" + "\n".join(_declarations(components)))
+
+  if functions:
+    sections.append(
+        "### Functions:\n"
+        + "\n".join(_function(name, schema) for name, schema in functions.items())
+    )
+
+  catalog_types = dict(_definitions(catalog_schema))
+  for key, value in catalog_schema.items():
+    if (
+        key not in catalog_keys
+        and key not in _DEFINITION_KEYS
+        and key not in BOILERPLATE_KEYS
+        and key != "description"
+        and isinstance(value, dict)
+    ):
+      catalog_types[key] = value
+  if catalog_types:
+    sections.append("### Catalog Types:\n" + "\n".join(_declarations(catalog_types)))
+
+  sections.append("---END A2UI JSON SCHEMA---")
+  return "\n\n".join(sections)
+
+
+def _inject_0_8_catalog(
+    s2c_schema: Dict[str, Any], catalog_schema: Dict[str, Any]
+) -> Dict[str, Any]:
+  """Types the open component wrapper and styles of v0.8, as validation does.
+
+  The wrapper gets one property per component, referring to its declaration.
+  """
+  from .validator import _inject_additional_properties
+
+  components = catalog_schema.get(CATALOG_COMPONENTS_KEY) or {}
+  source_properties = {
+      "component": {
+          name: {"$ref": f"#/{CATALOG_COMPONENTS_KEY}/{name}"} for name in components
+      },
+      CATALOG_STYLES_KEY: catalog_schema.get(CATALOG_STYLES_KEY) or {},
+  }
+  return _inject_additional_properties(s2c_schema, source_properties)[0]
+
+
+def _definitions(schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+  definitions = {}
+  for key in _DEFINITION_KEYS:
+    definitions.update((schema or {}).get(key) or {})
+  return definitions
+
+
+def _declarations(schemas: Dict[str, Any]) -> List[str]:
+  return [_declaration(name, schema) for name, schema in schemas.items()]
+
+
+def _declaration(name: str, schema: Any) -> str:
+  return f"{_comment(schema)}type {name} = {_type(schema, 0)};"
+
+
+def _function(name: str, schema: Any) -> str:
+  """A function signature, for a `{call, args, returnType}` function schema."""
+  properties = schema.get("properties", {}) if isinstance(schema, dict) else {}
+  call = properties.get("call", {})
+  if not isinstance(call, dict) or call.get("const") != name:
+    return _declaration(name, schema)
+  args = properties.get("args", {})
+  required = set(args.get("required", []))
+  parameters = ", ".join(
+      f"{arg}{'' if arg in required else '?'}: {_type(arg_schema, 0)}"
+      for arg, arg_schema in args.get("properties", {}).items()
+  )
+  return_type = properties.get("returnType", {}).get("const", "any")
+  return f"{_comment(schema)}function {name}({parameters}): {return_type};"
+
+
+def _comment(schema: Any) -> str:
+  description = _description(schema)
+  return f"// {description}\n" if description else ""
+
+
+def _description(schema: Any) -> str:
+  """The first sentence of the description, on one line."""
+  if not isinstance(schema, dict) or not isinstance(schema.get("description"), str):
+    return ""
+  return " ".join(first_sentence(schema["description"]).split())
+
+
+def _type(schema: Any, depth: int) -> str:
+  """Writes `schema` as a type expression, nested `depth` levels deep."""
+  if schema is True or not isinstance(schema, dict):
+    return "any"
+  members = []
+  if isinstance(schema.get("$ref"), str):
+    members.append(_ref_name(schema["$ref"]))
+  members.extend(_type(sub, depth) for sub in schema.get("allOf", []))
+
+  if "const" in schema:
+    members.append(json.dumps(schema["const"]))
+  elif "enum" in schema:
+    members.append(" | ".join(json.dumps(value) for value in schema["enum"]))
+  else:
+    branches = schema.get("oneOf") or schema.get("anyOf")
+    if branches:
+      members.append(" | ".join(_type(sub, depth) for sub in branches))
+    members.extend(_own_types(schema, depth))
+
+  if len(members) > 1 and "object" in members:
+    members.remove("object")  # Implied by the other members.
+  if not members:
+    return "any"
+  if len(members) == 1:
+    return members[0]
+  return " & ".join(f"({m})" if _is_union(m) else m for m in members)
+
+
+def _own_types(schema: Dict[str, Any], depth: int) -> List[str]:
+  types = schema.get("type")
+  if types is None:
+    if "properties" in schema:
+      types = ["object"]
+    elif "items" in schema:
+      types = ["array"]
+    else:
+      return []
+  if isinstance(types, str):
+    types = [types]
+
+  written = []
+  for kind in types:
+    if kind == "object":
+      written.append(_object(schema, depth))
+    elif kind == "array":
+      items = _type(schema.get("items", True), depth)
+      written.append(
+          f"({items})[]" if _is_union(items) or " & " in items else f"{items}[]"
+      )
+    elif kind in _PRIMITIVES:
+      written.append(_PRIMITIVES[kind])
+  return [" | ".join(written)] if written else []
+
+
+def _object(schema: Dict[str, Any], depth: int) -> str:
+  properties = schema.get("properties")
+  if not properties:
+    values = schema.get("additionalProperties")
+    if isinstance(values, dict):
+      return f"Record<string, {_type(values, depth)}>"
+    return "object"
+
+  required = set(schema.get("required", []))
+  indent = _INDENT * (depth + 1)
+  lines = ["{"]
+  for name, sub in properties.items():
+    optional = "" if name in required else "?"
+    line = f"{indent}{name}{optional}: {_type(sub, depth + 1)};"
+    comment = _description(sub)
+    if isinstance(sub, dict) and "default" in sub:
+      comment = f"{comment} Default: {json.dumps(sub['default'])}.".strip()
+    lines.append(f"{line} // {comment}" if comment else line)
+  lines.append(f"{_INDENT * depth}}}")
+  return "\n".join(lines)
+
+
+def _ref_name(ref: str) -> str:
+  """The declaration a reference points to, e.g. `DynamicString`."""
+  path, _, fragment = ref.partition("#")
+  name = fragment.rstrip("/").rpartition("/")[2]
+  if not name and path:
+    name = posixpath.splitext(posixpath.basename(path))[0]
+  return name or MESSAGE_TYPE
+
+
+def _is_union(expression: str) -> bool:
+  """Whether a type expression has a top-level `|`."""
+  depth = 0
+  in_string = False
+  for i, char in enumerate(expression):
+    if in_string:
+      if char == '"' and expression[i - 1] != "\\":
+        in_string = False
+    elif char == '"':
+      in_string = True
+    elif char in "({<[":
+      depth += 1
+    elif char in ")}>]":
+      depth -= 1
+    elif char == "|" and depth == 0:
+      return True
+  return False
@@ -0,0 +1,180 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Structural checks of A2UI messages, done in a single walk."""
+
+import functools
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+from .component_graph import ComponentGraph
+from .component_refs import ComponentRefIndex
+from .constants import (
+    ISSUE_PATH,
+    ISSUE_RECURSION,
+    MAX_FUNC_CALL_DEPTH,
+    MAX_GLOBAL_DEPTH,
+)
+
+# RFC 6901 compliant regex for JSON Pointer
+JSON_POINTER_PATTERN = re.compile(r"^(?:\/(?:[^~\/]|~[01])*)*$")
+
+PATH = "path"
+FUNCTION_CALL = "functionCall"
+CALL = "call"
+ARGS = "args"
+
+# Data paths repeat heavily across messages and payloads, so the syntax check
+# is memoized.
+_POINTER_MEMO_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=_POINTER_MEMO_SIZE)
+def is_json_pointer(path: str) -> bool:
+  """Whether `path` is a syntactically valid JSON Pointer."""
+  return JSON_POINTER_PATTERN.fullmatch(path) is not None
+
+
+@dataclass(frozen=True)
+class StructuralError:
+  """A recursion or path problem found in a message.
+
+  Attributes:
+    kind: `ISSUE_RECURSION` or `ISSUE_PATH`.
+    message: Human readable description of the problem.
+    path: Keys and indices leading from the message to the offending value.
+  """
+
+  kind: str
+  message: str
+  path: Tuple[Any, ...] = ()
+
+
+@dataclass
+class MessageStructure:
+  """What a walk over one message found.
+
+  Attributes:
+    errors: Recursion and path problems, in depth-first order.
+    graph: The graph of the components indexed during the walk, if any.
+  """
+
+  errors: List[StructuralError] = field(default_factory=list)
+  graph: Optional[ComponentGraph] = None
+
+
+def walk_message(
+    message: Any,
+    ref_index: ComponentRefIndex,
+    components: Optional[List[Any]] = None,
+) -> MessageStructure:
+  """Checks the structure of a message, visiting every value once.
+
+  Checks performed:
+  1.  Global recursion depth limit (50).
+  2.  FunctionCall recursion depth limit (5).
+  3.  JSON Pointer syntax of data paths.
+
+  Values past a recursion limit are reported once and not descended into.
+  Errors come in the order of a recursive depth-first walk.
+
+  Args:
+    message: The message to check.
+    ref_index: Locates the component references of each component.
+    components: The component list of the message, if its components should
+      be indexed into a `ComponentGraph` along the way. Every item must be a
+      dict.
+
+  Returns:
+    The errors found and the component graph.
+  """
+  structure = MessageStructure()
+  errors = structure.errors
+  if components is not None:
+    structure.graph = ComponentGraph()
+  graph = structure.graph
+
+  # Entries are (value, depth, function call depth, trail, component
+  # position). Trails are linked (parent_trail, key) pairs, only turned into
+  # paths when an error is reported.
+  stack: List[Tuple[Any, int, int, Any, int]] = [(message, 0, 0, None, -1)]
+  while stack:
+    item, depth, func_depth, trail, position = stack.pop()
+    if depth > MAX_GLOBAL_DEPTH:
+      errors.append(
+          StructuralError(
+              ISSUE_RECURSION,
+              f"Global recursion limit exceeded: Depth > {MAX_GLOBAL_DEPTH}",
+              _path(trail),
+          )
+      )
+      continue
+
+    if position >= 0:
+      graph.add(position, item, ref_index)
+
+    # Scalars only need visiting when they are past the depth limit.
+    skip_scalars = depth < MAX_GLOBAL_DEPTH
+    if isinstance(item, list):
+      in_components = item is components
+      for i in range(len(item) - 1, -1, -1):
+        child = item[i]
+        if skip_scalars and not isinstance(child, (dict, list)):
+          continue
+        stack.append(
+            (child, depth + 1, func_depth, (trail, i), i if in_components else -1)
+        )
+      continue
+
+    if not isinstance(item, dict):
+      continue
+
+    data_path = item.get(PATH)
+    if isinstance(data_path, str) and not is_json_pointer(data_path):
+      errors.append(
+          StructuralError(
+              ISSUE_PATH,
+              f"Invalid JSON Pointer syntax: '{data_path}'",
+              _path((trail, PATH)),
+          )
+      )
+
+    is_func = CALL in item and ARGS in item
+    if is_func and func_depth >= MAX_FUNC_CALL_DEPTH:
+      errors.append(
+          StructuralError(
+              ISSUE_RECURSION,
+              f"Recursion limit exceeded: {FUNCTION_CALL} depth >"
+              f" {MAX_FUNC_CALL_DEPTH}",
+              _path(trail),
+          )
+      )
+      continue
+    # Only 'args' nests function calls; every key counts for global depth.
+    for key, value in reversed(item.items()):
+      if skip_scalars and not isinstance(value, (dict, list)):
+        continue
+      child_func_depth = func_depth + 1 if is_func and key == ARGS else func_depth
+      stack.append((value, depth + 1, child_func_depth, (trail, key), -1))
+
+  return structure
+
+
+def _path(trail: Any) -> Tuple[Any, ...]:
+  keys = []
+  while trail is not None:
+    trail, key = trail
+    keys.append(key)
+  return tuple(reversed(keys))
@@ -0,0 +1,151 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Index of A2UI messages by the surface they target."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+SURFACE_ID = "surfaceId"
+ROOT = "root"
+
+# Message keys, grouped by role. v0.8 names come first, v0.9+ names second.
+CREATE_SURFACE_KEYS = ("beginRendering", "createSurface")
+UPDATE_COMPONENTS_KEYS = ("surfaceUpdate", "updateComponents")
+UPDATE_DATA_MODEL_KEYS = ("dataModelUpdate", "updateDataModel")
+DELETE_SURFACE_KEYS = ("deleteSurface",)
+
+
+@dataclass
+class SurfaceMessages:
+  """The messages of a payload that target one surface.
+
+  All indices refer to positions in the message list.
+
+  Attributes:
+    surface_id: The surface ID, or None for messages without one.
+    root_id: The root component ID declared by the first createSurface
+      (v0.9+, always 'root') or beginRendering (v0.8) message, if any.
+    create_indices: Indices of createSurface/beginRendering messages.
+    component_indices: Indices of updateComponents/surfaceUpdate messages.
+    data_model_indices: Indices of updateDataModel/dataModelUpdate messages.
+    delete_indices: Indices of deleteSurface messages.
+  """
+
+  surface_id: Optional[str]
+  root_id: Optional[str] = None
+  create_indices: List[int] = field(default_factory=list)
+  component_indices: List[int] = field(default_factory=list)
+  data_model_indices: List[int] = field(default_factory=list)
+  delete_indices: List[int] = field(default_factory=list)
+
+  @property
+  def is_created(self) -> bool:
+    """Whether the payload creates (or begins rendering) this surface."""
+    return bool(self.create_indices)
+
+  @property
+  def is_deleted(self) -> bool:
+    """Whether the payload deletes this surface."""
+    return bool(self.delete_indices)
+
+
+@dataclass
+class SurfaceIndex:
+  """Messages of a payload grouped by surface ID, built in a single pass.
+
+  Attributes:
+    surfaces: Per-surface message groups, in order of first appearance.
+  """
+
+  surfaces: Dict[Optional[str], SurfaceMessages] = field(default_factory=dict)
+  _first_root_id: Optional[str] = field(default=None, repr=False)
+
+  @property
+  def surface_ids(self) -> List[str]:
+    """IDs of all surfaces the payload touches."""
+    return [s for s in self.surfaces if s is not None]
+
+  def get(self, surface_id: Optional[str]) -> Optional[SurfaceMessages]:
+    return self.surfaces.get(surface_id)
+
+  def __iter__(self) -> Iterator[SurfaceMessages]:
+    return iter(self.surfaces.values())
+
+  def __len__(self) -> int:
+    return len(self.surfaces)
+
+  def root_id(self, surface_id: Optional[str]) -> Optional[str]:
+    """Finds the root component ID for a surface.
+
+    - For v0.8, the root id is in the beginRendering message.
+    - For v0.9+, the root id is 'root'.
+
+    When `surface_id` is empty, the root of the first created surface is used.
+    Returns None if the payload does not create the surface, i.e. for
+    incremental updates.
+    """
+    if not surface_id:
+      return self._first_root_id
+    surface = self.surfaces.get(surface_id)
+    return surface.root_id if surface else None
+
+
+def index_surfaces(
+    a2ui_json: Union[Dict[str, Any], List[Any]],
+) -> SurfaceIndex:
+  """Groups the messages of an A2UI payload by surface ID.
+
+  Args:
+    a2ui_json: A single A2UI message or a list of messages.
+
+  Returns:
+    A SurfaceIndex describing which surfaces the payload touches and which
+    messages target each of them.
+  """
+  messages = a2ui_json if isinstance(a2ui_json, list) else [a2ui_json]
+  index = SurfaceIndex()
+  root_found = False
+
+  for position, message in enumerate(messages):
+    if not isinstance(message, dict):
+      continue
+    for key, body in message.items():
+      if not isinstance(body, dict):
+        continue
+      if key in CREATE_SURFACE_KEYS:
+        surface = _surface(index, body)
+        if not surface.create_indices:
+          surface.root_id = body.get(ROOT, ROOT) if key == "beginRendering" else ROOT
+        surface.create_indices.append(position)
+        if not root_found:
+          root_found = True
+          index._first_root_id = surface.root_id
+      elif key in UPDATE_COMPONENTS_KEYS:
+        _surface(index, body).component_indices.append(position)
+      elif key in UPDATE_DATA_MODEL_KEYS:
+        _surface(index, body).data_model_indices.append(position)
+      elif key in DELETE_SURFACE_KEYS:
+        _surface(index, body).delete_indices.append(position)
+
+  return index
+
+
+def _surface(index: SurfaceIndex, body: Dict[str, Any]) -> SurfaceMessages:
+  surface_id = body.get(SURFACE_ID)
+  if not isinstance(surface_id, str):
+    surface_id = None
+  if surface_id not in index.surfaces:
+    index.surfaces[surface_id] = SurfaceMessages(surface_id=surface_id)
+  return index.surfaces[surface_id]
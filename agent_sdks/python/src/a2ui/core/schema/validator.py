@@ -13,11 +13,20 @@
 # limitations under the License.
 
 import copy
-import re
+import hashlib
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union, Iterator
 
-from jsonschema import Draft202012Validator
+from jsonschema import ValidationError
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT202012, specification_with
 
+from . import json_backend
+from .cache import LruCache
+from .codegen import CompiledValidator, load_compiled_validator
+from .discriminator import create_discriminating_validator_class
+from .structure import walk_message
+from .surfaces import index_surfaces
 from .utils import wrap_as_json_array
 
 if TYPE_CHECKING:
@@ -28,25 +37,125 @@ from .constants import (
     CATALOG_COMPONENTS_KEY,
     CATALOG_ID_KEY,
     CATALOG_STYLES_KEY,
+    ISSUE_SCHEMA,
+    VALIDATION_FULL,
+    VALIDATION_LEVELS,
+    VALIDATION_NONE,
+    VALIDATION_SCHEMA,
+    VALIDATION_STRUCTURAL,
     VERSION_0_8,
     VERSION_0_9,
 )
 
-# RFC 6901 compliant regex for JSON Pointer
-JSON_POINTER_PATTERN = re.compile(r"^(?:\/(?:[^~\/]|~[01])*)*$")
-
-# Recursion Limits
-MAX_GLOBAL_DEPTH = 50
-MAX_FUNC_CALL_DEPTH = 5
-
 # Constants
 COMPONENTS = "components"
 ID = "id"
 ROOT = "root"
-PATH = "path"
-FUNCTION_CALL = "functionCall"
-CALL = "call"
-ARGS = "args"
+
+# Keys of a serialized ValidationProvenance.
+PROVENANCE_CATALOG = "catalog"
+PROVENANCE_LEVEL = "level"
+PROVENANCE_DIGEST = "digest"
+
+# Message keys carrying a component list, v0.8 first.
+COMPONENT_MESSAGE_KEYS = ("surfaceUpdate", "updateComponents")
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+  """A single problem found in an A2UI payload.
+
+  Attributes:
+    kind: The check that failed, one of the `ISSUE_*` constants.
+    message: Human readable description of the problem.
+    pointer: RFC 6901 JSON Pointer to the offending value in the payload as
+      passed to `validate_report` ("" is the whole payload).
+    message_index: Position of the offending message in a list payload, if
+      the problem is tied to one message.
+  """
+
+  kind: str
+  message: str
+  pointer: str = ""
+  message_index: Optional[int] = None
+
+  def __str__(self) -> str:
+    return f"{self.pointer or '/'}: {self.message}"
+
+
+@dataclass(frozen=True)
+class ValidationReport:
+  """All the problems found in an A2UI payload.
+
+  Attributes:
+    issues: The problems, schema violations first, then the structural checks
+      of each message in payload order.
+  """
+
+  issues: List[ValidationIssue] = field(default_factory=list)
+
+  @property
+  def is_valid(self) -> bool:
+    return not self.issues
+
+  def format(self) -> str:
+    """Lists every issue on its own line, e.g. for a retry prompt."""
+    return "\n".join(f"- {issue}" for issue in self.issues)
+
+
+@dataclass(frozen=True)
+class ValidationProvenance:
+  """Records that a payload was validated, so it need not be validated again.
+
+  Returned by `A2uiValidator.validate` and handed back to it, or carried
+  alongside the payload across process or serialization boundaries with
+  `to_dict`. A provenance only vouches for the payload as it was validated:
+  it records its digest, and covers no other payload.
+
+  Attributes:
+    fingerprint: Fingerprint of the catalog the payload was validated against.
+    level: The validation level that was applied.
+    digest: SHA-256 of the payload as canonical JSON, or None if the payload
+      is not JSON or was not validated (`VALIDATION_NONE`).
+  """
+
+  fingerprint: str
+  level: str
+  digest: Optional[str] = None
+
+  def covers(self, fingerprint: str, level: str, digest: Optional[str]) -> bool:
+    """Whether this validation makes validating at `level` unnecessary."""
+    if level == VALIDATION_NONE:
+      return True
+    return (
+        self.digest is not None
+        and self.digest == digest
+        and self.fingerprint == fingerprint
+        and (self.level == level or self.level == VALIDATION_FULL)
+    )
+
+  def to_dict(self) -> Dict[str, Optional[str]]:
+    return {
+        PROVENANCE_CATALOG: self.fingerprint,
+        PROVENANCE_LEVEL: self.level,
+        PROVENANCE_DIGEST: self.digest,
+    }
+
+  @classmethod
+  def from_dict(cls, data: Any) -> Optional["ValidationProvenance"]:
+    """Reads a marker written by `to_dict`, or returns None if malformed."""
+    if not isinstance(data, dict):
+      return None
+    fingerprint = data.get(PROVENANCE_CATALOG)
+    level = data.get(PROVENANCE_LEVEL)
+    digest = data.get(PROVENANCE_DIGEST)
+    if (
+        not isinstance(fingerprint, str)
+        or level not in VALIDATION_LEVELS
+        or not isinstance(digest, (str, type(None)))
+    ):
+      return None
+    return cls(fingerprint=fingerprint, level=level, digest=digest)
 
 
 def _inject_additional_properties(
@@ -95,6 +204,23 @@ def _inject_additional_properties(
   return recursive_inject(schema), injected_keys
 
 
+def _schema_resource(schema: Dict[str, Any]) -> Resource:
+  """Wraps a schema document for the reference registry, in its declared dialect.
+
+  Documents without `$schema` are Draft 2020-12. Draft 2020-12 documents lose
+  their `$schema` keyword: jsonschema switches back to the stock validator
+  class when it enters a subschema that declares a dialect, which would bypass
+  discriminator dispatch. Documents in other dialects keep it, and are
+  validated by the validator of their dialect.
+  """
+  if not isinstance(schema, dict) or "$schema" not in schema:
+    return DRAFT202012.create_resource(schema)
+  specification = specification_with(schema["$schema"])
+  if specification is DRAFT202012:
+    schema = {k: v for k, v in schema.items() if k != "$schema"}
+  return specification.create_resource(schema)
+
+
 class A2uiValidator:
   """Validates the A2UI JSON payload against the provided schema and checks for integrity.
 
@@ -122,16 +248,45 @@ class A2uiValidator:
       ValueError: If integrity, topology, or recursion checks fail.
   """
 
-  def __init__(self, catalog: "A2uiCatalog"):
+  def __init__(self, catalog: "A2uiCatalog", compiled: Optional[bool] = None):
     self._catalog = catalog
-    self._validator = self._build_validator()
-
-  def _build_validator(self) -> Draft202012Validator:
-    """Builds a validator for the A2UI schema."""
+    self._ref_index = catalog.component_ref_index
+    schema, registry = self._build_schema()
+    self._schema = schema
+    self._registry = registry
+    # Tagged unions (components, messages) are validated against the one
+    # branch their tag selects instead of every branch.
+    validator_class = create_discriminating_validator_class()
+    self._validator = validator_class(schema, registry=registry)
+    if compiled is None:
+      compiled = catalog.compiled_validation
+    # Fast accept path generated from the schema; rejected payloads are always
+    # re-validated by `self._validator` to produce the error message.
+    self._compiled: Optional[CompiledValidator] = (
+        load_compiled_validator(schema, registry) if compiled else None
+    )
+
+  @property
+  def schema(self) -> Dict[str, Any]:
+    """The schema of a list of messages that payloads are validated against."""
+    return self._schema
+
+  @property
+  def registry(self) -> Registry:
+    """The registry resolving the references of `schema`."""
+    return self._registry
+
+  @property
+  def is_compiled(self) -> bool:
+    """Whether schema validation runs through a generated validator."""
+    return self._compiled is not None
+
+  def _build_schema(self) -> Tuple[Dict[str, Any], Registry]:
+    """Builds the A2UI schema and the registry resolving its references."""
 
     if self._catalog.version == VERSION_0_8:
-      return self._build_0_8_validator()
-    return self._build_0_9_validator()
+      return self._build_0_8_schema()
+    return self._build_0_9_schema()
 
   def _bundle_0_8_schemas(self) -> Dict[str, Any]:
     if not self._catalog.s2c_schema:
@@ -152,14 +307,11 @@ class A2uiValidator:
     bundled, _ = _inject_additional_properties(bundled, source_properties)
     return bundled
 
-  def _build_0_8_validator(self) -> Draft202012Validator:
-    """Builds a validator for the A2UI schema version 0.8."""
+  def _build_0_8_schema(self) -> Tuple[Dict[str, Any], Registry]:
+    """Builds the A2UI schema version 0.8."""
     bundled_schema = self._bundle_0_8_schemas()
     full_schema = wrap_as_json_array(bundled_schema)
 
-    from referencing import Registry, Resource
-    from referencing.jsonschema import DRAFT202012
-
     # Even in v0.8, we may have references to common_types.json or other files.
     base_uri = self._catalog.s2c_schema.get("$id", BASE_SCHEMA_URL)
     import os
@@ -172,33 +324,25 @@ class A2uiValidator:
     resources = [
         (
             common_types_uri,
-            Resource.from_contents(
-                self._catalog.common_types_schema,
-                default_specification=DRAFT202012,
-            ),
+            _schema_resource(self._catalog.common_types_schema),
         ),
         (
             "common_types.json",
-            Resource.from_contents(
-                self._catalog.common_types_schema,
-                default_specification=DRAFT202012,
-            ),
+            _schema_resource(self._catalog.common_types_schema),
         ),
     ]
 
     registry = Registry().with_resources(resources)
     validator_schema = copy.deepcopy(full_schema)
     validator_schema["$schema"] = "https://json-schema.org/draft/2020-12/schema"
+    validator_schema["items"].pop("$schema", None)
 
-    return Draft202012Validator(validator_schema, registry=registry)
+    return validator_schema, registry
 
-  def _build_0_9_validator(self) -> Draft202012Validator:
-    """Builds a validator for the A2UI schema version 0.9+."""
+  def _build_0_9_schema(self) -> Tuple[Dict[str, Any], Registry]:
+    """Builds the A2UI schema version 0.9+."""
     full_schema = wrap_as_json_array(self._catalog.s2c_schema)
 
-    from referencing import Registry, Resource
-    from referencing.jsonschema import DRAFT202012
-
     # v0.9 schemas (e.g. server_to_client.json) use relative references like
     # 'catalog.json#/$defs/anyComponent'. Since server_to_client.json has
     # $id: https://a2ui.org/specification/v0_9/server_to_client.json,
@@ -216,451 +360,290 @@ class A2uiValidator:
     resources = [
         (
             common_types_uri,
-            Resource.from_contents(
-                self._catalog.common_types_schema,
-                default_specification=DRAFT202012,
-            ),
+            _schema_resource(self._catalog.common_types_schema),
         ),
         (
             catalog_uri,
-            Resource.from_contents(
-                self._catalog.catalog_schema,
-                default_specification=DRAFT202012,
-            ),
+            _schema_resource(self._catalog.catalog_schema),
         ),
         # Fallbacks for robustness
         (
             "catalog.json",
-            Resource.from_contents(
-                self._catalog.catalog_schema,
-                default_specification=DRAFT202012,
-            ),
+            _schema_resource(self._catalog.catalog_schema),
         ),
         (
             "common_types.json",
-            Resource.from_contents(
-                self._catalog.common_types_schema,
-                default_specification=DRAFT202012,
-            ),
+            _schema_resource(self._catalog.common_types_schema),
         ),
     ]
     # Also register the catalog ID if it's different from the catalog URI
     if self._catalog.catalog_id and self._catalog.catalog_id != catalog_uri:
       resources.append((
           self._catalog.catalog_id,
-          Resource.from_contents(
-              self._catalog.catalog_schema,
-              default_specification=DRAFT202012,
-          ),
+          _schema_resource(self._catalog.catalog_schema),
       ))
 
     registry = Registry().with_resources(resources)
     validator_schema = copy.deepcopy(full_schema)
     validator_schema["$schema"] = "https://json-schema.org/draft/2020-12/schema"
+    validator_schema["items"].pop("$schema", None)
+
+    return validator_schema, registry
+
+  def validate(
+      self,
+      a2ui_json: Union[Dict[str, Any], List[Any]],
+      level: str = VALIDATION_FULL,
+      provenance: Optional[ValidationProvenance] = None,
+  ) -> ValidationProvenance:
+    """Validates an A2UI messages against the schema.
+
+    When the result cache is enabled (see `enable_result_cache`), payloads
+    already validated against the same catalog are answered from the cache.
+
+    Args:
+      a2ui_json: A single A2UI message or a list of messages.
+      level: Which checks to run: `VALIDATION_FULL` runs them all,
+        `VALIDATION_SCHEMA` only JSON Schema validation,
+        `VALIDATION_STRUCTURAL` only the integrity, topology, recursion and path
+        checks, and `VALIDATION_NONE` nothing. Lower levels are meant for
+        payloads built by trusted code, e.g. from vetted templates.
+      provenance: How the payload was validated before, if it was. No checks
+        run when it already covers `level` for this catalog and payload.
+
+    Returns:
+      The provenance of this validation, to hand to later validations of the
+      same payload.
+
+    Raises:
+      ValueError: If the payload fails a check, or `level` is unknown.
+    """
+    if level not in VALIDATION_LEVELS:
+      raise ValueError(
+          f"Unknown validation level '{level}', expected one of {VALIDATION_LEVELS}"
+      )
+    fingerprint = self._catalog.fingerprint
+    if level == VALIDATION_NONE:
+      return provenance or ValidationProvenance(fingerprint=fingerprint, level=level)
 
-    return Draft202012Validator(validator_schema, registry=registry)
-
-  def validate(self, a2ui_json: Union[Dict[str, Any], List[Any]]) -> None:
-    """Validates an A2UI messages against the schema."""
     messages = a2ui_json if isinstance(a2ui_json, list) else [a2ui_json]
+    digest = _payload_digest(messages)
+    if provenance is not None and provenance.covers(fingerprint, level, digest):
+      return provenance
+    done = ValidationProvenance(fingerprint=fingerprint, level=level, digest=digest)
+
+    cache = _RESULT_CACHE
+    key = None
+    if cache is not None and digest is not None:
+      key = (fingerprint, level, digest)
+    if key is not None:
+      cached_error = cache.get(key)
+      if cached_error is not None:
+        if cached_error:
+          raise ValueError(cached_error)
+        return done
 
-    # Basic schema validation
-    error = next(self._validator.iter_errors(messages), None)
-    if error is not None:
-      msg = f"Validation failed: {error.message}"
-      if error.context:
-        msg += "\nContext failures:"
-        for sub_error in error.context:
-          msg += f"\n  - {sub_error.message}"
-      raise ValueError(msg)
+    try:
+      self._validate_messages(messages, level)
+    except ValueError as e:
+      if key is not None:
+        cache.put(key, str(e))
+      raise
+    if key is not None:
+      cache.put(key, _VALID)
+    return done
+
+  def _validate_messages(self, messages: List[Any], level: str) -> None:
+    if level != VALIDATION_STRUCTURAL:
+      # Basic schema validation
+      if self._compiled is not None and self._compiled(messages) is True:
+        error = None
+      else:
+        error = next(self._validator.iter_errors(messages), None)
+      if error is not None:
+        raise ValueError(_format_schema_error(error))
+    if level == VALIDATION_SCHEMA:
+      return
 
+    surfaces = index_surfaces(messages)
     for message in messages:
       if not isinstance(message, dict):
         continue
 
-      components = None
-      surface_id = None
-      if "surfaceUpdate" in message:  # v0.8
-        components = message["surfaceUpdate"].get(COMPONENTS)
-        surface_id = message["surfaceUpdate"].get("surfaceId")
-      elif "updateComponents" in message and isinstance(
-          message["updateComponents"], dict
-      ):  # v0.9
-        components = message["updateComponents"].get(COMPONENTS)
-        surface_id = message["updateComponents"].get("surfaceId")
-
-      if components:
-        ref_map = _extract_component_ref_fields(self._catalog)
-        root_id = _find_root_id(messages, surface_id)
-        _validate_component_integrity(root_id, components, ref_map)
-        _validate_topology(root_id, components, ref_map)
-
-      _validate_recursion_and_paths(message)
-
-
-def _find_root_id(
-    messages: List[Dict[str, Any]], surface_id: Optional[str] = None
-) -> Optional[str]:
-  """
-  Finds the root id from a list of A2UI messages for a given surface.
-  - For v0.8, the root id is in the beginRendering message.
-  - For v0.9+, the root id is 'root'.
-  """
-  for message in messages:
-    if not isinstance(message, dict):
-      continue
-    if "beginRendering" in message:
-      if surface_id and message["beginRendering"].get("surfaceId") != surface_id:
-        continue
-      return message["beginRendering"].get(ROOT, ROOT)
-    if "createSurface" in message:
-      if surface_id and message["createSurface"].get("surfaceId") != surface_id:
+      # One walk checks recursion and paths and indexes the components.
+      _, surface_id, components = _component_list(message)
+      structure = walk_message(message, self._ref_index, _graph_input(components))
+      if structure.graph is not None:
+        root_id = surfaces.root_id(surface_id)
+        error = next(structure.graph.iter_errors(root_id), None)
+        if error is not None:
+          raise ValueError(error.message)
+      if structure.errors:
+        raise ValueError(structure.errors[0].message)
+
+  def validate_report(
+      self, a2ui_json: Union[Dict[str, Any], List[Any]]
+  ) -> ValidationReport:
+    """Runs every check and reports all the problems found.
+
+    Unlike `validate`, which stops at the first problem, this collects the
+    schema violations and the integrity, topology, recursion and path problems
+    of every message, each located by a JSON Pointer, so that they can all be
+    fixed at once. Structural checks are skipped for component lists too
+    malformed to index.
+
+    Args:
+      a2ui_json: A single A2UI message or a list of messages.
+
+    Returns:
+      The report; `is_valid` is True exactly when `validate` would not raise.
+    """
+    is_list = isinstance(a2ui_json, list)
+    messages = a2ui_json if is_list else [a2ui_json]
+    issues: List[ValidationIssue] = []
+
+    def add(kind: str, message: str, path: List[Any]) -> None:
+      message_index = path[0] if is_list and path else None
+      issues.append(
+          ValidationIssue(
+              kind=kind,
+              message=message,
+              pointer=_json_pointer(path if is_list else path[1:]),
+              message_index=message_index,
+          )
+      )
+
+    if self._compiled is None or self._compiled(messages) is not True:
+      for error in self._validator.iter_errors(messages):
+        add(ISSUE_SCHEMA, _format_schema_error(error), list(error.absolute_path))
+
+    surfaces = index_surfaces(messages)
+    for index, message in enumerate(messages):
+      if not isinstance(message, dict):
         continue
-      return ROOT
-  return None
 
+      key, surface_id, components = _component_list(message)
+      structure = walk_message(message, self._ref_index, _graph_input(components))
+      if structure.graph is not None:
+        for error in structure.graph.iter_errors(surfaces.root_id(surface_id)):
+          path = [index, key, COMPONENTS]
+          if error.component_index is not None:
+            path.append(error.component_index)
+          add(error.kind, error.message, path)
 
-def _validate_component_integrity(
-    root_id: Optional[str],
-    components: List[Dict[str, Any]],
-    ref_fields_map: Dict[str, tuple[Set[str], Set[str]]],
-) -> None:
-  """
-  Validates that:
-  1. All component IDs are unique.
-  2. A 'root' component exists.
-  3. All references point to existing IDs.
-  """
-  ids: Set[str] = set()
+      for error in structure.errors:
+        add(error.kind, error.message, [index, *error.path])
 
-  # 1. Collect IDs and check for duplicates
-  for comp in components:
-    comp_id = comp.get(ID)
-    if comp_id is None:
-      continue
-
-    if comp_id in ids:
-      raise ValueError(f"Duplicate component ID: {comp_id}")
-    ids.add(comp_id)
-
-  # 2. Check for root component
-  if root_id is not None and root_id not in ids:
-    raise ValueError(f"Missing root component: No component has id='{root_id}'")
-
-  # 3. Check for dangling references using helper
-  # In an incremental update (root_id is None), components may reference IDs already on the client.
-  if root_id is not None:
-    for comp in components:
-      for ref_id, field_name in _get_component_references(comp, ref_fields_map):
-        if ref_id not in ids:
-          raise ValueError(
-              f"Component '{comp.get(ID)}' references non-existent component '{ref_id}'"
-              f" in field '{field_name}'"
-          )
+    return ValidationReport(issues)
 
 
-def _validate_topology(
-    root_id: Optional[str],
-    components: List[Dict[str, Any]],
-    ref_fields_map: Dict[str, tuple[Set[str], Set[str]]],
-) -> None:
-  """
-  Validates the topology of the component tree:
-  1. No circular references (including self-references).
-  2. No orphaned components (all components must be reachable from 'root').
-  """
-  adj_list: Dict[str, List[str]] = {}
-  all_ids: Set[str] = set()
+# Building a validator deep-copies the schemas, rebuilds the reference registry
+# and recompiles the JSON Schema validator, so compiled validators are shared
+# process-wide and keyed by the catalog content fingerprint and validation mode.
+DEFAULT_VALIDATOR_CACHE_SIZE = 32
+_VALIDATOR_CACHE: LruCache[Tuple[str, bool], A2uiValidator] = LruCache(
+    maxsize=DEFAULT_VALIDATOR_CACHE_SIZE
+)
 
-  # Build Adjacency List
-  for comp in components:
-    comp_id = comp.get(ID)
-    if comp_id is None:
-      continue
-
-    all_ids.add(comp_id)
-    if comp_id not in adj_list:
-      adj_list[comp_id] = []
-
-    for ref_id, field_name in _get_component_references(comp, ref_fields_map):
-      if ref_id == comp_id:
-        raise ValueError(
-            f"Self-reference detected: Component '{comp_id}' references itself in field"
-            f" '{field_name}'"
-        )
-      adj_list[comp_id].append(ref_id)
-
-  # Detect Cycles and Depth using DFS
-  visited: Set[str] = set()
-  recursion_stack: Set[str] = set()
-
-  def dfs(node_id: str, depth: int):
-    if depth > MAX_GLOBAL_DEPTH:
-      raise ValueError(
-          f"Global recursion limit exceeded: logical depth > {MAX_GLOBAL_DEPTH}"
-      )
 
-    visited.add(node_id)
-    recursion_stack.add(node_id)
+def get_validator_cache() -> LruCache[Tuple[str, bool], A2uiValidator]:
+  """Returns the process-wide cache of compiled validators."""
+  return _VALIDATOR_CACHE
 
-    for neighbor in adj_list.get(node_id, []):
-      if neighbor not in visited:
-        dfs(neighbor, depth + 1)
-      elif neighbor in recursion_stack:
-        raise ValueError(
-            f"Circular reference detected involving component '{neighbor}'"
-        )
 
-    recursion_stack.remove(node_id)
+# Results of `A2uiValidator.validate`, keyed by catalog fingerprint, validation
+# level and payload content hash. Values are error messages, `_VALID` for valid payloads.
+DEFAULT_RESULT_CACHE_SIZE = 1024
+_VALID = ""
+_RESULT_CACHE: Optional[LruCache[Tuple[str, str, str], str]] = None
 
-  if root_id is not None:
-    if root_id in all_ids:
-      dfs(root_id, 0)
 
-    # Check for Orphans
-    orphans = all_ids - visited
-    if orphans:
-      sorted_orphans = sorted(list(orphans))
-      raise ValueError(
-          f"Component '{sorted_orphans[0]}' is not reachable from '{root_id}'"
-      )
-  else:
-    # Partial update: we cannot check root reachability, but we still check for cycles
-    for node_id in all_ids:
-      if node_id not in visited:
-        dfs(node_id, 0)
+def enable_result_cache(
+    maxsize: int = DEFAULT_RESULT_CACHE_SIZE, ttl: Optional[float] = None
+) -> LruCache[Tuple[str, str, str], str]:
+  """Turns on the process-wide cache of validation results.
 
+  Validating a payload seen before against the same catalog then costs one
+  canonical serialization and hash of the payload. Reordering the keys of an
+  object does not change the hash, so a cached error may name a different
+  first problem than a fresh validation would; validity is always the same.
 
-def _extract_component_ref_fields(
-    catalog: "A2uiCatalog",
-) -> Dict[str, tuple[Set[str], Set[str]]]:
-  """
-  Parses the catalog/schema to identify which component properties reference other components.
-  Returns a map: { component_name: (set_of_single_ref_fields, set_of_list_ref_fields) }
+  Args:
+    maxsize: Maximum number of results kept.
+    ttl: Seconds after which a result is validated again, or None to keep
+      results until they are evicted.
+
+  Returns:
+    The new cache, whose `stats` give the hit rate.
   """
-  ref_map = {}
+  global _RESULT_CACHE
+  _RESULT_CACHE = LruCache(maxsize=maxsize, ttl=ttl)
+  return _RESULT_CACHE
 
-  all_components = {}
-  # Version aware extraction
-  if catalog.version == VERSION_0_8:
-    # Search for components in s2c schema properties
-    try:
-      # Try nested path: surfaceUpdate -> components -> items -> properties -> component -> properties
-      s2c = catalog.s2c_schema or {}
-      props = s2c.get("properties", {})
-
-      # Might be in surfaceUpdate or beginRendering component definitions
-      if "surfaceUpdate" in props:
-        su = props["surfaceUpdate"].get("properties", {})
-        if "components" in su:
-          items = su["components"].get("items", {})
-          if "properties" in items:
-            comp_wrapper = items["properties"].get("component", {})
-            all_components = comp_wrapper.get("properties", {})
-    except Exception:
-      logging.warning("Failed to extract component ref fields from v0.8 schema")
-
-    # Also check catalog schema if available
-    if not all_components and catalog.catalog_schema:
-      all_components = catalog.catalog_schema.get(COMPONENTS, {})
-  else:  # v0.9+
-    # In v0.9, components are defined in the catalog itself
-    all_components = catalog.catalog_schema.get(COMPONENTS, {})
-
-  # Helper to check if a property schema looks like a ComponentId reference
-  def is_component_id_ref(prop_schema: Dict[str, Any]) -> bool:
-    if not isinstance(prop_schema, dict):
-      return False
-    ref = prop_schema.get("$ref", "")
-    if isinstance(ref, str) and (
-        ref.endswith("ComponentId") or ref.endswith("child") or "/child" in ref
-    ):
-      return True
 
-    # Inline check
-    if (
-        prop_schema.get("type") == "string"
-        and prop_schema.get("title") == "ComponentId"
-    ):
-      return True
+def disable_result_cache() -> None:
+  """Turns off and drops the cache of validation results."""
+  global _RESULT_CACHE
+  _RESULT_CACHE = None
 
-    # Check oneOf/anyOf for refs
-    for key in ["oneOf", "anyOf", "allOf"]:
-      if key in prop_schema:
-        for sub in prop_schema[key]:
-          if is_component_id_ref(sub):
-            return True
-    return False
-
-  def is_child_list_ref(prop_schema: Dict[str, Any]) -> bool:
-    if not isinstance(prop_schema, dict):
-      return False
-    ref = prop_schema.get("$ref", "")
-    if isinstance(ref, str) and (
-        ref.endswith("ChildList") or ref.endswith("children") or "/children" in ref
-    ):
-      return True
 
-    # Inline check
-    if prop_schema.get("type") == "object":
-      props = prop_schema.get("properties", {})
-      if "explicitList" in props or "template" in props or "componentId" in props:
-        return True
-
-    # Or array of ComponentIds
-    if prop_schema.get("type") == "array":
-      items = prop_schema.get("items", {})
-      if is_component_id_ref(items):
-        return True
-
-    # Check oneOf/anyOf for refs
-    for key in ["oneOf", "anyOf", "allOf"]:
-      if key in prop_schema:
-        for sub in prop_schema[key]:
-          if is_child_list_ref(sub):
-            return True
-    return False
-
-  for comp_name, comp_schema in all_components.items():
-    single_refs = set()
-    list_refs = set()
-
-    def extract_from_props(cs: Dict[str, Any]):
-      if not isinstance(cs, dict):
-        return
-      props = cs.get("properties", {})
-      for prop_name, prop_schema in props.items():
-        if is_component_id_ref(prop_schema) or prop_name in [
-            "child",
-            "contentChild",
-            "entryPointChild",
-        ]:
-          single_refs.add(prop_name)
-        elif is_child_list_ref(prop_schema) or prop_name == "children":
-          list_refs.add(prop_name)
-
-      # Recurse into allOf/oneOf for properties
-      for key in ["allOf", "oneOf", "anyOf"]:
-        if key in cs:
-          for sub in cs[key]:
-            extract_from_props(sub)
-
-    extract_from_props(comp_schema)
-
-    if single_refs or list_refs:
-      ref_map[comp_name] = (single_refs, list_refs)
-
-  return ref_map
-
-
-def _get_component_references(
-    component: Dict[str, Any], ref_fields_map: Dict[str, tuple[Set[str], Set[str]]]
-) -> Iterator[Tuple[str, str]]:
-  """
-  Helper to extract all referenced component IDs from a component.
-  Yields (referenced_id, field_name).
-  """
-  # Support both v0.8 and v0.9+
-  comp_type = None
-  props = {}
-
-  if "component" in component:
-    comp_val = component.get("component")
-    if isinstance(comp_val, str):
-      # v0.9 flattened
-      yield from _get_refs_recursively(comp_val, component, ref_fields_map)
-    elif isinstance(comp_val, dict):
-      # v0.8 structured
-      for c_type, c_props in comp_val.items():
-        # Recurse into the properties container
-        if isinstance(c_props, dict):
-          yield from _get_refs_recursively(c_type, c_props, ref_fields_map)
-
-
-def _get_refs_recursively(
-    comp_type: str,
-    props: Dict[str, Any],
-    ref_fields_map: Dict[str, tuple[Set[str], Set[str]]],
-) -> Iterator[Tuple[str, str]]:
-  if not comp_type or not isinstance(props, dict):
-    return
-
-  single_refs, list_refs = ref_fields_map.get(comp_type, (set(), set()))
-
-  for key, value in props.items():
-    if key in single_refs:
-      if isinstance(value, str):
-        yield value, key
-      elif isinstance(value, dict) and "componentId" in value:  # ChildList template
-        yield value["componentId"], f"{key}.componentId"
-    elif key in list_refs:
-      if isinstance(value, list):
-        for item in value:
-          if isinstance(item, str):
-            yield item, key
-      elif isinstance(value, dict):
-        if "explicitList" in value:
-          for item in value["explicitList"]:
-            if isinstance(item, str):
-              yield item, f"{key}.explicitList"
-        elif "template" in value:
-          template = value["template"]
-          if isinstance(template, dict) and "componentId" in template:
-            yield template["componentId"], f"{key}.template.componentId"
-        elif "componentId" in value:
-          yield value["componentId"], f"{key}.componentId"
-
-    # Special handling for 'tabs' or other nested arrays
-    if isinstance(value, list) and key not in list_refs:
-      for idx, item in enumerate(value):
-        if isinstance(item, dict):
-          # Check for common patterns like {title, child}
-          child_id = item.get("child")
-          if child_id and isinstance(child_id, str):
-            yield child_id, f"{key}[{idx}].child"
-
-
-def _validate_recursion_and_paths(data: Any) -> None:
-  """
-  Validates:
-  1. Global recursion depth limit (50).
-  2. FunctionCall recursion depth limit (5).
-  3. Path syntax for DataBindings/DataModelUpdates.
+def get_result_cache() -> Optional[LruCache[Tuple[str, str, str], str]]:
+  """Returns the cache of validation results, or None if it is disabled."""
+  return _RESULT_CACHE
+
+
+def _payload_digest(messages: List[Any]) -> Optional[str]:
+  try:
+    canonical = json_backend.dumps(messages, sort_keys=True)
+  except (TypeError, ValueError):
+    return None  # Not JSON; such payloads are never cached nor vouched for.
+  return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def get_cached_validator(catalog: "A2uiCatalog") -> A2uiValidator:
+  """Returns a compiled validator for the catalog, reusing one when possible.
+
+  Catalogs with identical version and schemas share the same validator, even
+  when they are distinct `A2uiCatalog` instances.
   """
+  compiled = catalog.compiled_validation
+  return _VALIDATOR_CACHE.get_or_create(
+      (catalog.fingerprint, compiled), lambda: A2uiValidator(catalog, compiled)
+  )
 
-  def traverse(item: Any, global_depth: int, func_depth: int):
-    if global_depth > MAX_GLOBAL_DEPTH:
-      raise ValueError(f"Global recursion limit exceeded: Depth > {MAX_GLOBAL_DEPTH}")
 
-    if isinstance(item, list):
-      for x in item:
-        traverse(x, global_depth + 1, func_depth)
-      return
+def _format_schema_error(error: ValidationError) -> str:
+  msg = f"Validation failed: {error.message}"
+  if error.context:
+    msg += "\nContext failures:"
+    for sub_error in error.context:
+      msg += f"\n  - {sub_error.message}"
+  return msg
 
-    if isinstance(item, dict):
-      # Check for path
-      if PATH in item and isinstance(item[PATH], str):
-        path = item[PATH]
-        if not re.fullmatch(JSON_POINTER_PATTERN, path):
-          raise ValueError(f"Invalid JSON Pointer syntax: '{path}'")
 
-      # Check for FunctionCall
-      is_func = CALL in item and ARGS in item
+def _component_list(message: Dict[str, Any]) -> Tuple[Optional[str], Any, Any]:
+  """Returns (message_key, surface_id, components) of a component update."""
+  for key in COMPONENT_MESSAGE_KEYS:
+    body = message.get(key)
+    if isinstance(body, dict):
+      return key, body.get("surfaceId"), body.get(COMPONENTS)
+  return None, None, None
 
-      if is_func:
-        if func_depth >= MAX_FUNC_CALL_DEPTH:
-          raise ValueError(
-              f"Recursion limit exceeded: {FUNCTION_CALL} depth > {MAX_FUNC_CALL_DEPTH}"
-          )
 
-        # Increment func_depth only for 'args', but global_depth matches traversal
-        for k, v in item.items():
-          if k == ARGS:
-            traverse(v, global_depth + 1, func_depth + 1)
-          else:
-            traverse(v, global_depth + 1, func_depth)
-      else:
-        for v in item.values():
-          traverse(v, global_depth + 1, func_depth)
+def _graph_input(components: Any) -> Optional[List[Dict[str, Any]]]:
+  """Returns the components to run the graph checks on, if there are any.
+
+  Lists too malformed to index, which fail schema validation, are skipped.
+  """
+  if not components or not isinstance(components, list):
+    return None
+  for comp in components:
+    if not isinstance(comp, dict) or not isinstance(comp.get(ID), (str, type(None))):
+      return None
+  return components
+
 
-  traverse(data, 0, 0)
+def _json_pointer(path: List[Any]) -> str:
+  return "".join(
+      "/" + str(token).replace("~", "~0").replace("/", "~1") for token in path
+  )
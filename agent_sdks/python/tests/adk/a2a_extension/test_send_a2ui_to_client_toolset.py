@@ -28,8 +28,17 @@ from a2ui.adk.a2a_extension.send_a2ui_to_client_toolset import (
     SendA2uiToClientToolset,
 )
 from a2ui.core.schema.catalog import A2uiCatalog
-from a2ui.core.schema.constants import A2UI_OPEN_TAG, A2UI_CLOSE_TAG
+from a2ui.core.schema.constants import (
+    A2UI_CLOSE_TAG,
+    A2UI_OPEN_TAG,
+    SCHEMA_RENDERING_COMPACT,
+    VALIDATION_FULL,
+    VALIDATION_NONE,
+    VALIDATION_SCHEMA,
+)
+from a2ui.core.schema.validator import ValidationProvenance
 from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.models import LlmRequest
 from google.adk.tools.tool_context import ToolContext
 from google.genai import types as genai_types
 
@@ -151,6 +160,83 @@ def test_send_tool_get_declaration():
   )
 
 
+def _structured_catalog_mock():
+  catalog_mock = MagicMock(spec=A2uiCatalog)
+  catalog_mock.function_schema = {
+      "type": "ARRAY",
+      "items": {"ref": "#/defs/Message"},
+      "defs": {
+          "Message": {
+              "type": "OBJECT",
+              "properties": {"deleteSurface": {"type": "OBJECT"}},
+          }
+      },
+  }
+  return catalog_mock
+
+
+def test_send_tool_get_structured_declaration():
+  catalog_mock = _structured_catalog_mock()
+  tool = SendA2uiToClientToolset._SendA2uiJsonToClientTool(
+      catalog_mock, "examples", structured_arguments=True
+  )
+  parameters = tool._get_declaration().parameters
+
+  argument = parameters.properties[
+      SendA2uiToClientToolset._SendA2uiJsonToClientTool.A2UI_JSON_ARG_NAME
+  ]
+  assert argument.type == genai_types.Type.ARRAY
+  assert argument.items.ref == "#/defs/Message"
+  # Definitions are moved to the root of the parameters.
+  assert argument.defs is None
+  assert list(parameters.defs) == ["Message"]
+  assert "defs" in catalog_mock.function_schema
+
+
+@pytest.mark.asyncio
+async def test_send_tool_structured_declaration_uses_resolved_catalog():
+  catalog_mock = _structured_catalog_mock()
+  catalog_mock.render_as_llm_instructions.return_value = "rendered_catalog"
+  tool = SendA2uiToClientToolset._SendA2uiJsonToClientTool(
+      MagicMock(return_value=catalog_mock), "examples", structured_arguments=True
+  )
+  llm_request = LlmRequest()
+
+  await tool.process_llm_request(
+      tool_context=MagicMock(spec=ToolContext), llm_request=llm_request
+  )
+
+  (declaration,) = llm_request.config.tools[0].function_declarations
+  assert list(declaration.parameters.defs) == ["Message"]
+  bound_tool = llm_request.tools_dict[tool.name]
+  assert bound_tool is not tool
+  assert bound_tool._a2ui_catalog is catalog_mock
+
+
+@pytest.mark.asyncio
+async def test_send_tool_run_async_structured_arguments():
+  catalog_mock = MagicMock(spec=A2uiCatalog)
+  tool = SendA2uiToClientToolset._SendA2uiJsonToClientTool(
+      catalog_mock, "examples", structured_arguments=True
+  )
+  tool_context_mock = MagicMock(spec=ToolContext)
+  tool_context_mock.actions = MagicMock(skip_summarization=False)
+  message = {"deleteSurface": {"surfaceId": "s"}}
+  catalog_mock.validator.validate.return_value = None
+  arg_name = SendA2uiToClientToolset._SendA2uiJsonToClientTool.A2UI_JSON_ARG_NAME
+
+  for a2ui_json in ([message], message):
+    result = await tool.run_async(
+        args={arg_name: a2ui_json}, tool_context=tool_context_mock
+    )
+    assert result == {
+        SendA2uiToClientToolset._SendA2uiJsonToClientTool.VALIDATED_A2UI_JSON_KEY: [
+            message
+        ]
+    }
+    catalog_mock.validator.validate.assert_called_with([message], level=VALIDATION_FULL)
+
+
 @pytest.mark.asyncio
 async def test_send_tool_resolve_catalog():
   catalog_mock = MagicMock(spec=A2uiCatalog)
@@ -190,6 +276,26 @@ async def test_send_tool_process_llm_request():
   assert "examples" in instructions
 
 
+@pytest.mark.asyncio
+async def test_send_tool_process_llm_request_schema_rendering():
+  catalog_mock = MagicMock(spec=A2uiCatalog)
+  catalog_mock.render_as_llm_instructions.return_value = "rendered_catalog"
+  toolset = SendA2uiToClientToolset(
+      a2ui_enabled=True,
+      a2ui_catalog=catalog_mock,
+      a2ui_examples="examples",
+      schema_rendering=SCHEMA_RENDERING_COMPACT,
+  )
+
+  await toolset._ui_tools[0].process_llm_request(
+      tool_context=MagicMock(spec=ToolContext), llm_request=MagicMock()
+  )
+
+  catalog_mock.render_as_llm_instructions.assert_called_once_with(
+      SCHEMA_RENDERING_COMPACT
+  )
+
+
 @pytest.mark.asyncio
 async def test_send_tool_run_async_valid():
   catalog_mock = MagicMock(spec=A2uiCatalog)
@@ -213,7 +319,9 @@ async def test_send_tool_run_async_valid():
       )
   }
   assert tool_context_mock.actions.skip_summarization == True
-  catalog_mock.validator.validate.assert_called_once_with(valid_a2ui)
+  catalog_mock.validator.validate.assert_called_once_with(
+      valid_a2ui, level=VALIDATION_FULL
+  )
 
 
 @pytest.mark.asyncio
@@ -239,7 +347,39 @@ async def test_send_tool_run_async_valid_list():
       )
   }
   assert tool_context_mock.actions.skip_summarization == True
-  catalog_mock.validator.validate.assert_called_once_with(valid_a2ui)
+  catalog_mock.validator.validate.assert_called_once_with(
+      valid_a2ui, level=VALIDATION_FULL
+  )
+
+
+@pytest.mark.asyncio
+async def test_send_tool_run_async_returns_provenance():
+  catalog_mock = MagicMock(spec=A2uiCatalog)
+  tool = SendA2uiToClientToolset._SendA2uiJsonToClientTool(
+      catalog_mock, "examples", validation_level=VALIDATION_SCHEMA
+  )
+  tool_context_mock = MagicMock(spec=ToolContext)
+  tool_context_mock.actions = MagicMock(skip_summarization=False)
+
+  valid_a2ui = [{"type": "Text", "text": "Hello"}]
+  provenance = ValidationProvenance(fingerprint="abc", level=VALIDATION_SCHEMA)
+  catalog_mock.validator.validate.return_value = provenance
+  args = {
+      SendA2uiToClientToolset._SendA2uiJsonToClientTool.A2UI_JSON_ARG_NAME: json.dumps(
+          valid_a2ui
+      )
+  }
+
+  result = await tool.run_async(args=args, tool_context=tool_context_mock)
+  assert (
+      result[
+          SendA2uiToClientToolset._SendA2uiJsonToClientTool.VALIDATION_PROVENANCE_KEY
+      ]
+      == provenance.to_dict()
+  )
+  catalog_mock.validator.validate.assert_called_once_with(
+      valid_a2ui, level=VALIDATION_SCHEMA
+  )
 
 
 @pytest.mark.asyncio
@@ -311,6 +451,67 @@ def test_converter_class_convert_valid_tool_response():
   a2a_parts = converter.convert(part)
   assert len(a2a_parts) == 1
   assert a2a_parts[0] == create_a2ui_part(valid_a2ui)
+  # Validated by the tool already.
+  catalog_mock.validator.validate.assert_not_called()
+
+
+def test_converter_class_passes_tool_response_provenance():
+  catalog_mock = MagicMock(spec=A2uiCatalog)
+  converter = A2uiPartConverter(
+      catalog_mock, validation_level=VALIDATION_SCHEMA, validate_tool_responses=True
+  )
+
+  valid_a2ui = {"type": "Text", "text": "Hello"}
+  provenance = ValidationProvenance(
+      fingerprint="abc", level=VALIDATION_FULL, digest="0" * 64
+  )
+  function_response = genai_types.FunctionResponse(
+      name=SendA2uiToClientToolset._SendA2uiJsonToClientTool.TOOL_NAME,
+      response={
+          SendA2uiToClientToolset._SendA2uiJsonToClientTool.VALIDATED_A2UI_JSON_KEY: [
+              valid_a2ui
+          ],
+          SendA2uiToClientToolset._SendA2uiJsonToClientTool.VALIDATION_PROVENANCE_KEY: (
+              provenance.to_dict()
+          ),
+      },
+  )
+  part = genai_types.Part(function_response=function_response)
+
+  a2a_parts = converter.convert(part)
+  assert a2a_parts == [create_a2ui_part(valid_a2ui)]
+  catalog_mock.validator.validate.assert_called_once_with(
+      [valid_a2ui], level=VALIDATION_SCHEMA, provenance=provenance
+  )
+
+
+def test_converter_class_drops_invalid_tool_response():
+  catalog_mock = MagicMock(spec=A2uiCatalog)
+  catalog_mock.validator.validate.side_effect = ValueError("Missing root component")
+  converter = A2uiPartConverter(catalog_mock, validate_tool_responses=True)
+
+  function_response = genai_types.FunctionResponse(
+      name=SendA2uiToClientToolset._SendA2uiJsonToClientTool.TOOL_NAME,
+      response={
+          SendA2uiToClientToolset._SendA2uiJsonToClientTool.VALIDATED_A2UI_JSON_KEY: [
+              {"type": "Text"}
+          ]
+      },
+  )
+  part = genai_types.Part(function_response=function_response)
+
+  assert converter.convert(part) == []
+
+
+def test_converter_class_text_validation_level():
+  catalog_mock = MagicMock(spec=A2uiCatalog)
+  converter = A2uiPartConverter(catalog_mock, validation_level=VALIDATION_NONE)
+
+  ui = [{"type": "Text", "text": "Hello"}]
+  part = genai_types.Part(text=f"{A2UI_OPEN_TAG}\n{json.dumps(ui)}\n{A2UI_CLOSE_TAG}")
+
+  assert converter.convert(part) == [create_a2ui_part(ui[0])]
+  catalog_mock.validator.validate.assert_called_once_with(ui, level=VALIDATION_NONE)
 
 
 def test_converter_class_convert_tool_error_response():
@@ -373,7 +574,9 @@ def test_converter_class_convert_text_with_a2ui():
   assert len(a2a_parts) == 2
   assert a2a_parts[0].root.text == "Here is the UI:"
   assert a2a_parts[1] == create_a2ui_part(valid_a2ui[0])
-  catalog_mock.validator.validate.assert_called_once_with(valid_a2ui)
+  catalog_mock.validator.validate.assert_called_once_with(
+      valid_a2ui, level=VALIDATION_FULL
+  )
 
 
 def test_converter_class_convert_text_empty_leading():
@@ -406,7 +609,7 @@ def test_converter_class_convert_text_markdown_wrapped():
   assert len(a2a_parts) == 2
   assert a2a_parts[0].root.text == "Behold:"
   assert a2a_parts[1] == create_a2ui_part(ui[0])
-  catalog_mock.validator.validate.assert_called_once_with(ui)
+  catalog_mock.validator.validate.assert_called_once_with(ui, level=VALIDATION_FULL)
 
 
 def test_converter_class_convert_text_with_invalid_a2ui():
@@ -0,0 +1,139 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from a2ui.core.parser.json_repair import (
+    REPAIR_COMMENT,
+    REPAIR_CONTROL_CHARACTER,
+    REPAIR_LEADING_TEXT,
+    REPAIR_MISSING_COMMA,
+    REPAIR_MULTIPLE_VALUES,
+    REPAIR_PYTHON_LITERAL,
+    REPAIR_SINGLE_QUOTES,
+    REPAIR_TRAILING_COMMA,
+    REPAIR_TRAILING_TEXT,
+    REPAIR_UNQUOTED_KEY,
+    Repair,
+    repair_json,
+)
+from a2ui.core.parser.payload_fixer import parse_and_fix, parse_and_repair
+
+
+@pytest.mark.parametrize(
+    "text, expected, kind",
+    [
+        ('[{"a": 1,},]', [{"a": 1}], REPAIR_TRAILING_COMMA),
+        ('[{"a": 1,,"b": 2}]', [{"a": 1, "b": 2}], REPAIR_TRAILING_COMMA),
+        ('[{"a": 1} {"b": 2}]', [{"a": 1}, {"b": 2}], REPAIR_MISSING_COMMA),
+        ('{"a": 1\n "b": 2}', {"a": 1, "b": 2}, REPAIR_MISSING_COMMA),
+        ("{'a': 'it\\'s \"x\"'}", {"a": 'it\'s "x"'}, REPAIR_SINGLE_QUOTES),
+        ("{a: 1, $b-c: {d_e: 2}}", {"a": 1, "$b-c": {"d_e": 2}}, REPAIR_UNQUOTED_KEY),
+        ("[1, // one\n 2 /* two, */]", [1, 2], REPAIR_COMMENT),
+        ('{"a": True, "b": None}', {"a": True, "b": None}, REPAIR_PYTHON_LITERAL),
+        ('{"a": "line\none\ttab"}', {"a": "line\none\ttab"}, REPAIR_CONTROL_CHARACTER),
+        ('Sure! {"a": 1}', {"a": 1}, REPAIR_LEADING_TEXT),
+        ('[{"a": 1}] Hope this helps!', [{"a": 1}], REPAIR_TRAILING_TEXT),
+        ('[{"a": 1}]]', [{"a": 1}], REPAIR_TRAILING_TEXT),
+        ('{"a": 1}\n{"b": 2}', [{"a": 1}, {"b": 2}], REPAIR_MULTIPLE_VALUES),
+        ('[{"a": 1}], [] {"b": 2}', [{"a": 1}, {"b": 2}], REPAIR_MULTIPLE_VALUES),
+    ],
+)
+def test_repairs(text, expected, kind):
+  repaired, report = repair_json(text)
+  assert json.loads(repaired) == expected
+  assert kind in report.counts
+
+
+def test_valid_json_is_unchanged():
+  text = '[{"a": [1, -2.5e3, true, null, "x, ]\\"/* y */"]}]'
+  repaired, report = repair_json(text)
+  assert repaired == text
+  assert not report
+
+
+def test_strings_are_not_repaired_inside():
+  text = "{'a': 'True, // not a comment,]', b: \"None\",}"
+  repaired, _ = repair_json(text)
+  assert json.loads(repaired) == {"a": "True, // not a comment,]", "b": "None"}
+
+
+def test_several_defects_in_one_pass():
+  text = """```
+  [
+    // The surface
+    {'createSurface': {surfaceId: 'main', sendDataModel: False,},}
+    {"deleteSurface": {"surfaceId": "old"}},
+  ]
+  Done."""
+  repaired, report = repair_json(text)
+  assert json.loads(repaired) == [
+      {"createSurface": {"surfaceId": "main", "sendDataModel": False}},
+      {"deleteSurface": {"surfaceId": "old"}},
+  ]
+  assert report.counts == {
+      REPAIR_LEADING_TEXT: 1,
+      REPAIR_COMMENT: 1,
+      REPAIR_SINGLE_QUOTES: 2,
+      REPAIR_UNQUOTED_KEY: 2,
+      REPAIR_PYTHON_LITERAL: 1,
+      REPAIR_TRAILING_COMMA: 3,
+      REPAIR_MISSING_COMMA: 1,
+      REPAIR_TRAILING_TEXT: 1,
+  }
+  assert report.repairs[0] == Repair(REPAIR_LEADING_TEXT, 0)
+
+
+def test_messages_after_the_first_are_kept():
+  first = {"createSurface": {"surfaceId": "s", "catalogId": "c"}}
+  second = {"deleteSurface": {"surfaceId": "s"}}
+  text = f"{json.dumps(first)}\n{json.dumps(second)}\nThat's all."
+
+  payload, report = parse_and_repair(text)
+  assert payload == [first, second]
+  assert report.counts == {REPAIR_MULTIPLE_VALUES: 1, REPAIR_TRAILING_TEXT: 1}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        'Here [is] the UI: [{"a": 1}]',
+        'Here [is] {the} UI:\n[{"a": 1,}]\nDone.',
+        'Here [is] [{"a": 1}]',
+    ],
+)
+def test_bracketed_text_before_the_json(text):
+  payload, report = parse_and_repair(text)
+  assert payload == [{"a": 1}]
+  assert report.repairs[0] == Repair(REPAIR_LEADING_TEXT, 0)
+
+
+def test_unrepairable_text_still_fails():
+  with pytest.raises(ValueError, match="Failed to parse JSON"):
+    parse_and_fix('[{"a": @}]')
+
+
+def test_parse_and_repair_reports_repairs(caplog):
+  payload, report = parse_and_repair("{'type': 'Text'}")
+  assert payload == [{"type": "Text"}]
+  assert report.repairs == [
+      Repair(REPAIR_SINGLE_QUOTES, 1),
+      Repair(REPAIR_SINGLE_QUOTES, 9),
+  ]
+  assert "Detected single-quoted strings in LLM output" in caplog.text
+
+  payload, report = parse_and_repair('{"type": "Text"}')
+  assert payload == [{"type": "Text"}]
+  assert not report
@@ -13,8 +13,8 @@
 # limitations under the License.
 
 import pytest
-from a2ui.core.parser.parser import parse_response, ResponsePart
-from a2ui.core.schema.constants import A2UI_OPEN_TAG, A2UI_CLOSE_TAG
+from a2ui.core.parser.parser import find_a2ui_blocks, parse_response, ResponsePart
+from a2ui.core.schema.constants import A2UI_OPEN_TAG, A2UI_CLOSE_TAG, OUTPUT_FORMAT_JSONL
 
 
 def test_parse_empty_response():
@@ -102,3 +102,54 @@ def test_parse_response_invalid_json():
   content = f"{A2UI_OPEN_TAG}\ninvalid_json\n{A2UI_CLOSE_TAG}"
   with pytest.raises(ValueError):
     parse_response(content)
+
+
+def test_parse_response_with_nested_markdown_blocks():
+  content = (
+      f"{A2UI_OPEN_TAG}\n```json\n````jsonc\n"
+      f'[{{"text": "```"}}]\n'
+      f"````\n```\n{A2UI_CLOSE_TAG}"
+  )
+  parts = parse_response(content)
+  assert parts[0].a2ui_json == [{"text": "```"}]
+
+
+def test_parse_response_ignores_unterminated_block():
+  content = f'{A2UI_OPEN_TAG}[{{"id": "1"}}]{A2UI_CLOSE_TAG} more {A2UI_OPEN_TAG}['
+  parts = parse_response(content)
+  assert parts[0].a2ui_json == [{"id": "1"}]
+  assert parts[1] == ResponsePart(text=f"more {A2UI_OPEN_TAG}[")
+
+  with pytest.raises(ValueError, match="not found in response"):
+    parse_response(f"{A2UI_OPEN_TAG}[")
+
+
+def test_find_a2ui_blocks_returns_offsets():
+  json_text = '[{"id": "1"}]'
+  first = f"{A2UI_OPEN_TAG}\n```json\n{json_text}\n```\n{A2UI_CLOSE_TAG}"
+  content = f"Hi {first} then {A2UI_OPEN_TAG} ```\n{json_text[:5]}"
+  spans = list(find_a2ui_blocks(content))
+
+  assert len(spans) == 2
+  assert spans[0].start == 3 and spans[0].end == 3 + len(first)
+  assert spans[0].terminated
+  assert spans[0].json_string(content) == json_text
+  assert not spans[1].terminated
+  assert spans[1].end == len(content)
+  assert spans[1].json_string(content) == json_text[:5]
+  assert list(find_a2ui_blocks("no blocks")) == []
+
+
+def test_parse_response_jsonl():
+  content = (
+      f'Text\n{A2UI_OPEN_TAG}\n```jsonl\n{{"id": "1"}}\n\n  {{"id": "2",}}\n```\n'
+      f"{A2UI_CLOSE_TAG}"
+  )
+  parts = parse_response(content, output_format=OUTPUT_FORMAT_JSONL)
+  assert parts == [ResponsePart(text="Text", a2ui_json=[{"id": "1"}, {"id": "2"}])]
+
+  with pytest.raises(ValueError, match="A2UI message 1 .* is invalid"):
+    parse_response(
+        f'{A2UI_OPEN_TAG}{{"id": "1"}}\n{{"id": @}}{A2UI_CLOSE_TAG}',
+        output_format=OUTPUT_FORMAT_JSONL,
+    )
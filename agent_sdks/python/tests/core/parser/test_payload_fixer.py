@@ -15,36 +15,11 @@
 import json
 import pytest
 from a2ui.core.parser.payload_fixer import (
-    _remove_trailing_commas,
     _parse,
     parse_and_fix,
 )
 
 
-def test_remove_trailing_commas(caplog):
-  """Tests that the fixer can handle and fix trailing commas in JSON lists and objects."""
-  # Malformed JSON with a trailing comma in the list
-  malformed_json_list = '[{"type": "Text", "text": "Hello"},]'
-  fixed_json_list = _remove_trailing_commas(malformed_json_list)
-  assert fixed_json_list == '[{"type": "Text", "text": "Hello"}]'
-
-  # Malformed JSON with a trailing comma in the object
-  malformed_json_obj = '{"type": "Text", "text": "Hello",}'
-  fixed_json_obj = _remove_trailing_commas(malformed_json_obj)
-  assert fixed_json_obj == '{"type": "Text", "text": "Hello"}'
-
-  # Assert that the warning was logged
-  assert "Detected trailing commas in LLM output; applied autofix." in caplog.text
-
-
-def test_remove_trailing_commas_no_change():
-  """Tests that the fixer does not modify valid JSON."""
-  valid_json = '[{"type": "Text", "text": "Hello"}]'
-  fixed_json = _remove_trailing_commas(valid_json)
-
-  assert fixed_json == valid_json
-
-
 def test_parse_payload_wrapping():
   """Tests that _parse auto-wraps single objects in a list."""
   obj_json = '{"type": "Text", "text": "Hello"}'
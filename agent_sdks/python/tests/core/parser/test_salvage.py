@@ -0,0 +1,223 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from a2ui.core.parser.parser import ResponsePart, parse_response
+from a2ui.core.parser.salvage import (
+    REASON_TRUNCATED,
+    DroppedMessage,
+    salvage_response,
+)
+from a2ui.core.schema.constants import (
+    A2UI_CLOSE_TAG,
+    A2UI_OPEN_TAG,
+    OUTPUT_FORMAT_JSONL,
+)
+
+MESSAGES = [
+    {"createSurface": {"surfaceId": "s", "catalogId": "c"}},
+    {
+        "updateComponents": {
+            "surfaceId": "s",
+            "components": [{"id": "root", "component": "Text", "text": 'a "]}\\'}],
+        }
+    },
+    {"deleteSurface": {"surfaceId": "old"}},
+]
+BODY = json.dumps(MESSAGES)
+RESPONSE = f"Here you go:\n{A2UI_OPEN_TAG}\n```json\n{BODY}\n```\n{A2UI_CLOSE_TAG}\nBye"
+
+
+def test_complete_response_matches_parse_response():
+  result = salvage_response(RESPONSE)
+  assert result.parts == parse_response(RESPONSE)
+  assert not result.truncated
+  assert result.dropped == []
+  assert result.continuation_offset is None
+
+
+def test_every_truncation_keeps_the_complete_messages():
+  for cut in range(1, len(BODY)):
+    content = f"Hi {A2UI_OPEN_TAG}```json\n{BODY[:cut]}"
+    result = salvage_response(content)
+
+    kept = [m for p in result.parts if p.a2ui_json for m in p.a2ui_json]
+    complete = [
+        m for m in MESSAGES if BODY.find(json.dumps(m)) + len(json.dumps(m)) <= cut
+    ]
+    assert result.truncated
+    assert kept == complete, cut
+    assert result.parts[0].text == "Hi"
+    assert [d.reason for d in result.dropped] in ([], [REASON_TRUNCATED])
+    assert content[: result.continuation_offset].endswith(("[", "}"))
+
+
+def test_truncated_message_is_closed_and_reported():
+  cut = BODY.index('"text"')
+  content = f"{A2UI_OPEN_TAG}{BODY[:cut]}"
+  result = salvage_response(content)
+
+  assert result.parts == [ResponsePart(text="", a2ui_json=MESSAGES[:1])]
+  (dropped,) = result.dropped
+  assert dropped.block == 0 and dropped.index == 1
+  assert dropped.text == BODY[BODY.index('{"updateComponents"') : cut]
+  assert dropped.partial == {
+      "updateComponents": {
+          "surfaceId": "s",
+          "components": [{"id": "root", "component": "Text"}],
+      }
+  }
+  # The response up to the offset ends right after the first message.
+  assert content[: result.continuation_offset].endswith(json.dumps(MESSAGES[0]))
+
+
+def test_truncated_inside_string_and_escape():
+  cut = BODY.index("\\\\") + 1  # Right after the first backslash of the escape.
+  result = salvage_response(f"{A2UI_OPEN_TAG}{BODY[:cut]}")
+  partial = result.dropped[0].partial
+  assert partial["updateComponents"]["components"][0]["text"] == 'a "]}'
+
+
+# The messages written with the defects `repair_json` fixes.
+REPAIRABLE_BODY = """[
+  {'createSurface': {'surfaceId': 's', 'catalogId': 'c'}},  // first ]
+  {'updateComponents': {'surfaceId': 's', 'components': [
+    {'id': 'root', 'component': 'Text', 'text': 'a "]}\\\\'}]}},
+  /* } */ {'deleteSurface': {'surfaceId': 'old'}}
+]"""
+
+
+def test_every_truncation_of_repairable_json_keeps_the_complete_messages():
+  for cut in range(1, len(REPAIRABLE_BODY) + 1):
+    result = salvage_response(f"{A2UI_OPEN_TAG}{REPAIRABLE_BODY[:cut]}")
+
+    kept = [m for p in result.parts if p.a2ui_json for m in p.a2ui_json]
+    assert kept == MESSAGES[: len(kept)], cut
+    assert [d.reason for d in result.dropped] in ([], [REASON_TRUNCATED]), cut
+  assert kept == MESSAGES
+
+
+def test_truncated_inside_single_quoted_string():
+  cut = REPAIRABLE_BODY.index('"]}') + 2
+  result = salvage_response(f"{A2UI_OPEN_TAG}{REPAIRABLE_BODY[:cut]}")
+
+  assert result.parts == [ResponsePart(text="", a2ui_json=MESSAGES[:1])]
+  (dropped,) = result.dropped
+  assert dropped.index == 1
+  assert dropped.partial["updateComponents"]["components"][0]["text"] == 'a "]'
+
+
+def test_truncated_inside_comment():
+  cut = REPAIRABLE_BODY.index("first ]") + len("first ]")
+  result = salvage_response(f"{A2UI_OPEN_TAG}{REPAIRABLE_BODY[:cut]}")
+
+  assert result.parts == [ResponsePart(text="", a2ui_json=MESSAGES[:1])]
+  assert result.dropped == []
+
+
+def test_truncated_single_object():
+  content = f'{A2UI_OPEN_TAG}{{"deleteSurface": {{"surfaceId": "o'
+  result = salvage_response(content)
+  assert result.parts == []
+  assert result.dropped == [
+      DroppedMessage(
+          0,
+          0,
+          REASON_TRUNCATED,
+          '{"deleteSurface": {"surfaceId": "o',
+          {"deleteSurface": {"surfaceId": "o"}},
+      )
+  ]
+
+
+def test_only_close_tag_missing():
+  result = salvage_response(f"{A2UI_OPEN_TAG}{BODY}\n```")
+  assert result.truncated
+  assert result.parts == [ResponsePart(text="", a2ui_json=MESSAGES)]
+  assert result.dropped == []
+
+
+def test_earlier_blocks_are_kept():
+  content = (
+      f"a{A2UI_OPEN_TAG}[{json.dumps(MESSAGES[2])}]{A2UI_CLOSE_TAG}b{A2UI_OPEN_TAG}["
+  )
+  result = salvage_response(content)
+  assert result.parts == [
+      ResponsePart(text="a", a2ui_json=[MESSAGES[2]]),
+      ResponsePart(text="b"),
+  ]
+  assert result.dropped == []
+  assert result.continuation_offset == len(content)
+
+
+def test_messages_are_validated_individually():
+  validator = MagicMock()
+
+  def validate(message, level):
+    if "deleteSurface" in message:
+      raise ValueError("bad surface")
+
+  validator.validate.side_effect = validate
+  cut = BODY.index('"surfaceId": "old"')
+  result = salvage_response(
+      f"{A2UI_OPEN_TAG}{BODY}{A2UI_CLOSE_TAG}{A2UI_OPEN_TAG}{BODY[:cut]}", validator
+  )
+
+  assert [p.a2ui_json for p in result.parts] == [MESSAGES[:2], MESSAGES[:2]]
+  assert [(d.block, d.index, d.reason) for d in result.dropped] == [
+      (0, 2, "bad surface"),
+      (1, 2, REASON_TRUNCATED),
+  ]
+  assert validator.validate.call_count == 5
+
+
+def test_malformed_complete_message_is_dropped():
+  content = f'{A2UI_OPEN_TAG}[{{"a": @}}, {json.dumps(MESSAGES[2])}, {{"b'
+  result = salvage_response(content)
+  assert result.parts == [ResponsePart(text="", a2ui_json=[MESSAGES[2]])]
+  assert [(d.index, d.reason[:20]) for d in result.dropped] == [
+      (0, "Failed to parse JSON"),
+      (2, REASON_TRUNCATED),
+  ]
+
+
+def test_no_block():
+  with pytest.raises(ValueError, match="not found in response"):
+    salvage_response("Only text.")
+
+
+def test_jsonl_lines_fail_independently():
+  lines = [json.dumps(m) for m in MESSAGES]
+  body = "\n".join([lines[0], '{"a": @}', lines[1], lines[2][:-5]])
+  content = f"{A2UI_OPEN_TAG}```jsonl\n{body}"
+  result = salvage_response(content, output_format=OUTPUT_FORMAT_JSONL)
+
+  assert result.truncated
+  assert result.parts == [ResponsePart(text="", a2ui_json=MESSAGES[:2])]
+  assert [(d.index, d.reason[:20]) for d in result.dropped] == [
+      (1, "Failed to parse JSON"),
+      (3, REASON_TRUNCATED),
+  ]
+  assert result.dropped[1].partial == {"deleteSurface": {"surfaceId": "o"}}
+  assert content[: result.continuation_offset].endswith(lines[1])
+
+  # A complete last line is kept.
+  result = salvage_response(
+      f"{A2UI_OPEN_TAG}{lines[2]}\n", output_format=OUTPUT_FORMAT_JSONL
+  )
+  assert result.parts == [ResponsePart(text="", a2ui_json=MESSAGES[2:])]
+  assert result.dropped == []
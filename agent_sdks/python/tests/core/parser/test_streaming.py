@@ -0,0 +1,260 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from a2ui.core.parser.parser import ResponsePart, parse_response
+from a2ui.core.parser.streaming import A2uiStreamParser, parse_stream
+from a2ui.core.schema.constants import A2UI_CLOSE_TAG, A2UI_OPEN_TAG
+
+MESSAGES = [
+    {"createSurface": {"surfaceId": "s", "catalogId": "c"}},
+    {
+        "updateComponents": {
+            "surfaceId": "s",
+            "components": [{"id": "root", "component": "Text", "text": 'a "]}<'}],
+        }
+    },
+]
+RESPONSE = (
+    f"Here is the UI:\n{A2UI_OPEN_TAG}\n```json\n{json.dumps(MESSAGES)}\n```\n"
+    f"{A2UI_CLOSE_TAG}\nAnything else?"
+)
+
+
+def chunked(text, size):
+  return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def collect(parts):
+  parts = list(parts)
+  texts = [p.text for p in parts if p.a2ui_json is None]
+  messages = [m for p in parts if p.a2ui_json is not None for m in p.a2ui_json]
+  return texts, messages
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 17, len(RESPONSE)])
+def test_stream_matches_parse_response(size):
+  texts, messages = collect(parse_stream(chunked(RESPONSE, size)))
+
+  batch = parse_response(RESPONSE)
+  assert "".join(texts) == "Here is the UI:Anything else?"
+  assert messages == batch[0].a2ui_json == MESSAGES
+
+
+def test_messages_are_emitted_as_soon_as_they_close():
+  parser = A2uiStreamParser()
+  first = json.dumps(MESSAGES[0])
+
+  assert parser.feed(f"Hi {A2UI_OPEN_TAG}[") == [ResponsePart(text="Hi")]
+  assert parser.feed(first[:-1]) == []
+  assert parser.feed(first[-1] + ",") == [
+      ResponsePart(text="", a2ui_json=[MESSAGES[0]])
+  ]
+  assert parser.feed(json.dumps(MESSAGES[1])) == [
+      ResponsePart(text="", a2ui_json=[MESSAGES[1]])
+  ]
+  assert parser.feed(f"]{A2UI_CLOSE_TAG}") == []
+  assert parser.close() == []
+
+
+def test_text_is_not_held_back_longer_than_needed():
+  parser = A2uiStreamParser()
+  assert parser.feed("Hello <a2") == [ResponsePart(text="Hello")]
+  assert parser.feed("b> world ") == [ResponsePart(text=" <a2b> world")]
+  assert parser.close() == []
+
+
+def test_single_object_block_and_fixups():
+  content = (
+      f'{A2UI_OPEN_TAG}{{"deleteSurface": {{"surfaceId": "s",}},}}{A2UI_CLOSE_TAG}'
+  )
+  assert list(parse_stream(chunked(content, 3))) == [
+      ResponsePart(text="", a2ui_json=[{"deleteSurface": {"surfaceId": "s"}}])
+  ]
+
+
+def test_multiple_blocks():
+  block = f"{A2UI_OPEN_TAG}[{json.dumps(MESSAGES[0])}]{A2UI_CLOSE_TAG}"
+  texts, messages = collect(parse_stream(chunked(f"a{block}b{block}c", 4)))
+  assert texts == ["a", "b", "c"]
+  assert messages == [MESSAGES[0], MESSAGES[0]]
+
+
+def test_parser_is_reusable_after_close():
+  parser = A2uiStreamParser()
+  parser.feed(f"first {A2UI_OPEN_TAG}")
+  with pytest.raises(ValueError, match="Unterminated A2UI block"):
+    parser.close()
+  assert parser.feed("second ") == [ResponsePart(text="second")]
+  assert parser.close() == []
+
+
+@pytest.mark.parametrize(
+    "content, error",
+    [
+        (f"{A2UI_OPEN_TAG}```json\n```{A2UI_CLOSE_TAG}", "A2UI JSON part is empty"),
+        (f"{A2UI_OPEN_TAG}[{{}}, 1]{A2UI_CLOSE_TAG}", "must be JSON objects"),
+        (f'{A2UI_OPEN_TAG}[{{"a": [{A2UI_CLOSE_TAG}', "closed before its JSON"),
+        (f"{A2UI_OPEN_TAG}[{{}}", "Unterminated A2UI block"),
+    ],
+)
+def test_malformed_blocks(content, error):
+  with pytest.raises(ValueError, match=error):
+    list(parse_stream(chunked(content, 2)))
+
+
+def test_buffer_is_bounded():
+  parser = A2uiStreamParser(max_buffer_size=64)
+  parser.feed(f"{A2UI_OPEN_TAG}[")
+  with pytest.raises(ValueError, match="buffer exceeded 64 characters"):
+    parser.feed('{"text": "' + "x" * 100)
+
+  # Long text is streamed through regardless of the bound.
+  parser = A2uiStreamParser(max_buffer_size=64)
+  assert parser.feed("x" * 100) == [ResponsePart(text="x" * 100)]
+
+
+def _update(components, **extra):
+  return {
+      "version": "v0.9",
+      "updateComponents": {"surfaceId": "s", "components": components, **extra},
+  }
+
+
+def test_stream_components_emits_batches():
+  components = [{"id": f"c{i}", "component": "Text", "text": "]}"} for i in range(3)]
+  text = json.dumps([MESSAGES[0], _update(components)])
+  first = text.index('{"id": "c1"')
+
+  parser = A2uiStreamParser(stream_components=True)
+  parts = parser.feed(f"{A2UI_OPEN_TAG}{text[:first]}")
+  assert parts == [
+      ResponsePart(text="", a2ui_json=[MESSAGES[0]]),
+      ResponsePart(text="", a2ui_json=[_update(components[:1])]),
+  ]
+  assert parser.feed(text[first:-3]) == [
+      ResponsePart(text="", a2ui_json=[_update(components[1:])])
+  ]
+  # Nothing is left to send when the message closes.
+  assert parser.feed(text[-3:] + A2UI_CLOSE_TAG) == []
+
+
+@pytest.mark.parametrize("size", [1, 7])
+def test_stream_components_delivers_every_component_once(size):
+  components = [{"id": f"c{i}", "component": "Text", "text": "x"} for i in range(5)]
+  text = json.dumps([_update(components, extra={"a": 1})])
+  parts = list(
+      parse_stream(
+          chunked(f"{A2UI_OPEN_TAG}{text}{A2UI_CLOSE_TAG}", size),
+          stream_components=True,
+      )
+  )
+
+  streamed = [
+      c for p in parts for m in p.a2ui_json for c in m["updateComponents"]["components"]
+  ]
+  assert streamed == components
+  # Keys after the component list come with the last message.
+  assert parts[-1].a2ui_json[0]["updateComponents"]["extra"] == {"a": 1}
+
+
+def test_stream_components_bounds_each_component_only():
+  components = [{"id": f"c{i}", "component": "Text", "text": "x"} for i in range(100)]
+  content = f"{A2UI_OPEN_TAG}{json.dumps([_update(components)])}{A2UI_CLOSE_TAG}"
+  assert len(content) > 4096
+
+  parts = list(
+      parse_stream(chunked(content, 10), max_buffer_size=256, stream_components=True)
+  )
+  streamed = [
+      c for p in parts for m in p.a2ui_json for c in m["updateComponents"]["components"]
+  ]
+  assert streamed == components
+
+  # Whole messages are still bounded.
+  with pytest.raises(ValueError, match="buffer exceeded 256 characters"):
+    list(parse_stream(chunked(content, 10), max_buffer_size=256))
+
+
+def test_stream_components_emits_each_component_as_it_closes():
+  components = [{"id": f"c{i}", "component": "Text", "text": "x"} for i in range(3)]
+  text = json.dumps([_update(components)])
+  ends = [text.index(json.dumps(c)) + len(json.dumps(c)) for c in components]
+
+  parser = A2uiStreamParser(stream_components=True)
+  start = 0
+  parts = []
+  for end in ends:
+    parts.append(parser.feed(A2UI_OPEN_TAG * (start == 0) + text[start:end]))
+    start = end
+  assert parts == [
+      [ResponsePart(text="", a2ui_json=[_update([c])])] for c in components
+  ]
+  assert parser.feed(text[start:] + A2UI_CLOSE_TAG) == []
+
+
+# Single-quoted strings and comments, which `parse_and_fix` repairs, holding
+# brackets that must not end a message.
+REPAIRABLE_RESPONSE = A2UI_OPEN_TAG + """[
+  // The surface comes first: {"not": "a message"}]
+  {'createSurface': {'surfaceId': 's', 'catalogId': 'c'}},
+  /* then its components ]} */
+  {"updateComponents": {'surfaceId': 's', components: [
+    {"id": "root", "component": "Text", "text": 'It\\'s ]} "done"'}, // one ]
+    {"id": "more", "component": "Text", "text": "/* not a comment */"}
+  ]}}
+]""" + A2UI_CLOSE_TAG
+
+
+@pytest.mark.parametrize("size", [1, 3, len(REPAIRABLE_RESPONSE)])
+@pytest.mark.parametrize("stream_components", [False, True])
+def test_stream_reads_strings_and_comments_like_the_repairer(size, stream_components):
+  texts, messages = collect(
+      parse_stream(
+          chunked(REPAIRABLE_RESPONSE, size), stream_components=stream_components
+      )
+  )
+
+  expected = parse_response(REPAIRABLE_RESPONSE)[0].a2ui_json
+  assert texts == []
+  assert messages[0] == expected[0]
+  streamed = [c for m in messages[1:] for c in m["updateComponents"]["components"]]
+  assert streamed == expected[1]["updateComponents"]["components"]
+  assert streamed[0]["text"] == 'It\'s ]} "done"'
+
+
+def test_close_tag_ends_a_comment():
+  content = f"{A2UI_OPEN_TAG}[{{}} // no end {A2UI_CLOSE_TAG}"
+  with pytest.raises(ValueError, match="closed before its JSON"):
+    list(parse_stream(chunked(content, 2)))
+
+
+def test_stream_components_needs_the_surface_first():
+  message = {"updateComponents": {"components": [{"id": "root"}], "surfaceId": "s"}}
+  content = f"{A2UI_OPEN_TAG}{json.dumps(message)}{A2UI_CLOSE_TAG}"
+  assert list(parse_stream(chunked(content, 1), stream_components=True)) == [
+      ResponsePart(text="", a2ui_json=[message])
+  ]
+
+
+def test_jsonl_block_emits_each_line():
+  lines = "\n".join(json.dumps(m) for m in MESSAGES)
+  parser = A2uiStreamParser()
+  assert parser.feed(f"{A2UI_OPEN_TAG}\n```jsonl\n{lines}\n") == [
+      ResponsePart(text="", a2ui_json=[m]) for m in MESSAGES
+  ]
+  assert parser.feed(f"```\n{A2UI_CLOSE_TAG}") == []
+  assert parser.close() == []
@@ -0,0 +1,104 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+
+from a2ui.basic_catalog.provider import BasicCatalog
+from a2ui.core.schema import bulk
+from a2ui.core.schema.bulk import ValidationResult, validate_many
+from a2ui.core.schema.constants import VERSION_0_9
+from a2ui.core.schema.manager import A2uiSchemaManager
+
+
+@pytest.fixture(scope="module")
+def catalog():
+  manager = A2uiSchemaManager(
+      VERSION_0_9, catalogs=[BasicCatalog.get_config(VERSION_0_9)]
+  )
+  return manager.get_selected_catalog()
+
+
+def _payload(text):
+  return [{
+      "version": "v0.9",
+      "updateComponents": {
+          "surfaceId": "s",
+          "components": [{"id": "root", "component": "Text", "text": text}],
+      },
+  }]
+
+
+def _corpus(size):
+  payloads = []
+  for i in range(size):
+    if i % 3 == 0:
+      payloads.append(_payload(i))  # 'text' must not be a number.
+    elif i % 3 == 1:
+      payloads.append(json.dumps(_payload(str(i))))
+    else:
+      payloads.append("{not json")
+  return payloads
+
+
+def test_validate_many_in_process(catalog):
+  results = list(validate_many(catalog, _corpus(3)))
+
+  assert [(r.index, r.valid) for r in results] == [(0, False), (1, True), (2, False)]
+  assert results[0].error.startswith("Validation failed")
+  assert results[1] == ValidationResult(index=1, valid=True)
+  assert results[2].error.startswith("Expecting property name")
+
+
+def test_validate_many_in_worker_processes(catalog):
+  corpus = _corpus(50)
+  expected = list(validate_many(catalog, corpus))
+
+  results = list(
+      validate_many(
+          catalog, iter(corpus), workers=2, chunk_size=4, parallel_threshold=8
+      )
+  )
+  assert results == expected
+
+
+def test_small_inputs_are_validated_in_process(catalog, monkeypatch):
+  def no_pool(*args, **kwargs):
+    raise AssertionError("started a process pool")
+
+  monkeypatch.setattr(bulk, "ProcessPoolExecutor", no_pool)
+  corpus = _corpus(6)
+  results = list(validate_many(catalog, iter(corpus), workers=4, parallel_threshold=8))
+  assert results == list(validate_many(catalog, corpus))
+
+
+def test_unexpected_errors_fail_the_payload_only(catalog, monkeypatch):
+  validate = catalog.validator.validate
+
+  def flaky_validate(payload, *args, **kwargs):
+    if payload == "boom":
+      raise RecursionError("maximum recursion depth exceeded")
+    return validate(payload, *args, **kwargs)
+
+  monkeypatch.setattr(catalog.validator, "validate", flaky_validate)
+  results = list(validate_many(catalog, [_payload("a"), '"boom"', _payload("b")]))
+
+  assert [r.valid for r in results] == [True, False, True]
+  assert results[1].error == "RecursionError: maximum recursion depth exceeded"
+
+
+def test_validate_many_rejects_invalid_arguments(catalog):
+  with pytest.raises(ValueError, match="workers must be positive"):
+    list(validate_many(catalog, [], workers=0))
@@ -0,0 +1,110 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import pytest
+from a2ui.core.schema.cache import CacheStats, LruCache
+
+
+def test_get_or_create_counts_hits_and_misses():
+  cache = LruCache(maxsize=2)
+  calls = []
+
+  def factory():
+    calls.append(1)
+    return "value"
+
+  assert cache.get_or_create("a", factory) == "value"
+  assert cache.get_or_create("a", factory) == "value"
+  assert len(calls) == 1
+  assert cache.stats == CacheStats(hits=1, misses=1, evictions=0, size=1, maxsize=2)
+
+
+def test_least_recently_used_entry_is_evicted():
+  cache = LruCache(maxsize=2)
+  cache.put("a", 1)
+  cache.put("b", 2)
+  assert cache.get("a") == 1  # "b" is now the least recently used entry.
+  cache.put("c", 3)
+
+  assert "a" in cache
+  assert "b" not in cache
+  assert "c" in cache
+  assert cache.stats.evictions == 1
+
+
+def test_pop_removes_entry():
+  cache = LruCache(maxsize=2)
+  cache.put("a", 1)
+  assert cache.pop("a") == 1
+  assert cache.pop("a") is None
+  assert "a" not in cache
+
+
+def test_resize_evicts_and_clear_resets():
+  cache = LruCache(maxsize=3)
+  for key in "abc":
+    cache.put(key, key)
+  cache.resize(1)
+  assert len(cache) == 1
+  assert "c" in cache
+
+  cache.clear()
+  assert cache.stats == CacheStats(hits=0, misses=0, evictions=0, size=0, maxsize=1)
+
+
+def test_invalid_maxsize_raises():
+  with pytest.raises(ValueError, match="maxsize must be positive"):
+    LruCache(maxsize=0)
+
+
+def test_concurrent_get_or_create_returns_single_value():
+  cache = LruCache(maxsize=4)
+  barrier = threading.Barrier(8)
+  results = []
+
+  def factory():
+    return object()
+
+  def worker():
+    barrier.wait()
+    results.append(cache.get_or_create("key", factory))
+
+  threads = [threading.Thread(target=worker) for _ in range(8)]
+  for t in threads:
+    t.start()
+  for t in threads:
+    t.join()
+
+  assert len({id(r) for r in results}) == 1
+  assert len(cache) == 1
+
+
+def test_entries_expire_after_ttl():
+  now = [0.0]
+  cache = LruCache(maxsize=2, ttl=10, clock=lambda: now[0])
+  cache.put("a", 1)
+  now[0] = 9.5
+  assert cache.get("a") == 1
+
+  now[0] = 10.0
+  assert "a" not in cache
+  assert cache.get("a") is None
+  assert cache.stats == CacheStats(
+      hits=1, misses=1, evictions=0, size=0, maxsize=2, expirations=1
+  )
+
+  with pytest.raises(ValueError, match="ttl must be positive"):
+    LruCache(ttl=0)
@@ -17,7 +17,13 @@ import os
 import pytest
 from typing import Any, Dict, List
 from a2ui.core.schema.catalog import A2uiCatalog
-from a2ui.core.schema.constants import VERSION_0_8, VERSION_0_9
+from a2ui.core.schema.constants import (
+    OUTPUT_FORMAT_JSONL,
+    SCHEMA_RENDERING_BRIEF,
+    SCHEMA_RENDERING_COMPACT,
+    VERSION_0_8,
+    VERSION_0_9,
+)
 from a2ui.basic_catalog.constants import BASIC_CATALOG_NAME
 
 
@@ -74,6 +80,30 @@ def test_load_examples(tmp_path):
   assert "ignored" not in examples_str
 
 
+def test_load_examples_as_jsonl(tmp_path):
+  example_dir = tmp_path / "examples"
+  example_dir.mkdir()
+  (example_dir / "example1.json").write_text(
+      '[\n  {"beginRendering": {"surfaceId": "id"}},\n  {"deleteSurface": {}}\n]'
+  )
+  catalog = A2uiCatalog(
+      version=VERSION_0_8,
+      name=BASIC_CATALOG_NAME,
+      s2c_schema={},
+      common_types_schema={},
+      catalog_schema={},
+  )
+
+  examples_str = catalog.load_examples(
+      str(example_dir), output_format=OUTPUT_FORMAT_JSONL
+  )
+  assert examples_str == (
+      "---BEGIN example1---\n"
+      '{"beginRendering":{"surfaceId":"id"}}\n{"deleteSurface":{}}\n'
+      "---END example1---"
+  )
+
+
 def test_load_examples_none_or_invalid_path():
   catalog = A2uiCatalog(
       version=VERSION_0_8,
@@ -142,6 +172,81 @@ def test_with_pruned_components():
   assert catalog.with_pruned_components([]) is catalog
 
 
+def _make_catalog_with_defs(name: str = BASIC_CATALOG_NAME) -> A2uiCatalog:
+  return A2uiCatalog(
+      version=VERSION_0_9,
+      name=name,
+      s2c_schema={"items": {"$ref": "catalog.json#/$defs/theme"}},
+      common_types_schema={},
+      catalog_schema={
+          "catalogId": "id_custom",
+          "components": {
+              "Text": {"$ref": "#/$defs/Common"},
+              "Chart": {
+                  "allOf": [{"$ref": "#/$defs/Common"}, {"$ref": "#/$defs/Series"}]
+              },
+          },
+          "$defs": {
+              "Common": {"type": "object"},
+              "Series": {"items": {"$ref": "#/$defs/Point"}},
+              "Point": {"type": "number"},
+              "theme": {"$ref": "#/$defs/Point"},
+              "Unused": {"type": "string"},
+              "anyComponent": {
+                  "oneOf": [
+                      {"$ref": "#/components/Text"},
+                      {"$ref": "#/components/Chart"},
+                  ]
+              },
+          },
+      },
+  )
+
+
+def test_with_pruned_components_drops_unneeded_definitions():
+  catalog = _make_catalog_with_defs()
+  original = json.dumps(catalog.catalog_schema)
+  pruned = catalog.with_pruned_components(["Text", "Unknown"])
+
+  # Series is needed only by Chart. Point is also needed by the theme, which
+  # the server-to-client schema references, and nothing needs Unused.
+  assert set(pruned.catalog_schema["$defs"]) == {
+      "Common",
+      "Point",
+      "theme",
+      "Unused",
+      "anyComponent",
+  }
+  assert pruned.catalog_schema["$defs"]["anyComponent"]["oneOf"] == [
+      {"$ref": "#/components/Text"}
+  ]
+  # Unchanged sub-schemas are shared, and the original is left as it was.
+  schema = catalog.catalog_schema
+  assert pruned.catalog_schema["components"]["Text"] is schema["components"]["Text"]
+  assert pruned.catalog_schema["$defs"]["Common"] is schema["$defs"]["Common"]
+  assert json.dumps(catalog.catalog_schema) == original
+
+
+def test_with_pruned_components_is_memoized():
+  from a2ui.core.schema.catalog import get_pruned_catalog_cache
+
+  cache = get_pruned_catalog_cache()
+  cache.clear()
+
+  catalog = _make_catalog_with_defs()
+  pruned = catalog.with_pruned_components(["Text"])
+  assert catalog.with_pruned_components(["Text", "Text"]) is pruned
+  assert _make_catalog_with_defs().with_pruned_components(["Text"]) is pruned
+  assert cache.stats.misses == 1
+  assert cache.stats.hits == 2
+
+  # The name is not part of the fingerprint but is kept by pruning.
+  other = _make_catalog_with_defs(name="other").with_pruned_components(["Text"])
+  assert other.name == "other"
+  # Allowing every component prunes nothing.
+  assert catalog.with_pruned_components(["Chart", "Text"]) is catalog
+
+
 def test_render_as_llm_instructions():
   catalog = A2uiCatalog(
       version=VERSION_0_9,
@@ -163,3 +268,85 @@ def test_render_as_llm_instructions():
   assert '"catalog": "schema"' in schema_str
   assert '"catalogId": "id_basic"' in schema_str
   assert "---END A2UI JSON SCHEMA---" in schema_str
+
+
+def _make_validatable_catalog(name: str = BASIC_CATALOG_NAME) -> A2uiCatalog:
+  return A2uiCatalog(
+      version=VERSION_0_9,
+      name=name,
+      s2c_schema={"type": "object"},
+      common_types_schema={},
+      catalog_schema={
+          "catalogId": "id_basic",
+          "components": {"Text": {"type": "object"}, "Button": {"type": "object"}},
+      },
+  )
+
+
+def test_fingerprint_depends_on_content_only():
+  catalog = _make_validatable_catalog()
+  same_content = _make_validatable_catalog(name="other")
+  assert catalog.fingerprint == same_content.fingerprint
+
+  pruned = _make_validatable_catalog().with_pruned_components(["Text"])
+  assert pruned.fingerprint != catalog.fingerprint
+
+
+def test_validator_is_shared_across_equivalent_catalogs():
+  from a2ui.core.schema.validator import get_validator_cache
+
+  cache = get_validator_cache()
+  cache.clear()
+
+  first = _make_validatable_catalog().validator
+  second = _make_validatable_catalog(name="other").validator
+
+  assert first is second
+  assert cache.stats.misses == 1
+  assert cache.stats.hits == 1
+
+
+def test_instructions_are_shared_across_equivalent_catalogs():
+  from a2ui.core.schema.catalog import get_instructions_cache
+
+  cache = get_instructions_cache()
+  cache.clear()
+
+  first = _make_validatable_catalog().render_as_llm_instructions()
+  second = _make_validatable_catalog(name="other").render_as_llm_instructions()
+
+  assert first is second
+  assert cache.stats.misses == 1
+  assert cache.stats.hits == 1
+
+
+def test_render_as_llm_instructions_compact():
+  catalog = A2uiCatalog(
+      version=VERSION_0_9,
+      name=BASIC_CATALOG_NAME,
+      s2c_schema={"$schema": "s2c", "title": "Messages", "type": "object"},
+      common_types_schema={
+          "$id": "https://a2ui.org/common_types.json",
+          "$defs": {"Id": {"type": "string"}},
+      },
+      catalog_schema={
+          "catalogId": "id_basic",
+          "components": {"Text": {"$ref": "#/$defs/Id", "description": "A. B."}},
+          "$defs": {"Id": {"type": "string"}},
+      },
+  )
+
+  compact = catalog.render_as_llm_instructions(SCHEMA_RENDERING_COMPACT)
+  assert '### Server To Client Schema:\n{"type":"object"}' in compact
+  assert '### Common Types Schema:\n{"$defs":{"Id":{"type":"string"}}}' in compact
+  assert (
+      '### Catalog Schema:\n{"catalogId":"id_basic","components":{"Text":'
+      '{"$ref":"common_types.json#/$defs/Id","description":"A. B."}}}'
+  ) in compact
+  assert compact.endswith("---END A2UI JSON SCHEMA---")
+
+  brief = catalog.render_as_llm_instructions(SCHEMA_RENDERING_BRIEF)
+  assert '"description":"A."' in brief
+
+  with pytest.raises(ValueError, match="Unknown schema rendering 'tiny'"):
+    catalog.render_as_llm_instructions("tiny")
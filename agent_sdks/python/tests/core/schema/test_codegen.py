@@ -0,0 +1,334 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import glob
+import json
+import os
+
+import pytest
+from jsonschema import Draft202012Validator
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT7, DRAFT202012
+
+from a2ui.basic_catalog.provider import BasicCatalog
+from a2ui.core.schema.catalog import A2uiCatalog
+from a2ui.core.schema import codegen
+from a2ui.core.schema.codegen import (
+    CACHE_DIR_ENV,
+    compile_validator_source,
+    generate_validator_source,
+    load_compiled_validator,
+    source_key,
+)
+from a2ui.core.schema.constants import SPECIFICATION_DIR, VERSION_0_9
+from a2ui.core.schema.manager import A2uiSchemaManager
+from a2ui.core.schema.utils import find_repo_root
+from a2ui.core.schema.validator import A2uiValidator
+
+_REPO_ROOT = find_repo_root(os.path.dirname(os.path.abspath(__file__)))
+_SPEC_DIR = os.path.join(_REPO_ROOT or "", SPECIFICATION_DIR, "v0_9")
+_SPEC_BASE_URI = "https://a2ui.org/specification/v0_9/"
+
+requires_spec = pytest.mark.skipif(
+    not os.path.isdir(_SPEC_DIR), reason="specification directory not available"
+)
+
+
+def _load_spec_schemas():
+  schemas = {}
+  for path in glob.glob(os.path.join(_SPEC_DIR, "json", "*.json")):
+    with open(path, "r", encoding="utf-8") as f:
+      schemas[os.path.basename(path)] = json.load(f)
+  # The spec test runner validates against the basic catalog.
+  schemas["catalog.json"] = schemas["basic_catalog.json"]
+  return schemas
+
+
+def _spec_registry(schemas):
+  resources = []
+  for name, schema in schemas.items():
+    resource = Resource.from_contents(schema, default_specification=DRAFT202012)
+    resources.append((_SPEC_BASE_URI + name, resource))
+    if schema.get("$id") and schema["$id"] != _SPEC_BASE_URI + name:
+      resources.append((schema["$id"], resource))
+  return Registry().with_resources(resources)
+
+
+def _spec_cases():
+  cases = []
+  for path in sorted(glob.glob(os.path.join(_SPEC_DIR, "test", "cases", "*.json"))):
+    with open(path, "r", encoding="utf-8") as f:
+      suite = json.load(f)
+    for test in suite["tests"]:
+      cases.append((suite["schema"], test["description"], test["data"], test["valid"]))
+  for path in sorted(glob.glob(os.path.join(_SPEC_DIR, "test", "cases", "*.jsonl"))):
+    with open(path, "r", encoding="utf-8") as f:
+      for number, line in enumerate(f):
+        if line.strip():
+          cases.append(
+              ("server_to_client.json", f"line {number}", json.loads(line), True)
+          )
+  return cases
+
+
+def _mutations(value, limit):
+  """Yields up to `limit` copies of `value` with one nested value changed."""
+  replacements = ["x", 0, 1.5, True, None, [], {}, {"path": "/a"}, ["a"]]
+
+  def walk(node, path):
+    if isinstance(node, dict):
+      items = list(node.items())
+    elif isinstance(node, list):
+      items = list(enumerate(node))
+    else:
+      return
+    for key, child in items:
+      yield path + [key]
+      yield from walk(child, path + [key])
+
+  paths = list(walk(value, []))
+  step = max(1, len(paths) // limit)
+  for count, path in enumerate(paths[::step][:limit]):
+    mutated = copy.deepcopy(value)
+    parent = mutated
+    for key in path[:-1]:
+      parent = parent[key]
+    if count % (len(replacements) + 1) == 0:
+      del parent[path[-1]]
+    else:
+      parent[path[-1]] = replacements[count % (len(replacements) + 1) - 1]
+    yield mutated
+
+
+@pytest.fixture(autouse=True)
+def validator_cache_dir(tmp_path, monkeypatch):
+  monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+
+
+@pytest.fixture(scope="module")
+def spec_schemas():
+  return _load_spec_schemas()
+
+
+@pytest.fixture(scope="module")
+def compiled_spec_validators(spec_schemas):
+  registry = _spec_registry(spec_schemas)
+  validators = {}
+  for name in ("server_to_client.json", "client_to_server.json"):
+    schema = spec_schemas[name]
+    source = generate_validator_source(schema, registry)
+    validators[name] = (
+        Draft202012Validator(schema, registry=registry),
+        compile_validator_source(source),
+    )
+  return validators
+
+
+@requires_spec
+@pytest.mark.parametrize(
+    "schema_name, description, data, valid",
+    _spec_cases() if os.path.isdir(_SPEC_DIR) else [],
+    ids=lambda v: v if isinstance(v, str) else "",
+)
+def test_spec_cases_match_jsonschema(
+    compiled_spec_validators, schema_name, description, data, valid
+):
+  # Without a format checker, jsonschema ignores `format` and so may accept
+  # cases the spec expects to fail; the compiled validator must agree with it.
+  reference, compiled = compiled_spec_validators[schema_name]
+  assert compiled(data) is reference.is_valid(data)
+
+
+@requires_spec
+def test_mutated_spec_cases_match_jsonschema(compiled_spec_validators):
+  reference, compiled = compiled_spec_validators["server_to_client.json"]
+  checked = 0
+  for schema_name, _, data, valid in _spec_cases():
+    if schema_name != "server_to_client.json" or not valid:
+      continue
+    for mutated in _mutations(data, limit=4):
+      assert compiled(mutated) is reference.is_valid(mutated), mutated
+      checked += 1
+  assert checked > 50
+
+
+@requires_spec
+def test_basic_catalog_examples_match_jsonschema():
+  manager = A2uiSchemaManager(
+      VERSION_0_9, catalogs=[BasicCatalog.get_config(VERSION_0_9)]
+  )
+  catalog = manager.get_selected_catalog()
+  interpreted = A2uiValidator(catalog, compiled=False)._validator
+  compiled = A2uiValidator(catalog, compiled=True)._compiled
+
+  examples_dir = os.path.join(_SPEC_DIR, "json", "catalogs", "basic", "examples")
+  example_paths = sorted(glob.glob(os.path.join(examples_dir, "*.json")))
+  assert example_paths
+  for path in example_paths:
+    with open(path, "r", encoding="utf-8") as f:
+      messages = json.load(f)["messages"]
+    assert interpreted.is_valid(messages), path
+    assert compiled(messages) is True, path
+
+
+def _make_catalog(compiled_validation=False):
+  s2c_schema = {
+      "$id": "https://a2ui.org/specification/v0_9/server_to_client.json",
+      "type": "object",
+      "properties": {
+          "updateComponents": {
+              "type": "object",
+              "properties": {
+                  "surfaceId": {"type": "string"},
+                  "components": {
+                      "type": "array",
+                      "items": {"$ref": "catalog.json#/$defs/anyComponent"},
+                  },
+              },
+              "required": ["surfaceId", "components"],
+          }
+      },
+      "additionalProperties": False,
+  }
+  catalog_schema = {
+      "catalogId": "test_catalog",
+      "components": {
+          "Text": {
+              "type": "object",
+              "properties": {
+                  "id": {"type": "string"},
+                  "component": {"const": "Text"},
+                  "text": {"type": "string"},
+              },
+              "required": ["id", "component", "text"],
+              "unevaluatedProperties": False,
+          },
+      },
+      "$defs": {"anyComponent": {"oneOf": [{"$ref": "#/components/Text"}]}},
+  }
+  return A2uiCatalog(
+      version=VERSION_0_9,
+      name="test",
+      s2c_schema=s2c_schema,
+      common_types_schema={},
+      catalog_schema=catalog_schema,
+      compiled_validation=compiled_validation,
+  )
+
+
+def test_compiled_validator_reports_the_same_errors():
+  payload = {
+      "updateComponents": {
+          "surfaceId": "s",
+          "components": [{"id": "root", "component": "Text", "text": 1}],
+      }
+  }
+  errors = []
+  for compiled in (False, True):
+    validator = A2uiValidator(_make_catalog(), compiled=compiled)
+    assert validator.is_compiled is compiled
+    with pytest.raises(ValueError, match="Validation failed") as e:
+      validator.validate(payload)
+    errors.append(str(e.value))
+  assert errors[0] == errors[1]
+
+
+def test_catalog_opts_into_compiled_validation():
+  assert not _make_catalog().validator.is_compiled
+  validator = _make_catalog(compiled_validation=True).validator
+  assert validator.is_compiled
+  validator.validate({
+      "updateComponents": {
+          "surfaceId": "s",
+          "components": [{"id": "root", "component": "Text", "text": "hi"}],
+      }
+  })
+
+
+def test_unsupported_keywords_defer_to_jsonschema():
+  schema = {
+      "type": "array",
+      "prefixItems": [{"type": "string"}],
+      "unevaluatedItems": False,
+  }
+  compiled = compile_validator_source(generate_validator_source(schema, Registry()))
+  assert compiled(["a"]) is None
+  assert compiled(["a", "b"]) is None
+
+
+def test_other_dialects_defer_to_jsonschema():
+  draft_7 = {"$schema": "http://json-schema.org/draft-07/schema#", "type": "object"}
+  registry = Registry().with_resource("urn:draft-7", DRAFT7.create_resource(draft_7))
+  compiled = compile_validator_source(
+      generate_validator_source({"$ref": "urn:draft-7"}, registry)
+  )
+  assert compiled({}) is None
+
+
+def test_compiled_validators_are_cached_on_disk(tmp_path):
+  schema = {"type": "object", "required": ["a"]}
+  compiled = load_compiled_validator(schema, Registry(), cache_dir=str(tmp_path))
+  assert compiled({"a": 1}) is True
+  assert compiled({}) is False
+
+  cached = tmp_path / f"{source_key(schema, Registry())}.py"
+  assert cached.exists()
+  header = cached.read_text().splitlines()[0]
+
+  # The cached module is used as is for the same schema.
+  cached.write_text(f"{header}\ndef validate(instance):\n  return 'cached'\n")
+  reloaded = load_compiled_validator(schema, Registry(), cache_dir=str(tmp_path))
+  assert reloaded({}) == "cached"
+
+  # A schema built differently gets its own module.
+  changed = load_compiled_validator({}, Registry(), cache_dir=str(tmp_path))
+  assert changed({}) is True
+  assert len(list(tmp_path.glob("*.py"))) == 2
+
+  # Files that do not carry the expected header are regenerated.
+  cached.write_text("validate = None\n")
+  regenerated = load_compiled_validator(schema, Registry(), cache_dir=str(tmp_path))
+  assert regenerated({}) is False
+  assert cached.read_text().startswith("# A2UI compiled validator")
+
+
+def test_cache_key_covers_the_package_version(monkeypatch):
+  schema = {"type": "object"}
+  key = source_key(schema, Registry())
+  assert source_key({"type": "object"}, Registry()) == key
+  assert source_key({"type": "array"}, Registry()) != key
+  monkeypatch.setattr(codegen, "_PACKAGE_VERSION", "0.0.0-other")
+  assert source_key(schema, Registry()) != key
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+@pytest.mark.parametrize("target", ["file", "directory"])
+def test_cached_modules_writable_by_others_are_not_loaded(tmp_path, target):
+  schema = {"type": "object", "required": ["a"]}
+  load_compiled_validator(schema, Registry(), cache_dir=str(tmp_path))
+  cached = tmp_path / f"{source_key(schema, Registry())}.py"
+  header = cached.read_text().splitlines()[0]
+  cached.write_text(f"{header}\ndef validate(instance):\n  return 'injected'\n")
+  (cached if target == "file" else tmp_path).chmod(0o777)
+
+  compiled = load_compiled_validator(schema, Registry(), cache_dir=str(tmp_path))
+  assert compiled({}) is False
+  if target == "file":
+    # Replaced by a private copy.
+    assert "injected" not in cached.read_text()
+    assert not cached.stat().st_mode & 0o022
+  else:
+    # Not written to, since it would be ignored.
+    assert "injected" in cached.read_text()
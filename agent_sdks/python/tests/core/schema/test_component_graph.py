@@ -0,0 +1,123 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from a2ui.core.schema.component_graph import ComponentGraph
+from a2ui.core.schema.component_refs import ComponentRefFields, ComponentRefIndex
+
+
+@pytest.fixture
+def ref_index():
+  return ComponentRefIndex(
+      fields={
+          "Text": ComponentRefFields(),
+          "Card": ComponentRefFields(single=frozenset({"child"})),
+          "Column": ComponentRefFields(lists=frozenset({"children"})),
+      }
+  )
+
+
+def _messages(graph, root_id="root"):
+  return [error.message for error in graph.iter_errors(root_id)]
+
+
+def test_valid_graph_has_no_errors(ref_index):
+  components = [
+      {"id": "root", "component": "Column", "children": ["a", "b"]},
+      {"id": "a", "component": "Card", "child": "c"},
+      {"id": "b", "component": "Text"},
+      {"id": "c", "component": "Text"},
+  ]
+  graph = ComponentGraph.build(components, ref_index)
+  assert graph.positions == {"root": 0, "a": 1, "b": 2, "c": 3}
+  assert graph.edges["root"] == [("a", "children"), ("b", "children")]
+  assert _messages(graph) == []
+
+
+def test_reports_every_problem_with_positions(ref_index):
+  components = [
+      {"id": "root", "component": "Column", "children": ["a", "missing"]},
+      {"id": "a", "component": "Card", "child": "a"},
+      {"id": "a", "component": "Text"},
+      {"id": "orphan", "component": "Text"},
+  ]
+  errors = list(ComponentGraph.build(components, ref_index).iter_errors("root"))
+
+  assert [(e.message, e.component_index) for e in errors] == [
+      ("Duplicate component ID: a", 2),
+      (
+          (
+              "Component 'root' references non-existent component 'missing' in field"
+              " 'children'"
+          ),
+          0,
+      ),
+      (
+          "Self-reference detected: Component 'a' references itself in field 'child'",
+          1,
+      ),
+      ("Component 'orphan' is not reachable from 'root'", 3),
+  ]
+
+
+def test_cycle_is_reported_once(ref_index):
+  components = [
+      {"id": "root", "component": "Card", "child": "a"},
+      {"id": "a", "component": "Card", "child": "b"},
+      {"id": "b", "component": "Card", "child": "a"},
+  ]
+  graph = ComponentGraph.build(components, ref_index)
+  assert _messages(graph) == ["Circular reference detected involving component 'a'"]
+
+
+def test_incremental_update_skips_root_checks(ref_index):
+  components = [
+      {"id": "a", "component": "Card", "child": "already-on-client"},
+      {"id": "b", "component": "Card", "child": "c"},
+      {"id": "c", "component": "Card", "child": "b"},
+  ]
+  graph = ComponentGraph.build(components, ref_index)
+  assert _messages(graph, root_id=None) == [
+      "Circular reference detected involving component 'b'"
+  ]
+
+
+def test_deep_chain_does_not_recurse(ref_index):
+  depth = 5000
+  ids = ["root"] + [f"c{i}" for i in range(1, depth + 1)]
+  components = [
+      {"id": comp_id, "component": "Card", "child": child_id}
+      for comp_id, child_id in zip(ids, ids[1:])
+  ]
+  components.append({"id": ids[-1], "component": "Text"})
+
+  messages = _messages(ComponentGraph.build(components, ref_index))
+  # The depth limit is reported once and every component is still reachable.
+  assert messages == ["Global recursion limit exceeded: logical depth > 50"]
+
+
+def test_wide_surface(ref_index):
+  count = 5000
+  components = [{
+      "id": "root",
+      "component": "Column",
+      "children": [f"card{i}" for i in range(count)],
+  }]
+  for i in range(count):
+    components.append({"id": f"card{i}", "component": "Card", "child": f"text{i}"})
+    components.append({"id": f"text{i}", "component": "Text"})
+
+  graph = ComponentGraph.build(components, ref_index)
+  assert len(graph.positions) == 2 * count + 1
+  assert _messages(graph) == []
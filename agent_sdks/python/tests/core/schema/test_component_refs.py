@@ -0,0 +1,154 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import patch
+
+import pytest
+from a2ui.core.schema.catalog import A2uiCatalog
+from a2ui.core.schema.component_refs import ComponentRefFields, ComponentRefIndex
+from a2ui.core.schema.constants import VERSION_0_8, VERSION_0_9
+
+
+@pytest.fixture
+def catalog():
+  return A2uiCatalog(
+      version=VERSION_0_9,
+      name="test",
+      s2c_schema={},
+      common_types_schema={},
+      catalog_schema={
+          "catalogId": "test",
+          "components": {
+              "Text": {"properties": {"text": {"type": "string"}}},
+              "Card": {
+                  "allOf": [{
+                      "properties": {
+                          "child": {"$ref": "common_types.json#/$defs/ComponentId"}
+                      }
+                  }]
+              },
+              "Column": {
+                  "properties": {
+                      "children": {"$ref": "common_types.json#/$defs/ChildList"}
+                  }
+              },
+              "Tabs": {
+                  "properties": {
+                      "tabs": {
+                          "type": "array",
+                          "items": {
+                              "type": "object",
+                              "properties": {
+                                  "title": {"type": "string"},
+                                  "child": {
+                                      "$ref": "common_types.json#/$defs/ComponentId"
+                                  },
+                              },
+                          },
+                      }
+                  }
+              },
+          },
+      },
+  )
+
+
+def test_index_classifies_reference_fields(catalog):
+  index = ComponentRefIndex.from_catalog(catalog)
+
+  assert index.fields_for("Text") == ComponentRefFields()
+  assert index.fields_for("Card") == ComponentRefFields(single=frozenset({"child"}))
+  assert index.fields_for("Column") == ComponentRefFields(lists=frozenset({"children"}))
+  # Nested `child` items are found in the payload, not the schema.
+  assert index.fields_for("Tabs") == ComponentRefFields()
+
+
+def test_references_cover_all_field_kinds(catalog):
+  index = catalog.component_ref_index
+
+  assert list(index.references({"id": "c", "component": "Card", "child": "a"})) == [
+      ("a", "child")
+  ]
+  assert list(
+      index.references({"id": "col", "component": "Column", "children": ["a", "b"]})
+  ) == [("a", "children"), ("b", "children")]
+  assert list(
+      index.references({
+          "id": "col",
+          "component": "Column",
+          "children": {"componentId": "tpl", "path": "/items"},
+      })
+  ) == [("tpl", "children.componentId")]
+  assert list(
+      index.references({
+          "id": "tabs",
+          "component": "Tabs",
+          "tabs": [{"title": "A", "child": "a"}, {"title": "B", "child": "b"}],
+      })
+  ) == [("a", "tabs[0].child"), ("b", "tabs[1].child")]
+
+
+def test_references_v08_structured_component():
+  catalog = A2uiCatalog(
+      version=VERSION_0_8,
+      name="test",
+      s2c_schema={},
+      common_types_schema={},
+      catalog_schema={
+          "components": {
+              "Column": {
+                  "properties": {
+                      "children": {
+                          "type": "object",
+                          "properties": {"explicitList": {"type": "array"}},
+                      }
+                  }
+              }
+          }
+      },
+  )
+  component = {
+      "id": "col",
+      "component": {"Column": {"children": {"explicitList": ["a", "b"]}}},
+  }
+  assert list(catalog.component_ref_index.references(component)) == [
+      ("a", "children.explicitList"),
+      ("b", "children.explicitList"),
+  ]
+
+
+def test_undeclared_component_scans_nested_children(catalog):
+  component = {"id": "x", "component": "Custom", "items": [{"child": "a"}]}
+  assert list(catalog.component_ref_index.references(component)) == [
+      ("a", "items[0].child")
+  ]
+
+
+def test_declared_component_scans_undeclared_nested_arrays(catalog):
+  # As before the index: arrays of `child` items are references whatever the
+  # schema of the component declares.
+  component = {"id": "t", "component": "Text", "text": "hi", "extra": [{"child": "a"}]}
+  assert list(catalog.component_ref_index.references(component)) == [
+      ("a", "extra[0].child")
+  ]
+
+
+def test_index_is_built_once_per_catalog(catalog):
+  with patch.object(
+      ComponentRefIndex, "from_catalog", wraps=ComponentRefIndex.from_catalog
+  ) as from_catalog:
+    first = catalog.component_ref_index
+    second = catalog.component_ref_index
+  assert first is second
+  from_catalog.assert_called_once()
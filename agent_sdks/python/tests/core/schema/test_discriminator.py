@@ -0,0 +1,223 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+
+import pytest
+from jsonschema import Draft202012Validator
+from referencing import Registry
+from referencing.jsonschema import DRAFT202012
+
+from a2ui.basic_catalog.provider import BasicCatalog
+from a2ui.core.schema.constants import VERSION_0_9
+from a2ui.core.schema.discriminator import (
+    build_dispatch,
+    create_discriminating_validator_class,
+)
+from a2ui.core.schema.manager import A2uiSchemaManager
+from a2ui.core.schema.validator import A2uiValidator, _schema_resource
+
+COMPONENT_UNION = {
+    "$defs": {
+        "Text": {
+            "type": "object",
+            "allOf": [{"$ref": "#/$defs/Common"}],
+            "properties": {
+                "component": {"const": "Text"},
+                "text": {"type": "string"},
+            },
+            "required": ["component", "text"],
+        },
+        "Image": {
+            "type": "object",
+            "allOf": [{"$ref": "#/$defs/Common"}],
+            "properties": {
+                "component": {"const": "Image"},
+                "url": {"type": "string"},
+            },
+            "required": ["component", "url"],
+        },
+        "Common": {"properties": {"id": {"type": "string"}}, "required": ["id"]},
+    },
+    "oneOf": [{"$ref": "#/$defs/Text"}, {"$ref": "#/$defs/Image"}],
+    "discriminator": {"propertyName": "component"},
+}
+
+MESSAGE_UNION = {
+    "oneOf": [
+        {
+            "properties": {"version": {"const": "v0.9"}, "create": {"type": "object"}},
+            "required": ["version", "create"],
+        },
+        {
+            "properties": {"version": {"const": "v0.9"}, "delete": {"type": "object"}},
+            "required": ["version", "delete"],
+        },
+    ],
+}
+
+
+def _resolver(schema):
+  return Registry().resolver_with_root(DRAFT202012.create_resource(schema))
+
+
+def test_dispatch_by_discriminator_value():
+  dispatch = build_dispatch(
+      COMPONENT_UNION["oneOf"], COMPONENT_UNION, _resolver(COMPONENT_UNION)
+  )
+
+  assert dispatch.property_name == "component"
+  assert dispatch.by_value == {"Text": 0, "Image": 1}
+  assert dispatch.select({"component": "Image"}) == 1
+  assert dispatch.select({"component": "Video"}) is None
+  assert dispatch.tag({"component": "Video"}) == "Video"
+  assert dispatch.select({"id": "x"}) is None
+
+
+def test_dispatch_by_unique_required_key():
+  dispatch = build_dispatch(
+      MESSAGE_UNION["oneOf"], MESSAGE_UNION, _resolver(MESSAGE_UNION)
+  )
+
+  assert dispatch.property_name is None
+  assert dispatch.by_key == {"create": 0, "delete": 1}
+  assert dispatch.select({"version": "v0.9", "delete": {}}) == 1
+  # Ambiguous or untagged instances are left to plain oneOf.
+  assert dispatch.select({"create": {}, "delete": {}}) is None
+  assert dispatch.select({"version": "v0.9"}) is None
+
+
+def test_untagged_unions_are_not_dispatched():
+  duplicate_tags = copy.deepcopy(COMPONENT_UNION)
+  duplicate_tags["$defs"]["Image"]["properties"]["component"]["const"] = "Text"
+  assert (
+      build_dispatch(duplicate_tags["oneOf"], duplicate_tags, _resolver(duplicate_tags))
+      is None
+  )
+
+  scalars = {"oneOf": [{"type": "string"}, {"type": "number"}]}
+  assert build_dispatch(scalars["oneOf"], scalars, _resolver(scalars)) is None
+
+
+def test_errors_come_from_the_selected_branch():
+  validator = create_discriminating_validator_class()(COMPONENT_UNION)
+
+  errors = list(validator.iter_errors({"id": "a", "component": "Image"}))
+  assert [e.message for e in errors] == ["'url' is a required property"]
+
+  errors = list(validator.iter_errors({"id": "a", "component": "Video"}))
+  assert [e.message for e in errors] == [
+      "'Video' is not a valid 'component', expected one of: Image, Text"
+  ]
+  assert list(errors[0].path) == ["component"]
+
+  # Without a tag every branch is tried, as with plain oneOf.
+  errors = list(validator.iter_errors({"id": "a"}))
+  assert "is not valid under any of the given schemas" in errors[0].message
+
+
+def test_dispatch_depends_on_the_base_uri():
+  # The same branches resolve to different components under each $id.
+  branches = [{"$ref": "#/$defs/First"}, {"$ref": "#/$defs/Second"}]
+
+  def union(uri, first, second):
+    return {
+        "$id": uri,
+        "$defs": {
+            "First": {"properties": {"component": {"const": first}}},
+            "Second": {"properties": {"component": {"const": second}}},
+        },
+        "oneOf": branches,
+        "discriminator": {"propertyName": "component"},
+    }
+
+  schema = {
+      "prefixItems": [
+          union("urn:text", "Text", "Image"),
+          union("urn:layout", "Row", "Column"),
+      ]
+  }
+  validator = create_discriminating_validator_class()(schema)
+
+  assert validator.is_valid([{"component": "Text"}, {"component": "Row"}])
+  assert not validator.is_valid([{"component": "Text"}, {"component": "Image"}])
+
+
+def test_schema_resources_keep_their_declared_dialect():
+  draft_2020 = {
+      "$schema": "https://json-schema.org/draft/2020-12/schema",
+      "type": "object",
+  }
+  # Dropped so that dispatch is not bypassed.
+  assert _schema_resource(draft_2020).contents == {"type": "object"}
+
+  # In Draft 7, keywords next to `$ref` are ignored.
+  draft_7 = {
+      "$schema": "http://json-schema.org/draft-07/schema#",
+      "definitions": {"name": {"type": "string"}},
+      "properties": {"name": {"$ref": "#/definitions/name", "maxLength": 1}},
+  }
+  registry = Registry().with_resource("urn:draft-7", _schema_resource(draft_7))
+  validator = create_discriminating_validator_class()(
+      {"$ref": "urn:draft-7"}, registry=registry
+  )
+  assert validator.is_valid({"name": "long"})
+  assert not validator.is_valid({"name": 1})
+
+
+@pytest.fixture(scope="module")
+def basic_catalog():
+  manager = A2uiSchemaManager(
+      VERSION_0_9, catalogs=[BasicCatalog.get_config(VERSION_0_9)]
+  )
+  return manager.get_selected_catalog()
+
+
+def _update_components(*components):
+  return [{
+      "version": "v0.9",
+      "updateComponents": {"surfaceId": "s", "components": list(components)},
+  }]
+
+
+def test_basic_catalog_reports_precise_component_errors(basic_catalog):
+  validator = A2uiValidator(basic_catalog)
+
+  with pytest.raises(ValueError) as e:
+    validator.validate(_update_components({"id": "root", "component": "Button"}))
+  assert str(e.value) == "Validation failed: 'child' is a required property"
+
+  with pytest.raises(ValueError, match="'Carousel' is not a valid 'component'"):
+    validator.validate(_update_components({"id": "root", "component": "Carousel"}))
+
+
+def test_basic_catalog_accepts_and_rejects_like_plain_one_of(basic_catalog):
+  validator = A2uiValidator(basic_catalog)
+  schema, registry = validator._build_schema()
+  plain = Draft202012Validator(schema, registry=registry)
+
+  text = {"id": "root", "component": "Text", "text": "hi"}
+  payloads = [
+      _update_components(text),
+      _update_components(dict(text, text=1)),
+      _update_components(dict(text, component="Image")),
+      _update_components(dict(text, component="Carousel")),
+      _update_components(dict(text, extra=True)),
+      _update_components({"id": "root", "component": 1}),
+      [{"version": "v0.9", "deleteSurface": {"surfaceId": "s"}}],
+      [{"version": "v0.9", "deleteSurface": {"surfaceId": "s"}, "createSurface": {}}],
+      [{"version": "v0.9"}],
+  ]
+  for payload in payloads:
+    assert validator._validator.is_valid(payload) == plain.is_valid(payload), payload
@@ -0,0 +1,125 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from a2ui.basic_catalog import BasicCatalog
+from a2ui.core.schema.constants import VERSION_0_8, VERSION_0_9
+from a2ui.core.schema.function_schema import DEFS, REF, build_function_schema
+from a2ui.core.schema.manager import A2uiSchemaManager
+from google.genai import types as genai_types
+
+_JSON_SCHEMA_ONLY = ("$ref", "$defs", "oneOf", "allOf", "const", "additionalProperties")
+
+MESSAGES_V09 = [
+    {
+        "version": "v0.9",
+        "createSurface": {"surfaceId": "s", "catalogId": "c"},
+    },
+    {
+        "version": "v0.9",
+        "updateComponents": {
+            "surfaceId": "s",
+            "components": [
+                {"id": "root", "component": "Column", "children": ["title", "ok"]},
+                {"id": "title", "component": "Text", "text": {"path": "/title"}},
+                {"id": "label", "component": "Text", "text": "OK"},
+                {
+                    "id": "ok",
+                    "component": "Button",
+                    "child": "label",
+                    "action": {"event": {"name": "submit"}},
+                },
+            ],
+        },
+    },
+]
+
+
+def _catalog(version):
+  manager = A2uiSchemaManager(version, catalogs=[BasicCatalog.get_config(version)])
+  return manager.get_selected_catalog()
+
+
+def _conforms(value, schema, defs):
+  """Whether `value` matches a function-declaration schema."""
+  if REF in schema:
+    target = defs[schema[REF].rpartition("/")[2]]
+    return _conforms(
+        value, {**target, **{k: v for k, v in schema.items() if k != REF}}, defs
+    )
+  if "anyOf" in schema and not any(_conforms(value, s, defs) for s in schema["anyOf"]):
+    return False
+  kind = schema.get("type")
+  if kind == "OBJECT":
+    if not isinstance(value, dict):
+      return False
+    properties = schema.get("properties", {})
+    return all(name in value for name in schema.get("required", [])) and all(
+        _conforms(item, properties.get(name, {}), defs) for name, item in value.items()
+    )
+  if kind == "ARRAY":
+    return isinstance(value, list) and all(
+        _conforms(item, schema.get("items", {}), defs) for item in value
+    )
+  if kind == "STRING":
+    return isinstance(value, str) and value in schema.get("enum", [value])
+  if kind in ("NUMBER", "INTEGER"):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+  if kind == "BOOLEAN":
+    return isinstance(value, bool)
+  return True
+
+
+@pytest.mark.parametrize("version", [VERSION_0_8, VERSION_0_9])
+def test_schema_is_a_valid_genai_schema(version):
+  schema = build_function_schema(_catalog(version))
+
+  assert schema["type"] == "ARRAY"
+  genai_types.Schema.model_validate(schema)
+  text = json.dumps(schema)
+  for keyword in _JSON_SCHEMA_ONLY:
+    assert f'"{keyword}"' not in text
+  # Every reference names a definition.
+  defs = schema.get(DEFS, {})
+  for name in text.split(f'"{REF}": "#/{DEFS}/')[1:]:
+    assert name.partition('"')[0] in defs
+
+
+def test_shared_definitions_are_written_once():
+  schema = build_function_schema(_catalog(VERSION_0_9))
+  defs = schema[DEFS]
+
+  assert {"Text", "Button", "DynamicString", "FunctionCall"} <= set(defs)
+  assert defs["Text"]["properties"]["component"] == {"type": "STRING", "enum": ["Text"]}
+  assert defs["Text"]["properties"]["text"][REF] == f"#/{DEFS}/DynamicString"
+  # Function calls take dynamic values as arguments, which may be function calls.
+  assert len(json.dumps(schema)) < 100_000
+
+
+def test_valid_messages_conform():
+  schema = build_function_schema(_catalog(VERSION_0_9))
+  defs = schema[DEFS]
+
+  assert _conforms(MESSAGES_V09, schema, defs)
+  wrong_component = json.loads(json.dumps(MESSAGES_V09))
+  wrong_component[1]["updateComponents"]["components"][1]["component"] = "Txt"
+  assert not _conforms(wrong_component, schema, defs)
+
+
+def test_catalog_caches_the_schema():
+  catalog = _catalog(VERSION_0_9)
+  assert catalog.function_schema is catalog.function_schema
+  assert catalog.function_schema == build_function_schema(catalog)
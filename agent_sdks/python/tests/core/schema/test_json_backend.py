@@ -0,0 +1,116 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from a2ui.basic_catalog.provider import BasicCatalog
+from a2ui.core.schema import json_backend
+from a2ui.core.schema.constants import VERSION_0_8, VERSION_0_9
+from a2ui.core.schema.manager import A2uiSchemaManager
+
+BACKENDS = [
+    name
+    for name in (
+        json_backend.BACKEND_ORJSON,
+        json_backend.BACKEND_MSGSPEC,
+        json_backend.BACKEND_STDLIB,
+    )
+    if json_backend._AVAILABLE[name]
+]
+
+VALUES = [
+    {},
+    [],
+    {"a": [1, -2, {"b": {}}, []], "c": None, "d": True, "e": False},
+    {"z": 1, "a": {"y": 2, "b": 3}},
+    'café — \U0001f600 \x7f \x00\x1f\n\t"\\/',
+    {"é": "key"},
+    [0.1, 2.0, -0.0, 1e15, 1e16, 1e-4, 1e-05, 1.5e300, 5e-324],
+    {"text": "v1e2 0.00001 3e"},
+    2**70,
+    {1: "int key"},
+    ("tuple", 1),
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+  json_backend.set_backend(request.param)
+  yield request.param
+  json_backend.set_backend()
+
+
+@pytest.mark.parametrize("value", VALUES)
+@pytest.mark.parametrize("sort_keys", [False, True])
+def test_dumps_matches_json(backend, value, sort_keys):
+  assert json_backend.dumps(value, sort_keys=sort_keys) == json.dumps(
+      value, separators=(",", ":"), sort_keys=sort_keys
+  )
+  for indent in (2, 4):
+    assert json_backend.dumps(value, indent=indent, sort_keys=sort_keys) == (
+        json.dumps(value, indent=indent, sort_keys=sort_keys)
+    )
+
+
+@pytest.mark.parametrize("value", VALUES[:9])
+def test_loads_matches_json(backend, value):
+  text = json.dumps(value)
+  assert json_backend.loads(text) == json.loads(text)
+  assert json_backend.loads(text.encode("utf-8")) == json.loads(text)
+
+
+def test_loads_accepts_and_rejects_like_json(backend):
+  assert json_backend.loads("[NaN, 1]")[1] == 1
+  with pytest.raises(json.JSONDecodeError) as error:
+    json_backend.loads("{invalid")
+  with pytest.raises(json.JSONDecodeError) as expected:
+    json.loads("{invalid")
+  assert str(error.value) == str(expected.value)
+
+
+def test_dumps_rejects_like_json(backend):
+  with pytest.raises(TypeError):
+    json_backend.dumps({"a": object()})
+
+
+@pytest.mark.parametrize("version", [VERSION_0_8, VERSION_0_9])
+def test_prompt_rendering_is_backend_independent(version):
+  catalog = A2uiSchemaManager(
+      version, catalogs=[BasicCatalog.get_config(version)]
+  ).get_selected_catalog()
+  schemas = [catalog.s2c_schema, catalog.common_types_schema, catalog.catalog_schema]
+
+  for backend in BACKENDS:
+    json_backend.set_backend(backend)
+    try:
+      for schema in schemas:
+        assert json_backend.dumps(schema, indent=2) == json.dumps(schema, indent=2)
+    finally:
+      json_backend.set_backend()
+
+
+def test_set_backend_rejects_unknown_library():
+  with pytest.raises(ValueError, match="JSON backend 'yaml' is not available"):
+    json_backend.set_backend("yaml")
+
+
+def test_backend_env_var(monkeypatch):
+  monkeypatch.setenv(json_backend.BACKEND_ENV, json_backend.BACKEND_STDLIB)
+  json_backend.set_backend()
+  try:
+    assert json_backend.get_backend() == json_backend.BACKEND_STDLIB
+  finally:
+    monkeypatch.delenv(json_backend.BACKEND_ENV)
+    json_backend.set_backend()
@@ -0,0 +1,198 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from a2ui.basic_catalog import BasicCatalog
+from a2ui.core.schema.catalog import (
+    get_instructions_cache,
+    get_pruned_catalog_cache,
+)
+from a2ui.core.schema.constants import (
+    SCHEMA_RENDERING_COMPACT,
+    SCHEMA_RENDERING_FULL,
+    SCHEMA_RENDERING_SIGNATURES,
+    SCHEMA_RENDERINGS,
+    VERSION_0_9,
+)
+from a2ui.core.schema.manager import A2uiSchemaManager
+from a2ui.core.schema.prompt_budget import (
+    SECTION_EXAMPLES,
+    SECTION_INSTRUCTIONS,
+    SECTION_SCHEMA,
+)
+from a2ui.core.schema.rendering import estimate_tokens
+
+
+def _example(*components, text="Hello"):
+  return json.dumps([{
+      "version": "v0.9",
+      "updateComponents": {
+          "surfaceId": "s",
+          "components": [
+              {"id": f"c{i}", "component": name, "text": text}
+              for i, name in enumerate(components)
+          ],
+      },
+  }])
+
+
+@pytest.fixture
+def manager(tmp_path):
+  (tmp_path / "flight_booking.json").write_text(
+      _example("Column", "Text", text="Book your flight to Paris")
+  )
+  (tmp_path / "restaurant_list.json").write_text(
+      _example("List", "Text", text="Restaurants nearby")
+  )
+  return A2uiSchemaManager(
+      VERSION_0_9,
+      catalogs=[BasicCatalog.get_config(VERSION_0_9, examples_path=str(tmp_path))],
+  )
+
+
+def _assemble(manager, max_prompt_tokens=None, **kwargs):
+  return manager.assemble_system_prompt(
+      "You help travelers.",
+      ui_description="Show flight options.",
+      include_schema=True,
+      include_examples=True,
+      max_prompt_tokens=max_prompt_tokens,
+      **kwargs,
+  )
+
+
+def test_without_budget_everything_is_included(manager):
+  assembly = _assemble(manager)
+
+  assert assembly.prompt == manager.generate_system_prompt(
+      "You help travelers.",
+      ui_description="Show flight options.",
+      include_schema=True,
+      include_examples=True,
+  )
+  assert assembly.schema_rendering == SCHEMA_RENDERING_FULL
+  assert assembly.examples == ("flight_booking", "restaurant_list")
+  assert not assembly.dropped_components and not assembly.dropped_examples
+  assert assembly.tokens == estimate_tokens(assembly.prompt)
+  assert set(assembly.section_tokens) == {
+      SECTION_INSTRUCTIONS,
+      SECTION_SCHEMA,
+      SECTION_EXAMPLES,
+  }
+
+
+def test_budget_selects_a_more_compact_rendering(manager):
+  full = _assemble(manager)
+  assembly = _assemble(manager, max_prompt_tokens=full.tokens - 1)
+
+  assert assembly.schema_rendering == SCHEMA_RENDERING_COMPACT
+  assert assembly.tokens <= full.tokens - 1
+  assert assembly.examples == full.examples
+  assert assembly.components == full.components
+  assert "---BEGIN A2UI JSON SCHEMA---" in assembly.prompt
+
+
+def test_budget_prunes_components_by_priority(manager):
+  allowed = ["Text", "Row", "Button", "Image", "Column", "List"]
+  signatures = _assemble(
+      manager,
+      allowed_components=allowed,
+      schema_rendering=SCHEMA_RENDERING_SIGNATURES,
+  )
+  budget = signatures.tokens - signatures.section_tokens[SECTION_EXAMPLES] - 2
+  assembly = _assemble(manager, budget, allowed_components=allowed)
+
+  assert assembly.tokens <= budget
+  assert assembly.schema_rendering == SCHEMA_RENDERING_SIGNATURES
+  assert assembly.dropped_components
+  assert assembly.components + assembly.dropped_components == tuple(allowed)
+  for name in assembly.dropped_components:
+    assert f"type {name} =" not in assembly.prompt
+  # Examples using a pruned component are left out.
+  assert "List" in assembly.dropped_components
+  assert "restaurant_list" in assembly.dropped_examples
+  assert "Restaurants nearby" not in assembly.prompt
+  if "Column" in assembly.dropped_components:
+    assert "flight_booking" in assembly.dropped_examples
+
+
+def test_budget_caches_only_the_chosen_components(manager):
+  allowed = ["Text", "Row", "Button", "Image", "Column", "List"]
+  signatures = _assemble(
+      manager,
+      allowed_components=allowed,
+      schema_rendering=SCHEMA_RENDERING_SIGNATURES,
+  )
+  budget = signatures.tokens - signatures.section_tokens[SECTION_EXAMPLES] - 300
+  get_pruned_catalog_cache().clear()
+  get_instructions_cache().clear()
+
+  assembly = _assemble(manager, budget, allowed_components=allowed)
+
+  assert 1 < len(assembly.components) < len(allowed) - 1
+  # The allowed components and the ones kept, not those tried in between.
+  assert len(get_pruned_catalog_cache()) == 2
+  # Each rendering of the allowed components, then the kept ones.
+  assert len(get_instructions_cache()) == len(SCHEMA_RENDERINGS) + 1
+
+
+def test_budget_keeps_the_most_relevant_examples(manager):
+  # The most compact rendering does not leave room for both examples.
+  signatures = _assemble(manager, schema_rendering=SCHEMA_RENDERING_SIGNATURES)
+  budget = signatures.tokens - 10
+  assembly = _assemble(manager, budget, schema_rendering=SCHEMA_RENDERING_SIGNATURES)
+
+  assert assembly.tokens <= budget
+  assert assembly.schema_rendering == SCHEMA_RENDERING_SIGNATURES
+  assert assembly.examples == ("flight_booking",)
+  assert assembly.dropped_examples == ("restaurant_list",)
+  assert "Restaurants nearby" not in assembly.prompt
+
+
+def test_budget_is_part_of_the_cache_key(manager):
+  full = _assemble(manager)
+  assert _assemble(manager) is full
+  smaller = _assemble(manager, max_prompt_tokens=full.tokens - 1)
+  assert smaller is not full
+  assert _assemble(manager, max_prompt_tokens=full.tokens - 1) is smaller
+
+
+def test_budget_too_small(manager):
+  with pytest.raises(ValueError, match="instructions take about"):
+    _assemble(manager, max_prompt_tokens=5)
+  with pytest.raises(ValueError, match="even with a single component"):
+    _assemble(manager, max_prompt_tokens=500)
+  with pytest.raises(ValueError, match="must be positive"):
+    _assemble(manager, max_prompt_tokens=0)
+
+  # Without the schema, only examples are left out.
+  assembly = manager.assemble_system_prompt(
+      "You help travelers.", include_examples=True, max_prompt_tokens=500
+  )
+  assert assembly.schema_rendering is None
+  assert assembly.examples == ("flight_booking", "restaurant_list")
+
+
+def test_schema_first_keeps_the_same_sections(manager):
+  assembly = _assemble(manager)
+  first = _assemble(manager, schema_first=True)
+
+  assert first.prompt.startswith("---BEGIN A2UI JSON SCHEMA---")
+  assert first.prompt.endswith("Show flight options.")
+  assert first.section_tokens == assembly.section_tokens
+
+  budget = assembly.tokens - 1
+  assert _assemble(manager, budget, schema_first=True).tokens <= budget
@@ -0,0 +1,123 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import json
+
+from a2ui.core.schema.rendering import (
+    PromptSize,
+    compact_schema,
+    estimate_tokens,
+    first_sentence,
+    measure_prompt,
+)
+
+COMMON_TYPES = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "$id": "https://a2ui.org/common_types.json",
+    "$defs": {"ComponentId": {"type": "string", "description": "An id."}},
+}
+
+CATALOG = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "$id": "https://a2ui.org/catalog.json",
+    "title": "My Catalog",
+    "$comment": "Generated.",
+    "catalogId": "my_catalog",
+    "components": {
+        "Card": {
+            "type": "object",
+            "title": "Card component",
+            "description": "A card, e.g. a product. It has a title.",
+            "properties": {
+                "title": {"type": "string", "title": "Title"},
+                "child": {"$ref": "#/$defs/ComponentId"},
+                "theme": {"$ref": "#/$defs/theme"},
+            },
+        }
+    },
+    "$defs": {
+        "ComponentId": {"type": "string", "description": "An id."},
+        "theme": {"type": "object"},
+    },
+}
+
+
+def test_compact_schema_strips_boilerplate_but_not_property_names():
+  original = copy.deepcopy(CATALOG)
+  compact = compact_schema(CATALOG)
+
+  assert CATALOG == original
+  assert set(compact) == {"catalogId", "components", "$defs"}
+  card = compact["components"]["Card"]
+  assert "title" not in card
+  assert card["properties"]["title"] == {"type": "string"}
+  assert card["description"] == CATALOG["components"]["Card"]["description"]
+
+
+def test_compact_schema_drops_shared_definitions():
+  compact = compact_schema(
+      CATALOG, COMMON_TYPES["$defs"], shared_ref="common_types.json#/$defs/"
+  )
+
+  assert compact["$defs"] == {"theme": {"type": "object"}}
+  properties = compact["components"]["Card"]["properties"]
+  assert properties["child"] == {"$ref": "common_types.json#/$defs/ComponentId"}
+  assert properties["theme"] == {"$ref": "#/$defs/theme"}
+
+  # Definitions that differ from the shared ones are kept.
+  shared = {"ComponentId": {"type": "string"}}
+  assert "ComponentId" in compact_schema(CATALOG, shared)["$defs"]
+
+
+def test_compact_schema_keeps_instances_as_they_are():
+  values = {
+      "default": {"title": "x", "$id": "y"},
+      "const": {"$schema": "s", "$comment": "c"},
+      "enum": [{"title": "a"}, "b"],
+      "examples": [{"$ref": "#/$defs/ComponentId", "title": "t"}],
+  }
+  schema = {
+      "$defs": {"ComponentId": {"type": "string", "description": "An id."}},
+      "properties": {"default": {"title": "Default", **values}},
+  }
+
+  for compact in (
+      compact_schema(schema),
+      compact_schema(
+          schema, COMMON_TYPES["$defs"], shared_ref="common_types.json#/$defs/"
+      ),
+  ):
+    assert compact["properties"]["default"] == values
+
+
+def test_compact_schema_brief_descriptions():
+  compact = compact_schema(CATALOG, brief=True)
+  assert compact["components"]["Card"]["description"] == "A card, e.g. a product."
+
+  assert first_sentence("One. Two.") == "One."
+  assert first_sentence("No end") == "No end"
+  assert first_sentence("Ends here.") == "Ends here."
+  assert first_sentence("Is it? Yes.") == "Is it?"
+
+
+def test_measure_prompt():
+  assert measure_prompt("") == PromptSize(0, 0)
+  assert measure_prompt("héllo") == PromptSize(6, estimate_tokens("héllo"))
+  assert estimate_tokens("Hello world") == 2
+  assert estimate_tokens('{"a":1}') == 5
+
+  indented = json.dumps(CATALOG, indent=2)
+  minified = json.dumps(compact_schema(CATALOG), separators=(",", ":"))
+  assert estimate_tokens(minified) < estimate_tokens(indented)
@@ -21,6 +21,9 @@ from a2ui.core.schema.constants import (
     CATALOG_COMPONENTS_KEY,
     DEFAULT_WORKFLOW_RULES,
     INLINE_CATALOG_NAME,
+    JSONL_WORKFLOW_RULES,
+    OUTPUT_FORMAT_JSONL,
+    SCHEMA_RENDERING_COMPACT,
     VERSION_0_8,
     VERSION_0_9,
 )
@@ -249,8 +252,8 @@ def test_generate_system_prompt_with_examples(mock_importlib_resources):
   with patch("os.path.isdir", return_value=True):
     with patch.object(
         A2uiCatalog,
-        "load_examples",
-        return_value="---BEGIN example1---\n{}\n---END example1---",
+        "read_examples",
+        return_value=[("example1", "{}")],
     ):
       prompt = manager.generate_system_prompt("Role description", include_examples=True)
       assert "### Examples" in prompt
@@ -533,3 +536,123 @@ def test_select_catalog_logic():
       )
       == basic
   )
+
+
+def test_generate_system_prompt_jsonl(tmp_path):
+  (tmp_path / "example1.json").write_text(
+      '[{"deleteSurface": {"surfaceId": "a"}}, {"deleteSurface": {"surfaceId": "b"}}]'
+  )
+  manager = A2uiSchemaManager(
+      VERSION_0_9,
+      catalogs=[BasicCatalog.get_config(VERSION_0_9, examples_path=str(tmp_path))],
+  )
+
+  prompt = manager.generate_system_prompt(
+      "Role", include_examples=True, output_format=OUTPUT_FORMAT_JSONL
+  )
+  assert JSONL_WORKFLOW_RULES in prompt
+  assert DEFAULT_WORKFLOW_RULES not in prompt
+  assert (
+      '{"deleteSurface":{"surfaceId":"a"}}\n{"deleteSurface":{"surfaceId":"b"}}'
+      in prompt
+  )
+
+  with pytest.raises(ValueError, match="Unknown output format 'yaml'"):
+    manager.generate_system_prompt("Role", output_format="yaml")
+
+
+def test_generate_system_prompt_is_cached(tmp_path):
+  (tmp_path / "example1.json").write_text('[{"deleteSurface": {"surfaceId": "a"}}]')
+  manager = A2uiSchemaManager(
+      VERSION_0_9,
+      catalogs=[BasicCatalog.get_config(VERSION_0_9, examples_path=str(tmp_path))],
+  )
+
+  prompt = manager.generate_system_prompt(
+      "Role", include_schema=True, include_examples=True
+  )
+  (tmp_path / "example1.json").write_text('[{"deleteSurface": {"surfaceId": "b"}}]')
+  assert (
+      manager.generate_system_prompt("Role", include_schema=True, include_examples=True)
+      is prompt
+  )
+  assert manager.prompt_cache.stats.hits == 1
+
+  pruned = manager.generate_system_prompt(
+      "Role",
+      allowed_components=["Text", "Row"],
+      include_schema=True,
+      include_examples=True,
+  )
+  assert (
+      manager.generate_system_prompt(
+          "Role",
+          allowed_components=["Row", "Text", "Row"],
+          include_schema=True,
+          include_examples=True,
+      )
+      is pruned
+  )
+  assert '"surfaceId": "b"' in pruned
+
+  manager.generate_system_prompt("Other role", include_schema=True)
+  assert manager.prompt_cache.stats.misses == 3
+  assert manager.prompt_cache.stats.hits == 2
+
+
+def test_generate_system_prompt_schema_first(tmp_path):
+  (tmp_path / "example1.json").write_text('[{"deleteSurface": {"surfaceId": "a"}}]')
+  manager = A2uiSchemaManager(
+      VERSION_0_9,
+      catalogs=[BasicCatalog.get_config(VERSION_0_9, examples_path=str(tmp_path))],
+  )
+
+  def prompt(role, schema_first):
+    return manager.generate_system_prompt(
+        role,
+        ui_description=f"UI of the {role}.",
+        include_schema=True,
+        include_examples=True,
+        schema_first=schema_first,
+    )
+
+  travel = prompt("You help travelers.", schema_first=True)
+  shop = prompt("You help shoppers.", schema_first=True)
+  assert travel.startswith("---BEGIN A2UI JSON SCHEMA---")
+  # Everything but the descriptions is a byte-identical prefix.
+  prefix = travel[: travel.index("You help travelers.")]
+  assert shop[: shop.index("You help shoppers.")] == prefix
+  assert '"surfaceId": "a"' in prefix and DEFAULT_WORKFLOW_RULES not in prefix
+
+  default = prompt("You help travelers.", schema_first=False)
+  assert default.startswith("You help travelers.")
+  assert sorted(default.split("\n\n")) == sorted(travel.split("\n\n"))
+
+
+def test_generate_system_prompt_without_cache():
+  manager = A2uiSchemaManager(
+      VERSION_0_9,
+      catalogs=[BasicCatalog.get_config(VERSION_0_9)],
+      prompt_cache_size=0,
+  )
+  assert manager.prompt_cache is None
+  assert manager.generate_system_prompt("Role") == manager.generate_system_prompt(
+      "Role"
+  )
+
+
+def test_generate_system_prompt_compact_schema():
+  manager = A2uiSchemaManager(
+      VERSION_0_9, catalogs=[BasicCatalog.get_config(VERSION_0_9)]
+  )
+
+  full = manager.generate_system_prompt("Role", include_schema=True)
+  compact = manager.generate_system_prompt(
+      "Role", include_schema=True, schema_rendering=SCHEMA_RENDERING_COMPACT
+  )
+  assert "---BEGIN A2UI JSON SCHEMA---" in compact
+  assert '"$schema"' in full and '"$schema"' not in compact
+  assert len(compact) < len(full) * 0.7
+
+  with pytest.raises(ValueError, match="Unknown schema rendering 'tiny'"):
+    manager.generate_system_prompt("Role", schema_rendering="tiny")
@@ -0,0 +1,147 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from a2ui.basic_catalog.provider import BasicCatalog
+from a2ui.core.schema.constants import MAX_GLOBAL_DEPTH, VERSION_0_9
+from a2ui.core.schema.manager import A2uiSchemaManager
+from a2ui.core.schema.session import SurfaceValidationSession
+
+
+@pytest.fixture(scope="module")
+def catalog():
+  manager = A2uiSchemaManager(
+      VERSION_0_9, catalogs=[BasicCatalog.get_config(VERSION_0_9)]
+  )
+  return manager.get_selected_catalog()
+
+
+def _create(surface_id="s"):
+  return {
+      "version": "v0.9",
+      "createSurface": {"surfaceId": surface_id, "catalogId": "c"},
+  }
+
+
+def _update(*components, surface_id="s"):
+  return {
+      "version": "v0.9",
+      "updateComponents": {"surfaceId": surface_id, "components": list(components)},
+  }
+
+
+def _delete(surface_id="s"):
+  return {"version": "v0.9", "deleteSurface": {"surfaceId": surface_id}}
+
+
+def _text(comp_id):
+  return {"id": comp_id, "component": "Text", "text": comp_id}
+
+
+def _column(comp_id, *children):
+  return {"id": comp_id, "component": "Column", "children": list(children)}
+
+
+@pytest.fixture
+def session(catalog):
+  session = SurfaceValidationSession(catalog)
+  session.validate([_create(), _update(_column("root", "a"), _text("a"))])
+  return session
+
+
+def test_incremental_updates_are_checked_against_the_surface(session):
+  session.validate(_update(_column("root", "a", "b"), _text("b")))
+  session.validate(_update(_text("a")))
+  assert set(session.get_surface("s").edges) == {"root", "a", "b"}
+
+  with pytest.raises(
+      ValueError,
+      match=(
+          "Component 'c' references non-existent component 'missing' in field"
+          " 'children'"
+      ),
+  ):
+    session.validate(_update(_column("c", "missing")))
+
+  with pytest.raises(ValueError, match="Component 'c' is not reachable from 'root'"):
+    session.validate(_update(_text("c")))
+
+  with pytest.raises(ValueError, match="Component 'b' is not reachable from 'root'"):
+    session.validate(_update(_column("root", "a")))
+
+
+def test_cycles_through_existing_components_are_rejected(session):
+  session.validate(_update(_column("root", "a"), _column("a", "b"), _text("b")))
+
+  with pytest.raises(
+      ValueError, match="Circular reference detected involving component 'a'"
+  ):
+    session.validate(_update(_column("b", "a")))
+
+
+def test_depth_limit_spans_updates(session):
+  # root and 'a' sit at depths 0 and 1, so the last link is at the limit.
+  last = f"n{MAX_GLOBAL_DEPTH - 2}"
+  chain = [_column(f"n{i}", f"n{i + 1}") for i in range(MAX_GLOBAL_DEPTH - 2)]
+  session.validate(_update(_column("a", "n0"), *chain, _text(last)))
+
+  with pytest.raises(ValueError, match="Global recursion limit exceeded"):
+    session.validate(_update(_column(last, "leaf"), _text("leaf")))
+
+
+def test_rejected_payloads_leave_the_session_unchanged(session):
+  session.validate([_create("t"), _update(_text("root"), surface_id="t")])
+  before = {k: list(v) for k, v in session.get_surface("s").edges.items()}
+
+  with pytest.raises(ValueError, match="not reachable"):
+    session.validate([
+        _update(_column("root", "a", "b"), _text("b")),
+        _update(_column("root", "a")),
+    ])
+  with pytest.raises(ValueError, match="non-existent component 'missing'"):
+    session.validate([_delete("t"), _update(_column("c", "missing"))])
+
+  assert "t" in session
+
+  graph = session.get_surface("s")
+  assert graph.edges == before
+  assert graph.parents == {"a": {"root"}}
+
+
+def test_delete_surface_evicts(session):
+  session.validate(_delete())
+  assert "s" not in session
+
+  # Untracked surfaces only get the stateless checks.
+  session.validate(_update(_column("x", "missing")))
+  assert "s" not in session
+
+  session.validate([_create(), _update(_text("root"))])
+  assert set(session.get_surface("s").edges) == {"root"}
+
+
+def test_memory_is_bounded(catalog):
+  session = SurfaceValidationSession(catalog, max_surfaces=2, max_components=3)
+  for surface_id in ("s1", "s2", "s3"):
+    session.validate([
+        _create(surface_id),
+        _update(_column("root", "a"), _text("a"), surface_id=surface_id),
+    ])
+  assert len(session) == 2
+  assert "s1" not in session
+
+  session.validate(_update(_column("root", "a", "b"), _text("b"), surface_id="s3"))
+  with pytest.raises(ValueError, match="Surface 's3' exceeds the limit of 3"):
+    session.validate(_update(_text("c"), surface_id="s3"))
@@ -0,0 +1,275 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the signature rendering.
+
+A stub model reads only the rendered declarations and writes one message per
+`Message` variant, with one component per component type, filling in the
+required properties. Its output must validate against the full schema, which
+checks that the declarations carry the names, literals and required markers
+a model needs.
+"""
+
+import json
+import re
+
+import pytest
+from a2ui.basic_catalog import BasicCatalog
+from a2ui.core.parser.parser import parse_response
+from a2ui.core.schema.constants import (
+    A2UI_CLOSE_TAG,
+    A2UI_OPEN_TAG,
+    SCHEMA_RENDERING_FULL,
+    SCHEMA_RENDERING_SIGNATURES,
+    VALIDATION_SCHEMA,
+    VERSION_0_8,
+    VERSION_0_9,
+)
+from a2ui.core.schema.manager import A2uiSchemaManager
+from a2ui.core.schema.rendering import measure_prompt
+
+_TOKEN = re.compile(
+    r'\s+|//[^\n]*|("(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?|[A-Za-z_$][\w$]*|\[\]|[{}()<>:;,|&?=])'
+)
+_PRIMITIVE_VALUES = {"string": "x", "number": 1, "boolean": True, "null": None}
+
+
+class _StubModel:
+  """Writes A2UI messages from TypeScript-like declarations alone."""
+
+  def __init__(self, prompt):
+    body = prompt[prompt.index("\n### ") : prompt.index("---END A2UI JSON SCHEMA---")]
+    body = "\n".join(line for line in body.splitlines() if not line.startswith("###"))
+    self._tokens = [m.group(1) for m in _TOKEN.finditer(body) if m.group(1)]
+    self._position = 0
+    self.declarations = {}
+    while self._position < len(self._tokens):
+      self._declaration()
+
+  def generate(self):
+    messages = self._variants(("name", "Message"))
+    return (
+        f"Here is your UI.\n{A2UI_OPEN_TAG}\n{json.dumps(messages)}\n{A2UI_CLOSE_TAG}"
+    )
+
+  # Parsing.
+
+  def _next(self, expected=None):
+    token = self._tokens[self._position]
+    assert expected is None or token == expected, (token, expected)
+    self._position += 1
+    return token
+
+  def _peek(self):
+    return self._tokens[self._position]
+
+  def _declaration(self):
+    kind, name = self._next(), self._next()
+    if kind == "type":
+      self._next("=")
+      self.declarations[name] = self._union()
+    else:
+      assert kind == "function", kind
+      self._next("(")
+      parameters = self._members(")")
+      self._next(":")
+      return_type = self._next()
+      self.declarations[name] = (
+          "object",
+          [
+              ("call", False, ("literal", name)),
+              ("args", False, ("object", parameters)),
+              ("returnType", False, ("literal", return_type)),
+          ],
+      )
+    self._next(";")
+
+  def _union(self):
+    alternatives = [self._intersection()]
+    while self._peek() == "|":
+      self._next()
+      alternatives.append(self._intersection())
+    return alternatives[0] if len(alternatives) == 1 else ("union", alternatives)
+
+  def _intersection(self):
+    members = [self._postfix()]
+    while self._peek() == "&":
+      self._next()
+      members.append(self._postfix())
+    return members[0] if len(members) == 1 else ("intersection", members)
+
+  def _postfix(self):
+    node = self._primary()
+    while self._peek() == "[]":
+      self._next()
+      node = ("array", node)
+    return node
+
+  def _primary(self):
+    token = self._next()
+    if token == "(":
+      node = self._union()
+      self._next(")")
+      return node
+    if token == "{":
+      return ("object", self._members("}"))
+    if token == "Record":
+      self._next("<")
+      self._next("string")
+      self._next(",")
+      self._union()
+      self._next(">")
+      return ("literal", {})
+    if token[0] == '"' or token[0] in "-0123456789":
+      return ("literal", json.loads(token))
+    return ("name", token)
+
+  def _members(self, end):
+    members = []
+    while self._peek() != end:
+      name = self._next()
+      optional = self._peek() == "?"
+      if optional:
+        self._next()
+      self._next(":")
+      members.append((name, optional, self._union()))
+      if self._peek() in (";", ","):
+        self._next()
+    self._next(end)
+    return members
+
+  # Generation.
+
+  def _first(self, node, stack):
+    """A value for `node`, taking the first alternative of unions."""
+    kind, content = node
+    if kind == "union":
+      return self._first(content[0], stack)
+    return self._variants(node, stack)[0]
+
+  def _variants(self, node, stack=()):
+    """Values for `node`, one per alternative it offers."""
+    kind, content = node
+    if kind == "literal":
+      return [content]
+    if kind == "name":
+      if content in _PRIMITIVE_VALUES:
+        return [_PRIMITIVE_VALUES[content]]
+      if content in ("any", "object"):
+        return [{}] if content == "object" else ["x"]
+      declaration = self.declarations[content]
+      if len(stack) > 16:
+        return [None]
+      if content in stack:
+        # A recursive type: take its first alternative, not every one.
+        return [self._first(declaration, stack + (content,))]
+      return self._variants(declaration, stack + (content,))
+    if kind == "union":
+      return [self._first(alternative, stack) for alternative in content]
+    if kind == "array":
+      return [self._variants(content, stack)]
+    if kind == "intersection":
+      values = [self._variants(member, stack) for member in content]
+      varied = max(values, key=len)
+      others = [value[0] for value in values if value is not varied]
+      # Variants contradicting the other members, e.g. function calls with
+      # another return type than required, are dropped.
+      consistent = [
+          variant
+          for variant in varied
+          if all(
+              not isinstance(variant, dict)
+              or not isinstance(other, dict)
+              or all(variant.get(k, v) == v for k, v in other.items())
+              for other in others
+          )
+      ]
+      merged = []
+      for variant in consistent or varied:
+        parts = [variant if value is varied else value[0] for value in values]
+        # Earlier members are the more specific ones, e.g. a function call
+        # naming a function before the generic function call properties.
+        merged.append(
+            {k: v for part in reversed(parts) if part for k, v in part.items()}
+        )
+      return merged
+    # An object: a value per variant of its first varied required property, or
+    # a single-property value per property if none is required.
+    required = [(name, sub) for name, optional, sub in content if not optional]
+    if not required:
+      return [{name: self._first(sub, stack)} for name, _, sub in content] or [{}]
+    base = {name: self._variants(sub, stack) for name, sub in required}
+    varied = next((name for name, values in base.items() if len(values) > 1), None)
+    if varied is None:
+      return [{name: values[0] for name, values in base.items()}]
+    return [
+        {
+            name: variant if name == varied else values[0]
+            for name, values in base.items()
+        }
+        for variant in base[varied]
+    ]
+
+
+def _catalog(version):
+  manager = A2uiSchemaManager(version, catalogs=[BasicCatalog.get_config(version)])
+  return manager.get_selected_catalog()
+
+
+@pytest.mark.parametrize("version", [VERSION_0_8, VERSION_0_9])
+def test_stub_model_output_validates(version):
+  catalog = _catalog(version)
+  prompt = catalog.render_as_llm_instructions(SCHEMA_RENDERING_SIGNATURES)
+  model = _StubModel(prompt)
+
+  (part,) = parse_response(model.generate())
+  catalog.validator.validate(part.a2ui_json, level=VALIDATION_SCHEMA)
+
+  written = json.dumps(part.a2ui_json)
+  for component in catalog.catalog_schema["components"]:
+    assert f'"{component}"' in written, component
+
+
+def test_stub_model_detects_a_missing_required_marker():
+  catalog = _catalog(VERSION_0_9)
+  prompt = catalog.render_as_llm_instructions(SCHEMA_RENDERING_SIGNATURES)
+  model = _StubModel(prompt.replace("text: DynamicString", "text?: DynamicString"))
+
+  (part,) = parse_response(model.generate())
+  with pytest.raises(ValueError, match="text"):
+    catalog.validator.validate(part.a2ui_json, level=VALIDATION_SCHEMA)
+
+
+@pytest.mark.parametrize("version", [VERSION_0_8, VERSION_0_9])
+def test_signatures_are_smaller(version):
+  catalog = _catalog(version)
+  full = measure_prompt(catalog.render_as_llm_instructions(SCHEMA_RENDERING_FULL))
+  signatures = measure_prompt(
+      catalog.render_as_llm_instructions(SCHEMA_RENDERING_SIGNATURES)
+  )
+  assert signatures.bytes * 3 < full.bytes
+  assert signatures.tokens * 2.5 < full.tokens
+
+
+def test_signatures_content():
+  prompt = _catalog(VERSION_0_9).render_as_llm_instructions(SCHEMA_RENDERING_SIGNATURES)
+  assert prompt.startswith("---BEGIN A2UI JSON SCHEMA---")
+  assert "type Message = CreateSurfaceMessage | UpdateComponentsMessage" in prompt
+  assert (
+      'variant?: "h1" | "h2" | "h3" | "h4" | "h5" | "caption" | "body"; // A hint'
+      ' for the base text style. Default: "body".'
+  ) in prompt
+  assert "type ChildList = ComponentId[] | {" in prompt
+  assert "function formatString(value: DynamicString): string;" in prompt
+  assert "type anyComponent = Text | Image | Icon" in prompt
@@ -0,0 +1,92 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from a2ui.core.schema.component_graph import ComponentGraph
+from a2ui.core.schema.component_refs import ComponentRefFields, ComponentRefIndex
+from a2ui.core.schema.constants import MAX_GLOBAL_DEPTH
+from a2ui.core.schema.structure import is_json_pointer, walk_message
+
+
+@pytest.fixture
+def ref_index():
+  return ComponentRefIndex(
+      fields={
+          "Text": ComponentRefFields(),
+          "Column": ComponentRefFields(lists=frozenset({"children"})),
+      }
+  )
+
+
+def _errors(structure):
+  return [(e.kind, e.message, e.path) for e in structure.errors]
+
+
+def test_walk_indexes_components_and_checks_paths(ref_index):
+  components = [
+      {"id": "root", "component": "Column", "children": ["a"]},
+      {"id": "a", "component": "Text", "text": {"path": "no slash"}},
+  ]
+  message = {"updateComponents": {"surfaceId": "s", "components": components}}
+
+  structure = walk_message(message, ref_index, components)
+
+  assert structure.graph == ComponentGraph.build(components, ref_index)
+  assert _errors(structure) == [(
+      "path",
+      "Invalid JSON Pointer syntax: 'no slash'",
+      ("updateComponents", "components", 1, "text", "path"),
+  )]
+  assert walk_message(message, ref_index).graph is None
+
+
+def test_walk_reports_errors_in_depth_first_order(ref_index):
+  call = {"call": "f", "args": {}}
+  nested = call
+  for _ in range(5):
+    nested["args"]["value"] = {"call": "f", "args": {}}
+    nested = nested["args"]["value"]
+  message = {"first": {"path": "bad"}, "second": call, "third": {"path": "~"}}
+
+  assert [e.kind for e in walk_message(message, ref_index).errors] == [
+      "path",
+      "recursion",
+      "path",
+  ]
+
+
+def test_deep_values_are_reported_once_per_branch(ref_index):
+  deep = current = {}
+  for _ in range(MAX_GLOBAL_DEPTH + 10):
+    current["next"] = {}
+    current = current["next"]
+  leaf = current = []
+  for _ in range(MAX_GLOBAL_DEPTH - 1):
+    current.append([])
+    current = current[0]
+  current.append("scalar past the limit")
+
+  errors = walk_message({"deep": deep, "leaf": leaf}, ref_index).errors
+  assert [len(e.path) for e in errors] == [MAX_GLOBAL_DEPTH + 1] * 2
+  assert (
+      errors[0].message
+      == f"Global recursion limit exceeded: Depth > {MAX_GLOBAL_DEPTH}"
+  )
+
+
+def test_is_json_pointer():
+  assert is_json_pointer("")
+  assert is_json_pointer("/a/~0b/~1c")
+  assert not is_json_pointer("a")
+  assert not is_json_pointer("/~2")
@@ -0,0 +1,71 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from a2ui.core.schema.surfaces import index_surfaces
+
+
+def test_index_v09_messages_by_surface():
+  messages = [
+      {"version": "v0.9", "createSurface": {"surfaceId": "a", "catalogId": "c"}},
+      {"version": "v0.9", "updateComponents": {"surfaceId": "a", "components": []}},
+      {"version": "v0.9", "createSurface": {"surfaceId": "b", "catalogId": "c"}},
+      {"version": "v0.9", "updateDataModel": {"surfaceId": "a", "value": {}}},
+      {"version": "v0.9", "updateComponents": {"surfaceId": "b", "components": []}},
+      {"version": "v0.9", "deleteSurface": {"surfaceId": "c"}},
+  ]
+  index = index_surfaces(messages)
+
+  assert index.surface_ids == ["a", "b", "c"]
+  surface_a = index.get("a")
+  assert surface_a.root_id == "root"
+  assert surface_a.create_indices == [0]
+  assert surface_a.component_indices == [1]
+  assert surface_a.data_model_indices == [3]
+  assert index.get("b").component_indices == [4]
+  assert index.get("c").is_deleted
+  assert not index.get("c").is_created
+
+
+def test_index_v08_custom_root():
+  messages = [
+      {"surfaceUpdate": {"surfaceId": "s", "components": []}},
+      {"beginRendering": {"surfaceId": "s", "root": "main"}},
+  ]
+  index = index_surfaces(messages)
+  assert index.root_id("s") == "main"
+  assert index.get("s").component_indices == [0]
+  assert index.get("s").create_indices == [1]
+
+
+def test_root_id_lookup():
+  messages = [
+      {"beginRendering": {"surfaceId": "first", "root": "first-root"}},
+      {"beginRendering": {"surfaceId": "second", "root": "second-root"}},
+      {"surfaceUpdate": {"surfaceId": "incremental", "components": []}},
+  ]
+  index = index_surfaces(messages)
+  assert index.root_id("second") == "second-root"
+  # Incremental updates have no root in the payload.
+  assert index.root_id("incremental") is None
+  assert index.root_id("unknown") is None
+  # Messages without a surface ID fall back to the first created surface.
+  assert index.root_id(None) == "first-root"
+
+
+def test_single_message_and_malformed_entries():
+  index = index_surfaces({"deleteSurface": {"surfaceId": "s"}})
+  assert index.surface_ids == ["s"]
+
+  index = index_surfaces(["not a message", {"updateComponents": "bad"}])
+  assert len(index) == 0
@@ -18,7 +18,21 @@ import pytest
 from unittest.mock import MagicMock
 from a2ui.core.schema.manager import A2uiSchemaManager, A2uiCatalog, CatalogConfig
 from a2ui.core.schema.common_modifiers import remove_strict_validation
-from a2ui.core.schema.constants import VERSION_0_8, VERSION_0_9
+from a2ui.core.schema.constants import (
+    VALIDATION_FULL,
+    VALIDATION_NONE,
+    VALIDATION_SCHEMA,
+    VALIDATION_STRUCTURAL,
+    VERSION_0_8,
+    VERSION_0_9,
+)
+from a2ui.core.schema.validator import (
+    ValidationProvenance,
+    _payload_digest,
+    disable_result_cache,
+    enable_result_cache,
+)
+from a2ui.basic_catalog.provider import BasicCatalog
 
 
 class TestValidator:
@@ -1018,10 +1032,13 @@ class TestValidator:
         p[0]["dataModelUpdate"]["path"] = data.get("path")
         p[0]["dataModelUpdate"]["surfaceId"] = data.get("surfaceId", "surface1")
 
+    # Messages are dispatched on their key, so schema errors name the offending
+    # property of the message instead of failing every message type.
     with pytest.raises(
         ValueError,
         match=(
-            "(Invalid JSON Pointer syntax|is not valid under any of the given schemas)"
+            "(Invalid JSON Pointer syntax|is not valid under any of the given"
+            " schemas|'path' was unexpected)"
         ),
     ):
       test_catalog.validator.validate(p)
@@ -1037,3 +1054,187 @@ class TestValidator:
     payload = self.make_payload(test_catalog, data_model=deep_data)
     with pytest.raises(ValueError, match="Global recursion limit exceeded"):
       test_catalog.validator.validate(payload)
+
+  def test_validate_report_collects_every_error(self, catalog_0_9):
+    components = [
+        {"id": "root", "component": "Column", "children": ["a", "missing"]},
+        {"id": "a", "component": "Text", "text": 1},
+        {"id": "b", "component": "Text", "text": {"path": "bad path"}},
+    ]
+    payload = self.make_payload(catalog_0_9, components=components)
+
+    report = catalog_0_9.validator.validate_report(payload)
+
+    assert not report.is_valid
+    assert [(i.kind, i.pointer, i.message_index) for i in report.issues] == [
+        ("schema", "/1/updateComponents/components/1/text", 1),
+        ("integrity", "/1/updateComponents/components/0", 1),
+        ("topology", "/1/updateComponents/components/2", 1),
+        ("path", "/1/updateComponents/components/2/text/path", 1),
+    ]
+    assert report.issues[1].message == (
+        "Component 'root' references non-existent component 'missing' in field"
+        " 'children'"
+    )
+    assert report.format().splitlines()[-1] == (
+        "- /1/updateComponents/components/2/text/path: Invalid JSON Pointer"
+        " syntax: 'bad path'"
+    )
+
+  def test_validate_report_pointers_for_single_message(self, catalog_0_9):
+    message = {
+        "version": "v0.9",
+        "updateDataModel": {"surfaceId": "a/b", "path": "/x~2", "value": {}},
+    }
+    report = catalog_0_9.validator.validate_report(message)
+    issue = report.issues[-1]
+    assert (issue.kind, issue.pointer) == ("path", "/updateDataModel/path")
+    assert all(i.message_index is None for i in report.issues)
+
+  def test_validate_report_agrees_with_validate(self, test_catalog):
+    components = [
+        {"id": "root", "component": "Card", "child": "c1"},
+        {"id": "c1", "component": "Text", "text": "hi"},
+    ]
+    payload = self.make_payload(test_catalog, components=components)
+    assert test_catalog.validator.validate_report(payload).is_valid
+    test_catalog.validator.validate(payload)
+
+    payload[-1][list(payload[-1])[-1]]["components"][1]["id"] = "c2"
+    report = test_catalog.validator.validate_report(payload)
+    assert [i.kind for i in report.issues] == ["integrity", "topology"]
+    with pytest.raises(ValueError, match=report.issues[0].message):
+      test_catalog.validator.validate(payload)
+
+
+@pytest.fixture
+def result_cache():
+  yield enable_result_cache(maxsize=8)
+  disable_result_cache()
+
+
+def test_result_cache_short_circuits_repeated_payloads(result_cache):
+  catalog = A2uiSchemaManager(
+      VERSION_0_9, catalogs=[BasicCatalog.get_config(VERSION_0_9)]
+  ).get_selected_catalog()
+  validator = catalog.validator
+  valid = [{"version": "v0.9", "createSurface": {"surfaceId": "s", "catalogId": "c"}}]
+  invalid = [{"version": "v0.9", "deleteSurface": {}}]
+
+  validator.validate(valid)
+  # Key order does not matter.
+  validator.validate(
+      [{"createSurface": {"catalogId": "c", "surfaceId": "s"}, "version": "v0.9"}]
+  )
+  for _ in range(2):
+    with pytest.raises(ValueError, match="'surfaceId' is a required property"):
+      validator.validate(invalid)
+
+  stats = result_cache.stats
+  assert (stats.hits, stats.misses, stats.size) == (2, 2, 2)
+
+  # Results are tied to the catalog.
+  pruned = catalog.with_pruned_components(["Text"])
+  pruned.validator.validate(valid)
+  assert result_cache.stats.misses == 3
+
+
+@pytest.fixture
+def basic_catalog_0_9():
+  return A2uiSchemaManager(
+      VERSION_0_9, catalogs=[BasicCatalog.get_config(VERSION_0_9)]
+  ).get_selected_catalog()
+
+
+# Passes the schema but reuses a component ID.
+DUPLICATE_IDS = [
+    {"version": "v0.9", "createSurface": {"surfaceId": "s", "catalogId": "c"}},
+    {
+        "version": "v0.9",
+        "updateComponents": {
+            "surfaceId": "s",
+            "components": [
+                {"id": "root", "component": "Text", "text": "a"},
+                {"id": "root", "component": "Text", "text": "b"},
+            ],
+        },
+    },
+]
+# Fails the schema but is structurally sound.
+MISSING_SURFACE_ID = [{"version": "v0.9", "deleteSurface": {}}]
+
+
+@pytest.mark.parametrize(
+    "level, rejects_duplicates, rejects_schema_errors",
+    [
+        (VALIDATION_FULL, True, True),
+        (VALIDATION_SCHEMA, False, True),
+        (VALIDATION_STRUCTURAL, True, False),
+        (VALIDATION_NONE, False, False),
+    ],
+)
+def test_validation_levels(
+    basic_catalog_0_9, level, rejects_duplicates, rejects_schema_errors
+):
+  validator = basic_catalog_0_9.validator
+  for payload, rejected in [
+      (DUPLICATE_IDS, rejects_duplicates),
+      (MISSING_SURFACE_ID, rejects_schema_errors),
+  ]:
+    if rejected:
+      with pytest.raises(ValueError):
+        validator.validate(payload, level=level)
+    else:
+      provenance = validator.validate(payload, level=level)
+      assert provenance.level == level
+
+
+def test_validate_rejects_unknown_level(basic_catalog_0_9):
+  with pytest.raises(ValueError, match="Unknown validation level 'most'"):
+    basic_catalog_0_9.validator.validate(DUPLICATE_IDS, level="most")
+
+
+def test_provenance_skips_covered_validation(basic_catalog_0_9):
+  validator = basic_catalog_0_9.validator
+  fingerprint = basic_catalog_0_9.fingerprint
+  digest = _payload_digest(DUPLICATE_IDS)
+  full = ValidationProvenance(fingerprint, VALIDATION_FULL, digest)
+  schema_only = ValidationProvenance(fingerprint, VALIDATION_SCHEMA, digest)
+
+  # A covering provenance is trusted without validating the payload.
+  assert validator.validate(DUPLICATE_IDS, provenance=full) is full
+  assert (
+      validator.validate(DUPLICATE_IDS, level=VALIDATION_SCHEMA, provenance=schema_only)
+      is schema_only
+  )
+  # Validating at another level or for another catalog does not cover it.
+  with pytest.raises(ValueError, match="Duplicate component ID: root"):
+    validator.validate(DUPLICATE_IDS, provenance=schema_only)
+  with pytest.raises(ValueError, match="Duplicate component ID: root"):
+    validator.validate(
+        DUPLICATE_IDS, provenance=ValidationProvenance("other", VALIDATION_FULL, digest)
+    )
+
+
+def test_provenance_only_covers_the_validated_payload(basic_catalog_0_9):
+  validator = basic_catalog_0_9.validator
+  valid = copy.deepcopy(DUPLICATE_IDS)
+  valid[1]["updateComponents"]["components"].pop()
+  provenance = validator.validate(valid)
+  assert provenance.digest == _payload_digest(valid)
+  assert validator.validate(copy.deepcopy(valid), provenance=provenance) is provenance
+
+  # A marker taken from another payload, or tampered with, is not trusted.
+  with pytest.raises(ValueError, match="Duplicate component ID: root"):
+    validator.validate(DUPLICATE_IDS, provenance=provenance)
+  forged = ValidationProvenance.from_dict({**provenance.to_dict(), "digest": None})
+  with pytest.raises(ValueError, match="Duplicate component ID: root"):
+    validator.validate(DUPLICATE_IDS, provenance=forged)
+
+
+def test_provenance_round_trips_through_dict():
+  provenance = ValidationProvenance("abc", VALIDATION_STRUCTURAL, "0" * 64)
+  data = json.loads(json.dumps(provenance.to_dict()))
+  assert ValidationProvenance.from_dict(data) == provenance
+  assert ValidationProvenance.from_dict(None) is None
+  assert ValidationProvenance.from_dict({"catalog": "abc", "level": "most"}) is None
@@ -0,0 +1,85 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from a2ui.cli import iter_sources, main
+
+VALID = {
+    "version": "v0.9",
+    "createSurface": {"surfaceId": "s", "catalogId": "c"},
+}
+INVALID = {"version": "v0.9", "deleteSurface": {}}
+
+
+def test_iter_sources_reads_files_and_directories(tmp_path):
+  (tmp_path / "b").mkdir()
+  (tmp_path / "a.json").write_text(json.dumps(VALID))
+  (tmp_path / "b" / "c.jsonl").write_text(
+      json.dumps(VALID) + "\n\n" + json.dumps(INVALID) + "\n"
+  )
+  (tmp_path / "notes.txt").write_text("ignored")
+
+  sources = [source for source, _, _ in iter_sources([str(tmp_path)])]
+  assert sources == [
+      str(tmp_path / "a.json"),
+      f"{tmp_path / 'b' / 'c.jsonl'}:1",
+      f"{tmp_path / 'b' / 'c.jsonl'}:3",
+  ]
+
+
+def test_main_streams_results_and_reports_throughput(tmp_path, capsys):
+  corpus = tmp_path / "corpus.jsonl"
+  corpus.write_text(json.dumps(VALID) + "\n" + json.dumps(INVALID) + "\n")
+
+  assert main([str(corpus), "--workers", "1"]) == 1
+
+  out, err = capsys.readouterr()
+  records = [json.loads(line) for line in out.splitlines()]
+  assert records[0] == {"source": f"{corpus}:1", "valid": True}
+  assert records[1]["source"] == f"{corpus}:2"
+  assert records[1]["valid"] is False
+  assert "'surfaceId' is a required property" in records[1]["error"]
+  assert err.startswith("Validated 2 payloads (1 invalid) in ")
+
+
+def test_main_reports_unreadable_files_and_continues(tmp_path, capsys):
+  (tmp_path / "a.json").write_bytes(b'{"version": "v0.9", \xff}')
+  (tmp_path / "b.jsonl").write_bytes(json.dumps(VALID).encode() + b"\n\xff\n")
+  (tmp_path / "c.json").write_text(json.dumps(VALID))
+  missing = tmp_path / "missing.json"
+
+  assert main([str(tmp_path), str(missing), "--workers", "1"]) == 1
+
+  out, err = capsys.readouterr()
+  records = [json.loads(line) for line in out.splitlines()]
+  assert [(r["source"], r["valid"]) for r in records] == [
+      (str(tmp_path / "a.json"), False),
+      (str(tmp_path / "b.jsonl"), False),
+      (str(tmp_path / "c.json"), True),
+      (str(missing), False),
+  ]
+  assert records[0]["error"].startswith("UnicodeDecodeError: ")
+  assert records[1]["error"].startswith("UnicodeDecodeError: ")
+  assert records[3]["error"].startswith("FileNotFoundError: ")
+  assert err.startswith("Validated 4 payloads (3 invalid) in ")
+
+
+def test_main_writes_to_output_file(tmp_path):
+  corpus = tmp_path / "payload.json"
+  corpus.write_text(json.dumps([VALID]))
+  output = tmp_path / "results.jsonl"
+
+  assert main([str(corpus), "-j", "2", "-o", str(output)]) == 0
+  assert json.loads(output.read_text()) == {"source": str(corpus), "valid": True}